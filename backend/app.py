@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, Blueprint
+from flask import Flask, request, jsonify, Blueprint, Response
 from flask_cors import CORS
 from pymongo import MongoClient
 import pymongo
@@ -12,7 +12,6 @@ from flask_jwt_extended import (
 from datetime import datetime,timezone,timedelta
 from werkzeug.security import generate_password_hash, check_password_hash
 import os, fitz, json, re
-import google.generativeai as genai
 from dotenv import load_dotenv
 from bson import ObjectId
 import re
@@ -26,22 +25,86 @@ import textrazor
 import traceback
 from flask_socketio import SocketIO, emit, join_room, leave_room # Import SocketIO
 from models import ResumeAnalysis
+from utils.skill_taxonomy import get_skill_taxonomy
+from utils.skill_normalizer import get_skill_normalizer, SKILL_MAP_MIN_CONFIDENCE
+from utils.pdf_text import read_upload, MAX_RESUME_BYTES
+from utils.pdf_pool import parse_pdf, PdfParseError
+from utils.cache import TieredCache
+from utils.job_store import JobStore
+from utils.gemini_client import generate_text, stream_json_arrays, get_model, gemini_cache, gemini_breaker, GEMINI_STREAMING
+from utils.job_skill_suggestions import suggest_job_skills as suggest_skills_for_job, suggestion_cache
+from utils.provider_cache import provider_cache
+from utils.local_ats import warm_ats_model
+from utils.http_client import http_get, upstream_stats
+from utils.single_flight import single_flight, single_flight_stats
+from utils.rate_limit import TokenBucket
+from utils.skill_context import build_context_index, cached_context_index, CONTEXT_RADIUS
 load_dotenv()
 
 ADZUNA_APP_ID = os.getenv('ADZUNA_APP_ID')
 ADZUNA_API_KEY = os.getenv('ADZUNA_API_KEY')
 textrazor.api_key = os.getenv("TEXTRAZOR_API_KEY")
-from functools import lru_cache
-from time import sleep
 import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, CancelledError, as_completed
+
+# /api/job_outlook fetches its country x window grid concurrently; upstream
+# calls are paced by one shared bucket (ADZUNA_RATE_PER_SECOND, with bursts
+# of ADZUNA_RATE_BURST) instead of a fixed sleep before each request
+OUTLOOK_WINDOWS = (30, 180, 365)
+# Each country costs len(OUTLOOK_WINDOWS) upstream calls against the bucket
+MAX_OUTLOOK_COUNTRIES = int(os.getenv("MAX_OUTLOOK_COUNTRIES", "4"))
+ADZUNA_RATE_MAX_WAIT = float(os.getenv("ADZUNA_RATE_MAX_WAIT", "10"))
+adzuna_bucket = TokenBucket(
+    float(os.getenv("ADZUNA_RATE_PER_SECOND", "2")),
+    int(os.getenv("ADZUNA_RATE_BURST", "6"))
+)
+outlook_flight = single_flight("adzuna_outlook")
+outlook_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("OUTLOOK_WORKERS", "12")),
+    thread_name_prefix="job-outlook"
+)
+
+outlook_cache = TieredCache(
+    maxsize=int(os.getenv("OUTLOOK_CACHE_SIZE", "256")),
+    name="adzuna_outlook",
+    default_ttl=int(os.getenv("OUTLOOK_CACHE_TTL", "3600"))
+)
 
-# Cache Adzuna results for 1 hour
-@lru_cache(maxsize=100)
-def cached_fetch_adzuna_data(job_title, country, max_age_days):
-    """Cached version to avoid repeated API calls"""
-    # Add a small delay between requests to avoid rate limiting
-    sleep(0.5)  # 500ms delay between requests
+def rate_limited_fetch_adzuna_data(job_title, country, max_age_days, abandoned):
+    """fetch_adzuna_data once the shared bucket has a slot; gives up the wait
+    (CancelledError) as soon as the requesting outlook is `abandoned`."""
+    deadline = time.monotonic() + ADZUNA_RATE_MAX_WAIT
+    while not adzuna_bucket.acquire(timeout=0):
+        if abandoned.wait(0.1):
+            raise CancelledError()
+        if time.monotonic() >= deadline:
+            raise requests.exceptions.RequestException("Adzuna rate limit: no request slot within wait limit")
     return fetch_adzuna_data(job_title, country, ADZUNA_APP_ID, ADZUNA_API_KEY, max_age_days)
+
+def cached_fetch_adzuna_data(job_title, country, max_age_days, abandoned=None):
+    """Adzuna outlook data for one country and window, cached for an hour."""
+    abandoned = abandoned or threading.Event()
+    key = f"{job_title}:{country}:{max_age_days}"
+    cached = outlook_cache.get(key)
+    if cached is not None:
+        return cached
+
+    def fetch():
+        result = rate_limited_fetch_adzuna_data(job_title, country, max_age_days, abandoned)
+        outlook_cache.set(key, result)
+        return result
+
+    # Concurrent misses share one request. If that request belonged to an
+    # outlook that was abandoned, take over instead of failing with it.
+    while True:
+        try:
+            return outlook_flight.do(key, fetch)
+        except CancelledError:
+            if abandoned.is_set():
+                raise
+
 ADZUNA_BASE_URL = "https://api.adzuna.com/v1/api/jobs"
 ADZUNA_SEARCH_COUNTRY = "in"
 app = Flask(__name__)
@@ -63,20 +126,32 @@ def job_outlook():
 
     if not job_title:
         return jsonify({"ok": False, "msg": "Job title required"}), 400
+    if not isinstance(countries, list) or not all(isinstance(c, str) and c.strip() for c in countries):
+        return jsonify({"ok": False, "msg": "countries must be a list of country codes"}), 400
+    countries = list(dict.fromkeys(c.strip().lower() for c in countries))
+    if not countries or len(countries) > MAX_OUTLOOK_COUNTRIES:
+        return jsonify({"ok": False, "msg": f"Provide 1 to {MAX_OUTLOOK_COUNTRIES} countries"}), 400
 
     if not ADZUNA_APP_ID or not ADZUNA_API_KEY:
         print("Adzuna API credentials not found in environment variables.")
         return jsonify({"ok": False, "msg": "Adzuna API credentials not configured"}), 500
 
+    grid = {}
+    abandoned = threading.Event()
     try:
         results = {}
+        grid = {
+            (country_code, days): outlook_executor.submit(cached_fetch_adzuna_data, job_title, country_code, days, abandoned)
+            for country_code in countries
+            for days in OUTLOOK_WINDOWS
+        }
 
         for country_code in countries:
             country_name = "India" if country_code == "in" else "UK" if country_code == "gb" else country_code.upper()
 
-            current_data = cached_fetch_adzuna_data(job_title, country_code, 30)
-            historical_6m = cached_fetch_adzuna_data(job_title, country_code, 180)
-            historical_12m = cached_fetch_adzuna_data(job_title, country_code, 365)
+            current_data = grid[(country_code, 30)].result()
+            historical_6m = grid[(country_code, 180)].result()
+            historical_12m = grid[(country_code, 365)].result()
 
             job_growth = calculate_growth_trend(
                 historical_12m.get("total_jobs", 0),
@@ -135,6 +210,12 @@ def job_outlook():
         print(f"Error in job outlook processing for '{job_title}': {e}")
         traceback.print_exc() # Print full traceback
         return jsonify({"ok": False, "msg": f"An unexpected error occurred: {str(e)}"}), 500
+    finally:
+        # After a failure, don't spend Adzuna quota on fetches still queued
+        # or waiting for a rate-limit slot
+        abandoned.set()
+        for future in grid.values():
+            future.cancel()
 
 from routes.auth import auth_bp
 
@@ -157,7 +238,7 @@ def fetch_adzuna_data(job_title, country, app_id, app_key, max_age_days=None):
     adzuna_url = f"https://api.adzuna.com/v1/api/jobs/{country}/search/1"
 
     print(f"Calling Adzuna API for '{job_title}' in '{country.upper()}' with max_days_old={max_age_days}")
-    response = requests.get(adzuna_url, params=adzuna_params, timeout=10)
+    response = http_get(adzuna_url, upstream="adzuna", params=adzuna_params, timeout=10)
     response.raise_for_status()
     adzuna_data = response.json()
 
@@ -317,6 +398,7 @@ try:
     db = connection.get_db()
     db.command('ping')
     print("✅ MongoDB Connected and Verified Successfully")
+    warm_ats_model()
 
 except Exception as e:
     print(f"❌ MongoDB Connection Failed: {e}")
@@ -325,162 +407,36 @@ except Exception as e:
     raise
 
 # Gemini API Setup
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    gemini_model = genai.GenerativeModel("models/gemini-2.5-pro")
-else:
+gemini_model = get_model()
+if not gemini_model:
     print("⚠️ GEMINI_API_KEY not found. Gemini features disabled.")
-    gemini_model = None
 
-# Uploads folder
-UPLOAD_FOLDER = "uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Skill names don't change meaning; cache their standardized form for 30 days
+SKILL_MAP_CACHE_TTL = int(os.getenv("SKILL_MAP_CACHE_TTL", str(30 * 24 * 3600)))
+MAX_SKILL_MAP_BATCH = int(os.getenv("MAX_SKILL_MAP_BATCH", "200"))
 
 # ------------------------------
 # PDF Text Extraction Function
 # ------------------------------
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
+def extract_text_from_pdf(data):
+    """Extract text from in-memory PDF bytes in an isolated parser process.
+
+    Raises PdfParseError (code: parse_error, timeout, memory_limit,
+    worker_crashed or busy) instead of blocking the request worker.
+    """
     try:
-        doc = fitz.open(file_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        return text
-    except Exception as e:
-        print(f"PDF extraction error: {e}")
-        return ""
+        return parse_pdf(data)
+    except PdfParseError as e:
+        print(f"PDF extraction error ({e.code}): {e.message}")
+        raise
 
 # ------------------------------
 # Enhanced Skills Database & Helpers
 # ------------------------------
-COMPREHENSIVE_SKILLS_DB = {
-    "JavaScript": {"category": "Programming Languages", "aliases": ["js", "javascript", "ecmascript"], "weight": 1.0},
-    "Python": {"category": "Programming Languages", "aliases": ["python3", "py"], "weight": 1.0},
-    "Java": {"category": "Programming Languages", "aliases": ["java"], "weight": 1.0},
-    "TypeScript": {"category": "Programming Languages", "aliases": ["ts", "typescript"], "weight": 1.0},
-    "C++": {"category": "Programming Languages", "aliases": ["cpp", "c++", "cplusplus"], "weight": 1.0},
-    "C#": {"category": "Programming Languages", "aliases": ["csharp", "c#"], "weight": 1.0},
-    "C": {"category": "Programming Languages", "aliases": ["c"], "weight": 1.0},
-    "Go": {"category": "Programming Languages", "aliases": ["golang", "go"], "weight": 1.0},
-    "Rust": {"category": "Programming Languages", "aliases": ["rust"], "weight": 1.0},
-    "PHP": {"category": "Programming Languages", "aliases": ["php"], "weight": 1.0},
-    "Ruby": {"category": "Programming Languages", "aliases": ["ruby"], "weight": 1.0},
-    "Swift": {"category": "Programming Languages", "aliases": ["swift"], "weight": 1.0},
-    "Kotlin": {"category": "Programming Languages", "aliases": ["kotlin"], "weight": 1.0},
-    "Dart": {"category": "Programming Languages", "aliases": ["dart"], "weight": 1.0},
-    "Scala": {"category": "Programming Languages", "aliases": ["scala"], "weight": 1.0},
-    "R": {"category": "Programming Languages", "aliases": ["r"], "weight": 1.0},
-    "MATLAB": {"category": "Programming Languages", "aliases": ["matlab"], "weight": 1.0},
-    
-    "React": {"category": "Frontend Frameworks", "aliases": ["reactjs", "react.js"], "weight": 1.0},
-    "Angular": {"category": "Frontend Frameworks", "aliases": ["angularjs", "angular"], "weight": 1.0},
-    "Vue.js": {"category": "Frontend Frameworks", "aliases": ["vue", "vuejs"], "weight": 1.0},
-    "Next.js": {"category": "Frontend Frameworks", "aliases": ["nextjs", "next"], "weight": 1.0},
-    "Nuxt.js": {"category": "Frontend Frameworks", "aliases": ["nuxtjs", "nuxt"], "weight": 1.0},
-    "Svelte": {"category": "Frontend Frameworks", "aliases": ["svelte"], "weight": 1.0},
-    "HTML": {"category": "Web Technologies", "aliases": ["html5", "html"], "weight": 0.8},
-    "CSS": {"category": "Web Technologies", "aliases": ["css3", "css"], "weight": 0.8},
-    "Sass": {"category": "Web Technologies", "aliases": ["scss", "sass"], "weight": 0.9},
-    "Tailwind CSS": {"category": "Web Technologies", "aliases": ["tailwind", "tailwindcss"], "weight": 0.9},
-    "Bootstrap": {"category": "Web Technologies", "aliases": ["bootstrap"], "weight": 0.8},
-    "jQuery": {"category": "Web Technologies", "aliases": ["jquery"], "weight": 0.7},
-    
-    "Node.js": {"category": "Backend Technologies", "aliases": ["nodejs", "node"], "weight": 1.0},
-    "Express.js": {"category": "Backend Technologies", "aliases": ["express", "expressjs"], "weight": 0.9},
-    "Django": {"category": "Backend Technologies", "aliases": ["django"], "weight": 1.0},
-    "Flask": {"category": "Backend Technologies", "aliases": ["flask"], "weight": 0.9},
-    "FastAPI": {"category": "Backend Technologies", "aliases": ["fastapi"], "weight": 0.9},
-    "Spring": {"category": "Backend Technologies", "aliases": ["spring boot", "spring"], "weight": 1.0},
-    "ASP.NET": {"category": "Backend Technologies", "aliases": ["asp.net", "aspnet"], "weight": 1.0},
-    "Laravel": {"category": "Backend Technologies", "aliases": ["laravel"], "weight": 0.9},
-    "Ruby on Rails": {"category": "Backend Technologies", "aliases": ["rails", "ror"], "weight": 1.0},
-    
-    "MySQL": {"category": "Databases", "aliases": ["mysql"], "weight": 1.0},
-    "PostgreSQL": {"category": "Databases", "aliases": ["postgres", "postgresql"], "weight": 1.0},
-    "MongoDB": {"category": "Databases", "aliases": ["mongo", "mongodb"], "weight": 1.0},
-    "Redis": {"category": "Databases", "aliases": ["redis"], "weight": 0.9},
-    "SQLite": {"category": "Databases", "aliases": ["sqlite"], "weight": 0.8},
-    "Oracle": {"category": "Databases", "aliases": ["oracle db", "oracle"], "weight": 1.0},
-    "SQL Server": {"category": "Databases", "aliases": ["sqlserver", "mssql"], "weight": 1.0},
-    "Cassandra": {"category": "Databases", "aliases": ["cassandra"], "weight": 0.9},
-    "DynamoDB": {"category": "Databases", "aliases": ["dynamodb"], "weight": 0.9},
-    "Elasticsearch": {"category": "Databases", "aliases": ["elasticsearch", "elastic"], "weight": 0.9},
-    
-    "AWS": {"category": "Cloud Platforms", "aliases": ["amazon web services", "aws"], "weight": 1.0},
-    "Azure": {"category": "Cloud Platforms", "aliases": ["microsoft azure", "azure"], "weight": 1.0},
-    "GCP": {"category": "Cloud Platforms", "aliases": ["google cloud", "gcp", "google cloud platform"], "weight": 1.0},
-    "Heroku": {"category": "Cloud Platforms", "aliases": ["heroku"], "weight": 0.8},
-    "DigitalOcean": {"category": "Cloud Platforms", "aliases": ["digitalocean", "digital ocean"], "weight": 0.8},
-    "Vercel": {"category": "Cloud Platforms", "aliases": ["vercel"], "weight": 0.7},
-    "Netlify": {"category": "Cloud Platforms", "aliases": ["netlify"], "weight": 0.7},
-    
-    "Docker": {"category": "DevOps Tools", "aliases": ["docker"], "weight": 1.0},
-    "Kubernetes": {"category": "DevOps Tools", "aliases": ["k8s", "kubernetes"], "weight": 1.0},
-    "Jenkins": {"category": "DevOps Tools", "aliases": ["jenkins"], "weight": 0.9},
-    "GitLab CI": {"category": "DevOps Tools", "aliases": ["gitlab ci/cd", "gitlab ci"], "weight": 0.9},
-    "GitHub Actions": {"category": "DevOps Tools", "aliases": ["github actions"], "weight": 0.9},
-    "Terraform": {"category": "DevOps Tools", "aliases": ["terraform"], "weight": 1.0},
-    "Ansible": {"category": "DevOps Tools", "aliases": ["ansible"], "weight": 0.9},
-    "Vagrant": {"category": "DevOps Tools", "aliases": ["vagrant"], "weight": 0.8},
-    
-    "Git": {"category": "Version Control", "aliases": ["git"], "weight": 0.9},
-    "GitHub": {"category": "Version Control", "aliases": ["github"], "weight": 0.8},
-    "GitLab": {"category": "Version Control", "aliases": ["gitlab"], "weight": 0.8},
-    "Bitbucket": {"category": "Version Control", "aliases": ["bitbucket"], "weight": 0.8},
-    "SVN": {"category": "Version Control", "aliases": ["subversion", "svn"], "weight": 0.7},
-    
-    "React Native": {"category": "Mobile Development", "aliases": ["react native", "react-native"], "weight": 1.0},
-    "Flutter": {"category": "Mobile Development", "aliases": ["flutter"], "weight": 1.0},
-    "iOS Development": {"category": "Mobile Development", "aliases": ["ios", "ios development"], "weight": 1.0},
-    "Android Development": {"category": "Mobile Development", "aliases": ["android", "android development"], "weight": 1.0},
-    "Xamarin": {"category": "Mobile Development", "aliases": ["xamarin"], "weight": 0.9},
-    "Ionic": {"category": "Mobile Development", "aliases": ["ionic"], "weight": 0.8},
-    
-    "Machine Learning": {"category": "Data Science & AI", "aliases": ["ml", "machine learning"], "weight": 1.0},
-    "Deep Learning": {"category": "Data Science & AI", "aliases": ["deep learning", "dl"], "weight": 1.0},
-    "TensorFlow": {"category": "Data Science & AI", "aliases": ["tensorflow", "tf"], "weight": 1.0},
-    "PyTorch": {"category": "Data Science & AI", "aliases": ["pytorch", "torch"], "weight": 1.0},
-    "Scikit-learn": {"category": "Data Science & AI", "aliases": ["sklearn", "scikit-learn"], "weight": 0.9},
-    "Pandas": {"category": "Data Science & AI", "aliases": ["pandas"], "weight": 0.9},
-    "NumPy": {"category": "Data Science & AI", "aliases": ["numpy"], "weight": 0.9},
-    "Matplotlib": {"category": "Data Science & AI", "aliases": ["matplotlib"], "weight": 0.8},
-    "Seaborn": {"category": "Data Science & AI", "aliases": ["seaborn"], "weight": 0.8},
-    "Jupyter": {"category": "Data Science & AI", "aliases": ["jupyter notebook", "jupyter"], "weight": 0.8},
-    "OpenCV": {"category": "Data Science & AI", "aliases": ["opencv", "cv2"], "weight": 0.9},
-    "NLP": {"category": "Data Science & AI", "aliases": ["natural language processing", "nlp"], "weight": 0.9},
-    "Computer Vision": {"category": "Data Science & AI", "aliases": ["computer vision", "cv"], "weight": 0.9},
-    
-    "Jest": {"category": "Testing", "aliases": ["jest"], "weight": 0.8},
-    "Mocha": {"category": "Testing", "aliases": ["mocha"], "weight": 0.8},
-    "Cypress": {"category": "Testing", "aliases": ["cypress"], "weight": 0.8},
-    "Selenium": {"category": "Testing", "aliases": ["selenium"], "weight": 0.9},
-    "Pytest": {"category": "Testing", "aliases": ["pytest"], "weight": 0.8},
-    "Unit Testing": {"category": "Testing", "aliases": ["unit testing", "unit test"], "weight": 0.7},
-    
-    "Linux": {"category": "Operating Systems", "aliases": ["linux", "ubuntu", "centos"], "weight": 0.9},
-    "Windows": {"category": "Operating Systems", "aliases": ["windows"], "weight": 0.7},
-    "macOS": {"category": "Operating Systems", "aliases": ["macos", "mac os"], "weight": 0.7},
-    
-    "GraphQL": {"category": "APIs", "aliases": ["graphql"], "weight": 0.9},
-    "REST API": {"category": "APIs", "aliases": ["rest", "restful", "rest api"], "weight": 0.9},
-    "Microservices": {"category": "Architecture", "aliases": ["microservices"], "weight": 1.0},
-    "API Design": {"category": "APIs", "aliases": ["api design"], "weight": 0.8},
-    "Agile": {"category": "Methodologies", "aliases": ["agile", "scrum"], "weight": 0.7},
-    "CI/CD": {"category": "DevOps Tools", "aliases": ["ci/cd", "continuous integration"], "weight": 0.9},
-}
-
-mock_skills_list = list(COMPREHENSIVE_SKILLS_DB.keys())
-mock_skills_data = {}
-
-for skill, info in COMPREHENSIVE_SKILLS_DB.items():
-    mock_skills_data[skill] = {
-        "category": info["category"],
-        "weight": info["weight"],
-        "aliases": info.get("aliases", [])
-    }
+# The taxonomy (canonical names, aliases, categories, weights and the compiled
+# matcher) is built from data/skills_taxonomy.json by build_skill_taxonomy.py
+# and memory-mapped; get_skill_taxonomy() always returns the active version.
+get_skill_taxonomy()
 
 def enhanced_skill_extraction_from_text(text):
     if not text or len(text.strip()) < 10:
@@ -489,85 +445,66 @@ def enhanced_skill_extraction_from_text(text):
     text = re.sub(r'\s+', ' ', text)
     text_lower = text.lower()
     
+    taxonomy = get_skill_taxonomy()
+    context_index = None
     found_skills = {}
     
-    for skill_name, skill_info in COMPREHENSIVE_SKILLS_DB.items():
-        max_confidence = 0
-        all_names = [skill_name] + skill_info.get("aliases", [])
-        
-        for name in all_names:
-            name_lower = name.lower()
-            
-            if len(name_lower) <= 1:
-                continue
-                
-            positions = []
-            start = 0
-            while True:
-                pos = text_lower.find(name_lower, start)
-                if pos == -1:
-                    break
-                positions.append(pos)
-                start = pos + 1
-            
-            for pos in positions:
-                before_ok = (pos == 0 or not text_lower[pos-1].isalnum())
-                after_ok = (pos + len(name_lower) >= len(text_lower) or 
-                           not text_lower[pos + len(name_lower)].isalnum())
-                
-                if before_ok and after_ok:
-                    confidence = calculate_skill_confidence(text_lower, pos, name_lower, skill_info)
-                    max_confidence = max(max_confidence, confidence)
-        
-        if max_confidence > 0.3:
-            found_skills[skill_name] = max_confidence * skill_info.get("weight", 1.0)
+    # One pass over the resume finds every word-bounded name/alias hit
+    for pos, name_lower, skill_ids in taxonomy.matcher.iter_word_matches(text_lower):
+        if context_index is None:
+            context_index = build_context_index(text_lower)
+        confidence = calculate_skill_confidence(text_lower, pos, name_lower, context_index)
+        for skill_id in skill_ids:
+            if confidence > found_skills.get(skill_id, 0):
+                found_skills[skill_id] = confidence
     
-    sorted_skills = sorted(found_skills.items(), key=lambda x: x[1], reverse=True)
+    found_skills = {
+        skill_id: confidence * taxonomy.weight(skill_id)
+        for skill_id, confidence in found_skills.items()
+        if confidence > 0.3
+    }
+    
+    # Ties keep taxonomy order, as the per-skill scan did
+    sorted_skills = sorted(found_skills.items(), key=lambda x: (-x[1], x[0]))
     
     result_skills = []
-    for skill_name, confidence in sorted_skills:
+    for skill_id, confidence in sorted_skills:
         if confidence > 0.4 and len(result_skills) < 25:
-            result_skills.append(skill_name)
+            result_skills.append(taxonomy.name(skill_id))
     
     return result_skills
 
-def calculate_skill_confidence(text, position, skill_name, skill_info):
+def calculate_skill_confidence(text, position, skill_name, context_index=None):
+    """Score a skill mention from the indicator words around it.
+
+    Pass the build_context_index(text) result when scoring many mentions of
+    the same resume; without one, the index of a recently seen text is
+    reused. Counts are capped where the score saturates, so the result is
+    unchanged.
+    """
+    if context_index is None:
+        context_index = cached_context_index(text)
+
     confidence = 0.5
     
-    context_start = max(0, position - 100)
-    context_end = min(len(text), position + len(skill_name) + 100)
-    context = text[context_start:context_end]
-    
-    positive_indicators = [
-        "experience", "worked", "using", "with", "in", "knowledge", "familiar", 
-        "proficient", "expert", "skilled", "developed", "built", "created", 
-        "implemented", "programming", "coding", "development", "project",
-        "years", "months", "framework", "library", "language", "database",
-        "tool", "platform", "technology", "stack", "api", "application"
-    ]
+    context_start = max(0, position - CONTEXT_RADIUS)
+    context_end = min(len(text), position + len(skill_name) + CONTEXT_RADIUS)
     
-    negative_indicators = [
-        "learning", "want to learn", "interested in", "planning to", 
-        "considering", "might", "could", "should", "wish", "hope"
-    ]
-    
-    positive_count = sum(1 for indicator in positive_indicators if indicator in context)
+    positive_count = context_index.count("positive", context_start, context_end, limit=3)
     confidence += min(0.3, positive_count * 0.1)
     
-    negative_count = sum(1 for indicator in negative_indicators if indicator in context)
+    negative_count = context_index.count("negative", context_start, context_end, limit=2)
     confidence -= min(0.4, negative_count * 0.2)
     
-    technical_sections = [
-        "technical skills", "programming", "technologies", "experience", 
-        "projects", "work experience", "skills", "expertise", "tools"
-    ]
-    if any(section in context for section in technical_sections):
+    if context_index.count("sections", context_start, context_end, limit=1):
         confidence += 0.2
     
     return min(1.0, max(0.0, confidence))
 
+# Resume analyses are cached under a hash of this prompt's rendered
+# template (see resume_cache_key), so editing it retires old cached results
 def create_improved_gemini_prompt(resume_text):
-    example_skills = list(COMPREHENSIVE_SKILLS_DB.keys())[:30]
+    example_skills = list(get_skill_taxonomy())[:30]
     
     return f"""
 CRITICAL: Extract ONLY technical skills that are explicitly mentioned in this resume. Do NOT invent skills.
@@ -589,6 +526,49 @@ Resume Text:
 
 Return only JSON, no explanation.
 """
+def map_skills(skills):
+    """Standardize skill strings: local normalizer first, Gemini only for
+    inputs it can't resolve confidently. Returns one result dict per input."""
+    normalizer = get_skill_normalizer()
+    results = []
+    unresolved = []
+    for skill in skills:
+        name, confidence, method = normalizer.resolve(skill)
+        if name and confidence >= SKILL_MAP_MIN_CONFIDENCE:
+            results.append({"skill": skill, "mapped_skill": name, "confidence": confidence, "source": method})
+        else:
+            results.append({"skill": skill, "mapped_skill": skill, "confidence": confidence, "source": "none"})
+            unresolved.append(results[-1])
+
+    if unresolved and gemini_model:
+        try:
+            mapped = {}
+            if len(unresolved) == 1:
+                skill = unresolved[0]["skill"]
+                prompt = f"Standardize this skill name to match industry standards: '{skill}'. Return only the standardized name, nothing else."
+                mapped[skill] = generate_text(gemini_model, prompt, ttl=SKILL_MAP_CACHE_TTL)
+            else:
+                inputs = list(dict.fromkeys(r["skill"] for r in unresolved))
+                prompt = (
+                    "Standardize each of these skill names to match industry standards. "
+                    "Return only a JSON object mapping each input string exactly as given "
+                    f"to its standardized name, nothing else: {json.dumps(inputs)}"
+                )
+                gemini_result = gemini_analyze_text(prompt, max_output_tokens=40 * len(inputs) + 100, cache_ttl=SKILL_MAP_CACHE_TTL)
+                if isinstance(gemini_result, dict):
+                    mapped = gemini_result
+            for result in unresolved:
+                standardized = mapped.get(result["skill"])
+                if isinstance(standardized, str) and standardized.strip():
+                    # Prefer the taxonomy spelling if Gemini returned a known alias
+                    name, confidence, method = normalizer.resolve(standardized)
+                    result["mapped_skill"] = name if method == "exact" else standardized.strip()
+                    result["source"] = "gemini"
+        except Exception as e:
+            print(f"Gemini mapping error: {e}")
+
+    return results
+
 @app.route("/api/skills/map", methods=["POST"])
 @jwt_required(optional=True)
 def map_skill():
@@ -598,49 +578,21 @@ def map_skill():
     if not skill:
         return jsonify({"ok": False, "msg": "Skill required"}), 400
     
-    # Use Gemini to map/standardize the skill name
-    if gemini_model:
-        try:
-            prompt = f"Standardize this skill name to match industry standards: '{skill}'. Return only the standardized name, nothing else."
-            result = gemini_model.generate_content(prompt)
-            if result and result.candidates:
-                mapped = result.candidates[0].content.parts[0].text.strip()
-                return jsonify({"ok": True, "mapped_skill": mapped})
-        except Exception as e:
-            print(f"Gemini mapping error: {e}")
-    
-    # Fallback: return original skill
-    return jsonify({"ok": True, "mapped_skill": skill})
-def create_job_skill_suggestion_prompt(job_description, job_title=""):
-    """
-    Creates a prompt for Gemini to suggest required and complementary skills for a job.
-    """
-    example_skills = list(COMPREHENSIVE_SKILLS_DB.keys())[:20]
-
-    return f"""
-CRITICAL: Analyze the following job {job_title if job_title else "description"} and suggest the MOST RELEVANT
-technical skills a candidate should possess. Also, suggest a few complementary skills that would make a candidate stand out.
+    result = map_skills([skill])[0]
+    return jsonify({"ok": True, **result})
 
-Return ONLY valid JSON in this format:
-{{
-    "requiredSkills": ["skill1", "skill2"],
-    "complementarySkills": ["skillX", "skillY"]
-}}
+@app.route("/api/skills/map_batch", methods=["POST"])
+@jwt_required(optional=True)
+def map_skill_batch():
+    data = request.json or {}
+    skills = data.get("skills")
 
-RULES:
-1. REQUIRED_SKILLS: Extract 5-10 core technical skills explicitly mentioned or strongly implied.
-2. COMPLEMENTARY_SKILLS: Suggest 2-5 additional technical skills that are often paired with the required skills
-   for this type of role, even if not explicitly mentioned.
-3. Use standard names (e.g., "JavaScript" not "JS", "Kubernetes" not "K8s").
-4. Focus on technical skills: programming languages, frameworks, tools, databases, cloud, DevOps, AI/ML.
-5. Examples of skills: {', '.join(example_skills)}
+    if not isinstance(skills, list) or not skills or not all(isinstance(s, str) and s.strip() for s in skills):
+        return jsonify({"ok": False, "msg": "skills must be a non-empty list of strings"}), 400
+    if len(skills) > MAX_SKILL_MAP_BATCH:
+        return jsonify({"ok": False, "msg": f"At most {MAX_SKILL_MAP_BATCH} skills per request"}), 400
 
-Job Title: {job_title}
-Job Description:
-{job_description[:3000]}
-
-Return only JSON, no explanation.
-"""
+    return jsonify({"ok": True, "results": map_skills(skills)})
 
 def suggest_complementary_skills(extracted_skills, max_suggestions=6):
     if not extracted_skills:
@@ -717,52 +669,83 @@ def extract_skills_from_partial_json(partial_text):
     except:
         return []
 
-def gemini_analyze_text(prompt, max_output_tokens=3000):
+def gemini_analyze_text(prompt, max_output_tokens=3000, cache_ttl=None):
     if not gemini_model:
         print("Gemini model not available")
         return None
     
     try:
-        response = gemini_model.generate_content(
+        raw_text = generate_text(
+            gemini_model,
             prompt,
             generation_config={
                 "max_output_tokens": max_output_tokens,
                 "temperature": 0.1,
                 "top_p": 0.8,
                 "top_k": 40
-            }
+            },
+            ttl=cache_ttl
         )
         
-        if response and response.candidates:
-            candidate = response.candidates[0]
-            if candidate.content and candidate.content.parts:
-                raw_text = candidate.content.parts[0].text.strip()
-                print(f"Raw Gemini response: {raw_text[:200]}...")
-                
-                try:
-                    repaired_text = repair_json_string(raw_text)
-                    parsed = json.loads(repaired_text)
-                    print("Successfully parsed JSON from Gemini")
-                    return parsed
-                except json.JSONDecodeError as e:
-                    print(f"JSON parsing failed: {e}")
-                    extracted_skills = extract_skills_from_partial_json(raw_text)
-                    if extracted_skills:
-                        return {
-                            "extractedSkills": extracted_skills[:8],
-                            "suggestedSkills": ["Docker", "Kubernetes", "AWS", "Git", "CI/CD"]
-                        }
-                    return None
-            else:
-                print("No content in Gemini response")
+        if raw_text:
+            print(f"Raw Gemini response: {raw_text[:200]}...")
+            
+            try:
+                repaired_text = repair_json_string(raw_text)
+                parsed = json.loads(repaired_text)
+                print("Successfully parsed JSON from Gemini")
+                return parsed
+            except json.JSONDecodeError as e:
+                print(f"JSON parsing failed: {e}")
+                extracted_skills = extract_skills_from_partial_json(raw_text)
+                if extracted_skills:
+                    return {
+                        "extractedSkills": extracted_skills[:8],
+                        "suggestedSkills": ["Docker", "Kubernetes", "AWS", "Git", "CI/CD"]
+                    }
+                return None
         else:
-            print("No candidates in Gemini response")
+            print("No content in Gemini response")
             
     except Exception as e:
         print(f"Gemini API error: {e}")
     
     return None
 
+def gemini_stream_analyze(prompt, max_output_tokens=3000, stop_keys=(), max_items=None, on_item=None, cache_ttl=None):
+    """Streaming gemini_analyze_text for prompts that answer with string arrays.
+
+    Returns {key: [strings]} for every top-level array in the response, read
+    incrementally (a truncated response keeps what was complete), or None.
+    """
+    if not gemini_model:
+        print("Gemini model not available")
+        return None
+
+    try:
+        arrays = stream_json_arrays(
+            gemini_model,
+            prompt,
+            generation_config={
+                "max_output_tokens": max_output_tokens,
+                "temperature": 0.1,
+                "top_p": 0.8,
+                "top_k": 40
+            },
+            on_item=on_item,
+            stop_keys=stop_keys,
+            max_items=max_items,
+            ttl=cache_ttl
+        )
+        if arrays:
+            print(f"Streamed Gemini arrays: {arrays}")
+            return arrays
+        print("No JSON arrays in streamed Gemini response")
+    except Exception as e:
+        print(f"Gemini API error: {e}")
+
+    return None
+
 # ------------------------------
 # Real-time Notifications with SocketIO
 # ------------------------------
@@ -971,7 +954,13 @@ def mark_notification_read(notif_id):
 
 @app.route("/api/skills/all", methods=["GET"])
 def get_all_skills():
-    return jsonify({"ok": True, "skills": mock_skills_list, "skills_data": mock_skills_data})
+    taxonomy = get_skill_taxonomy()
+    return jsonify({
+        "ok": True,
+        "skills": list(taxonomy),
+        "skills_data": {skill: taxonomy[skill] for skill in taxonomy},
+        "version": taxonomy.version
+    })
 
 @app.route("/api/skills", methods=["GET"])
 @jwt_required()
@@ -1021,11 +1010,13 @@ def skill_suggestions():
     if not query:
         return jsonify({"ok": True, "suggestions": []})
 
-    suggestions = [
-        {"name": skill, "category": mock_skills_data[skill].get("category", "General")}
-        for skill in mock_skills_data
-        if skill.lower().startswith(query) or query in skill.lower()
-    ]
+    taxonomy = get_skill_taxonomy()
+    suggestions = []
+    for skill_id, skill in enumerate(taxonomy):
+        if query in skill.lower():
+            suggestions.append({"name": skill, "category": taxonomy.category(skill_id)})
+            if len(suggestions) == 10:
+                break
 
     return jsonify({"ok": True, "suggestions": suggestions[:10]})
 
@@ -1048,19 +1039,16 @@ def suggest_job_skills():
         return jsonify({"ok": False, "msg": "Gemini API not configured."}), 500
 
     try:
-        prompt = create_job_skill_suggestion_prompt(job_description, job_title)
-        gemini_result = gemini_analyze_text(prompt, max_output_tokens=500)
+        suggestions = suggest_skills_for_job(job_title, job_description)
 
         required_skills = []
         complementary_skills = []
 
-        if gemini_result:
-            required_skills = gemini_result.get("requiredSkills", [])
-            complementary_skills = gemini_result.get("complementarySkills", [])
-
-            # Validate against COMPREHENSIVE_SKILLS_DB to ensure consistency
-            required_skills = [s for s in required_skills if s in COMPREHENSIVE_SKILLS_DB]
-            complementary_skills = [s for s in complementary_skills if s in COMPREHENSIVE_SKILLS_DB]
+        if suggestions:
+            # Validate against the skill taxonomy to ensure consistency
+            taxonomy = get_skill_taxonomy()
+            required_skills = [s for s in suggestions["required_skills"] if s in taxonomy]
+            complementary_skills = [s for s in suggestions["complementary_skills"] if s in taxonomy]
 
         return jsonify({
             "ok": True,
@@ -1074,109 +1062,310 @@ def suggest_job_skills():
 
 
 # Resume Upload
-@app.route("/api/resume/upload", methods=["POST"])
-@jwt_required(optional=True)
-def upload_resume():
-    file = request.files.get("file")
-    if not file or file.filename == "":
-        return jsonify({"ok": False, "msg": "No file uploaded"}), 400
+# Bump when the keyword extraction or analysis rules change, so cached
+# analyses from the old version are no longer served. Changes to the Gemini
+# prompt need no bump: its hash is part of the cache key.
+RESUME_ANALYSIS_VERSION = "1"
+resume_cache = TieredCache(
+    maxsize=int(os.getenv("RESUME_CACHE_SIZE", "512")),
+    disk_dir=os.getenv("RESUME_CACHE_DIR") or None,
+    name="resume_cache"
+)
 
-    file_extension = file.filename.split('.')[-1].lower()
-    if file_extension != 'pdf':
-        return jsonify({"ok": False, "msg": "Only PDF files are supported"}), 400
-    
-    current_utc_time = datetime.now(timezone.utc)
-    # Format the current UTC datetime and concatenate with the original filename
-    filename = current_utc_time.strftime("%Y%m%d%H%M%S_") + file.filename
-    filepath = os.path.join(UPLOAD_FOLDER, filename)
-    
+MAX_BATCH_RESUMES = int(os.getenv("MAX_BATCH_RESUMES", "50"))
+resume_batch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("RESUME_BATCH_WORKERS", "4")),
+    thread_name_prefix="resume-batch"
+)
+
+# Synchronous uploads return keyword-only results (with "enrichment_pending")
+# if Gemini takes longer than this; the merged result is saved when it lands
+# and pushed to the user's room as resume_analysis_enriched. 0 disables.
+RESUME_GEMINI_DEADLINE = float(os.getenv("RESUME_GEMINI_DEADLINE", "4")) or None
+resume_gemini_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("RESUME_GEMINI_WORKERS", "8")),
+    thread_name_prefix="resume-gemini"
+)
+
+# Async uploads (?async=1): analysis runs here and progress is pushed to the
+# user's Socket.IO room as resume_analysis_progress / resume_analysis_complete
+resume_jobs = JobStore(ttl=int(os.getenv("RESUME_JOB_TTL", "3600")))
+resume_job_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("RESUME_JOB_WORKERS", "4")),
+    thread_name_prefix="resume-job"
+)
+
+def build_resume_result(raw_text, extracted_skills, gemini_skills=()):
+    """Merge Gemini skills into the keyword skills and build the upload_resume response body."""
+    taxonomy = get_skill_taxonomy()
+    extracted_skills = list(extracted_skills)
+    for skill in gemini_skills:
+        if skill in taxonomy and skill not in extracted_skills:
+            if skill.lower() in raw_text.lower():
+                extracted_skills.append(skill)
+
+    extracted_skills = list(dict.fromkeys(extracted_skills))
+    extracted_skills = extracted_skills[:20]
+
+    suggested_skills = suggest_complementary_skills(extracted_skills)
+
+    if not extracted_skills:
+        extracted_skills = []
+        suggested_skills = ["Git", "Linux", "Problem Solving", "Communication", "Teamwork"]
+        print("No technical skills found in resume")
+
+    print(f"Final extracted skills: {extracted_skills}")
+    print(f"Suggested skills: {suggested_skills}")
+
+    skills_by_category = {}
+    for skill in extracted_skills:
+        skill_id = taxonomy.index(skill)
+        if skill_id is not None:
+            category = taxonomy.category(skill_id)
+            if category not in skills_by_category:
+                skills_by_category[category] = []
+            skills_by_category[category].append(skill)
+
+    return {
+        "ok": True,
+        "extracted_skills": extracted_skills,
+        "suggested_skills": suggested_skills,
+        "skills_by_category": skills_by_category,
+        "extraction_method": "enhanced_keyword_matching" + (" + gemini" if gemini_skills else ""),
+        "text_preview": raw_text[:400] + ("..." if len(raw_text) > 400 else ""),
+        "total_text_length": len(raw_text)
+    }
+
+def gemini_resume_skills(raw_text, on_skill=None):
+    """Gemini's extractedSkills for a resume. Returns (skills, ok).
+
+    When streaming, `on_skill(skill)` is called as each one arrives and
+    generation stops once the extractedSkills array is complete.
+    """
     try:
-        file.save(filepath)
-        raw_text = extract_text_from_pdf(filepath)
+        improved_prompt = create_improved_gemini_prompt(raw_text)
+        if GEMINI_STREAMING:
+            gemini_result = gemini_stream_analyze(
+                improved_prompt,
+                max_output_tokens=800,
+                stop_keys=("extractedSkills",),
+                max_items=15,
+                on_item=(lambda key, skill: on_skill(skill)) if on_skill else None
+            )
+        else:
+            gemini_result = gemini_analyze_text(improved_prompt, max_output_tokens=800)
+        if gemini_result and isinstance(gemini_result, dict):
+            gemini_skills = gemini_result.get("extractedSkills", [])
+            print(f"Gemini extraction found: {gemini_skills}")
+            return gemini_skills, True
+        print("Gemini analysis failed or returned invalid format")
+    except Exception as e:
+        print(f"Gemini analysis error: {e}")
+    return [], False
 
-        if not isinstance(raw_text, str) or not raw_text.strip():
-            return jsonify({
-                "ok": False,
-                "msg": "Could not extract text from PDF. The file may be image-based or corrupted.",
-                "extracted_skills": [],
-                "suggested_skills": []
-            }), 400
+def analyze_resume_text(raw_text, on_keywords=None, deadline=None, on_late=None, on_skill=None):
+    """Keyword + Gemini skill analysis.
 
-        print(f"Extracted {len(raw_text)} characters from PDF")
-        print(f"Sample text: {raw_text[:200]}...")
+    Returns (body, complete): the upload_resume response body, and False when
+    a Gemini call was attempted but failed, so the result should not be cached.
+    `on_keywords`, if given, is called with the keyword-only body before
+    waiting for Gemini, and `on_skill` with each Gemini skill as it streams in.
 
+    Gemini starts before keyword extraction. With `deadline` (seconds), if it
+    hasn't answered by then the keyword-only body is returned with
+    "enrichment_pending", and `on_late(body, complete)` later receives the
+    merged body on the Gemini worker thread.
+    """
+    if not (gemini_model and len(raw_text) > 50):
         extracted_skills = enhanced_skill_extraction_from_text(raw_text)
         print(f"Enhanced extraction found: {extracted_skills}")
-
-        gemini_skills = []
-        if gemini_model and len(raw_text) > 50:
+        return build_resume_result(raw_text, extracted_skills), True
+
+    started = time.monotonic()
+    finished = threading.Event()
+    state = {"late": False}
+    state_lock = threading.Lock()
+
+    def run_gemini():
+        gemini_skills, ok = gemini_resume_skills(raw_text, on_skill)
+        with state_lock:
+            state["gemini"] = (gemini_skills, ok)
+            late = state["late"]
+        finished.set()
+        # Only reached once the caller gave up, so extracted_skills is set by then
+        if late and on_late:
             try:
-                improved_prompt = create_improved_gemini_prompt(raw_text)
-                gemini_result = gemini_analyze_text(improved_prompt, max_output_tokens=800)
-                if gemini_result and isinstance(gemini_result, dict):
-                    gemini_skills = gemini_result.get("extractedSkills", [])
-                    print(f"Gemini extraction found: {gemini_skills}")
-                    for skill in gemini_skills:
-                        if skill in COMPREHENSIVE_SKILLS_DB and skill not in extracted_skills:
-                            if skill.lower() in raw_text.lower():
-                                extracted_skills.append(skill)
-                else:
-                    print("Gemini analysis failed or returned invalid format")
+                on_late(build_resume_result(raw_text, extracted_skills, gemini_skills), ok)
             except Exception as e:
-                print(f"Gemini analysis error: {e}")
+                print(f"Late resume enrichment error: {e}")
+
+    resume_gemini_executor.submit(run_gemini)
+
+    extracted_skills = enhanced_skill_extraction_from_text(raw_text)
+    print(f"Enhanced extraction found: {extracted_skills}")
+    if on_keywords:
+        on_keywords(build_resume_result(raw_text, extracted_skills))
+
+    timeout = None if deadline is None else max(0.0, deadline - (time.monotonic() - started))
+    finished.wait(timeout)
+    with state_lock:
+        if "gemini" not in state:
+            state["late"] = True
+    if state["late"]:
+        print(f"Gemini missed the {deadline:g}s deadline; returning keyword results")
+        body = build_resume_result(raw_text, extracted_skills)
+        body["enrichment_pending"] = True
+        return body, False
+
+    gemini_skills, ok = state["gemini"]
+    return build_resume_result(raw_text, extracted_skills, gemini_skills), ok
+
+PDF_ERROR_STATUS = {
+    "parse_error": 400,
+    "timeout": 422,
+    "memory_limit": 413,
+    "worker_crashed": 422,
+    "busy": 503,
+}
 
-        extracted_skills = list(dict.fromkeys(extracted_skills))
-        extracted_skills = extracted_skills[:20]
+def resume_prompt_hash():
+    """Short hash of the resume prompt template, rendered without a resume."""
+    return hashlib.sha256(create_improved_gemini_prompt("").encode("utf-8")).hexdigest()[:12]
 
-        suggested_skills = suggest_complementary_skills(extracted_skills)
+def resume_cache_key(kind, digest):
+    """Cache key for a resume analysis; changes whenever the taxonomy, prompt or Gemini mode does."""
+    mode = f"gemini-{resume_prompt_hash()}" if gemini_model else "keywords"
+    return f"resume:{kind}:{digest}:{get_skill_taxonomy().version}:{RESUME_ANALYSIS_VERSION}:{mode}"
 
-        if not extracted_skills:
-            extracted_skills = []
-            suggested_skills = ["Git", "Linux", "Problem Solving", "Communication", "Teamwork"]
-            print("No technical skills found in resume")
+def analyze_resume_pdf(data, on_keywords=None, deadline=None, on_late=None, on_skill=None):
+    """Extract and analyze PDF bytes. Returns (raw_text, body, status_code).
 
-        print(f"Final extracted skills: {extracted_skills}")
-        print(f"Suggested skills: {suggested_skills}")
+    Results are cached by the hash of the PDF bytes (skips parsing) and of
+    the extracted text (same resume re-exported to a different PDF).
+    `on_keywords`, `on_skill` and `deadline` are passed to analyze_resume_text
+    on a cache miss; `on_late(raw_text, body, complete)` gets a late Gemini result,
+    which is also cached.
+    """
+    pdf_key = resume_cache_key("pdf", hashlib.sha256(data).hexdigest())
+    pdf_entry = resume_cache.get(pdf_key)
+    if pdf_entry:
+        cached = resume_cache.get(pdf_entry["text_key"])
+        if cached:
+            print("Resume analysis served from cache (pdf hash)")
+            return cached["raw_text"], cached["result"], 200
 
-        skills_by_category = {}
-        for skill in extracted_skills:
-            if skill in COMPREHENSIVE_SKILLS_DB:
-                category = COMPREHENSIVE_SKILLS_DB[skill]["category"]
-                if category not in skills_by_category:
-                    skills_by_category[category] = []
-                skills_by_category[category].append(skill)
+    try:
+        raw_text = extract_text_from_pdf(data)
+    except PdfParseError as e:
+        return None, {
+            "ok": False,
+            **e.to_dict(),
+            "extracted_skills": [],
+            "suggested_skills": []
+        }, PDF_ERROR_STATUS.get(e.code, 400)
 
-        uid = get_jwt_identity()
-        if uid:
-            try:
-                user = User.objects.get(id=uid)
-                user.resume = raw_text  # <-- Save full resume text
-                user.skills.clear()
-                for skill in extracted_skills:
-                    if skill not in user.skills:
-                        user.skills.append(skill)
-
-                user.last_resume_analysis = ResumeAnalysis(
-                    timestamp=datetime.utcnow(),
-                    text_preview=raw_text[:5000],
-                    extracted_skills=extracted_skills,
-                    suggested_skills=suggested_skills,
-                    skills_by_category=skills_by_category
-                )
-                user.save()
-                print(f"Saved resume and {len(extracted_skills)} skills to user profile")
-            except Exception as e:
-                print(f"Database update error for resume skills: {e}")
+    if not isinstance(raw_text, str) or not raw_text.strip():
+        return raw_text, {
+            "ok": False,
+            "msg": "Could not extract text from PDF. The file may be image-based or corrupted.",
+            "extracted_skills": [],
+            "suggested_skills": []
+        }, 400
+
+    print(f"Extracted {len(raw_text)} characters from PDF")
+    print(f"Sample text: {raw_text[:200]}...")
+
+    text_key = resume_cache_key("text", hashlib.sha256(raw_text.encode("utf-8")).hexdigest())
+    cached = resume_cache.get(text_key)
+    if cached:
+        print("Resume analysis served from cache (text hash)")
+        result = cached["result"]
+    else:
+        def cache_late(body, complete):
+            if complete:
+                resume_cache.set(text_key, {"raw_text": raw_text, "result": body})
+                resume_cache.set(pdf_key, {"text_key": text_key})
+            if on_late:
+                on_late(raw_text, body, complete)
+
+        result, complete = analyze_resume_text(raw_text, on_keywords, deadline, cache_late, on_skill)
+        if not complete:
+            return raw_text, result, 200
+        resume_cache.set(text_key, {"raw_text": raw_text, "result": result})
+    resume_cache.set(pdf_key, {"text_key": text_key})
+
+    return raw_text, result, 200
+
+def save_resume_analysis(uid, raw_text, result):
+    """Store the resume text and analysis on the user's profile."""
+    try:
+        user = User.objects.get(id=uid)
+        user.resume = raw_text  # <-- Save full resume text
+        user.skills.clear()
+        for skill in result["extracted_skills"]:
+            if skill not in user.skills:
+                user.skills.append(skill)
+
+        user.last_resume_analysis = ResumeAnalysis(
+            timestamp=datetime.utcnow(),
+            text_preview=raw_text[:5000],
+            extracted_skills=result["extracted_skills"],
+            suggested_skills=result["suggested_skills"],
+            skills_by_category=result["skills_by_category"]
+        )
+        user.save()
+        print(f"Saved resume and {len(result['extracted_skills'])} skills to user profile")
+    except Exception as e:
+        print(f"Database update error for resume skills: {e}")
 
+def resume_too_large_msg():
+    return f"PDF exceeds the {MAX_RESUME_BYTES // (1024 * 1024)} MB upload limit"
+
+@app.route("/api/resume/upload", methods=["POST"])
+@jwt_required(optional=True)
+def upload_resume():
+    file = request.files.get("file")
+    if not file or file.filename == "":
+        return jsonify({"ok": False, "msg": "No file uploaded"}), 400
+
+    file_extension = file.filename.split('.')[-1].lower()
+    if file_extension != 'pdf':
+        return jsonify({"ok": False, "msg": "Only PDF files are supported"}), 400
+    
+    # Parsed straight from memory; nothing is written to disk
+    data = read_upload(file)
+    if data is None:
+        return jsonify({"ok": False, "msg": resume_too_large_msg()}), 413
+
+    if request.args.get("async", request.form.get("async", "")).lower() in ("1", "true"):
+        job = resume_jobs.create(user_id=get_jwt_identity(), filename=file.filename)
+        resume_job_executor.submit(run_resume_job, job["id"], data)
         return jsonify({
             "ok": True,
-            "extracted_skills": extracted_skills,
-            "suggested_skills": suggested_skills,
-            "skills_by_category": skills_by_category,
-            "extraction_method": "enhanced_keyword_matching" + (" + gemini" if gemini_skills else ""),
-            "text_preview": raw_text[:400] + ("..." if len(raw_text) > 400 else ""),
-            "total_text_length": len(raw_text)
-        })
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": f"/api/resume/jobs/{job['id']}"
+        }), 202
+    
+    try:
+        uid = get_jwt_identity()
+        # Held until the keyword result is saved, so a late Gemini result
+        # can't be overwritten by it
+        save_lock = threading.Lock()
+
+        def on_late(raw_text, merged, complete):
+            with save_lock:
+                if uid and complete:
+                    save_resume_analysis(uid, raw_text, merged)
+            if uid:
+                socketio.emit("resume_analysis_enriched", {"result": merged, "complete": complete}, room=str(uid))
+
+        with save_lock:
+            raw_text, result, status = analyze_resume_pdf(data, deadline=RESUME_GEMINI_DEADLINE, on_late=on_late)
+            if uid and result["ok"]:
+                save_resume_analysis(uid, raw_text, result)
+
+        return jsonify(result), status
 
     except Exception as e:
         print(f"Resume upload error: {str(e)}")
@@ -1186,9 +1375,118 @@ def upload_resume():
             "ok": False,
             "msg": f"Resume processing failed: {str(e)}"
         }), 500
-    finally:
-        if os.path.exists(filepath):
-            os.remove(filepath)
+
+def _emit_resume_job(job, event):
+    if job and job.get("user_id"):
+        payload = {k: job[k] for k in ("id", "status", "result") if k in job}
+        socketio.emit(event, payload, room=str(job["user_id"]))
+
+def run_resume_job(job_id, data):
+    """Background half of an async upload: analyze, save, and push progress."""
+    job = resume_jobs.update(job_id, status="processing")
+    if job is None:
+        print(f"Resume job {job_id} expired before it started")
+        return
+    uid = job["user_id"]
+
+    def on_keywords(partial):
+        job = resume_jobs.update(job_id, status="keywords_ready", result=partial)
+        if job is not None:
+            _emit_resume_job(job, "resume_analysis_progress")
+
+    def on_skill(skill):
+        if uid:
+            socketio.emit("resume_analysis_skill", {"id": job_id, "skill": skill}, room=str(uid))
+
+    try:
+        raw_text, result, status = analyze_resume_pdf(data, on_keywords, on_skill=on_skill)
+        if uid and result["ok"]:
+            save_resume_analysis(uid, raw_text, result)
+        job = resume_jobs.update(
+            job_id,
+            status="complete" if result["ok"] else "failed",
+            result=result,
+            http_status=status
+        )
+    except Exception as e:
+        print(f"Resume job {job_id} error: {e}")
+        job = resume_jobs.update(
+            job_id,
+            status="failed",
+            result={"ok": False, "msg": f"Resume processing failed: {str(e)}"},
+            http_status=500
+        )
+    if job is None:
+        # Expired while running; the analysis is saved but nobody is waiting on the job
+        print(f"Resume job {job_id} expired before it finished")
+        return
+    _emit_resume_job(job, "resume_analysis_complete")
+
+@app.route("/api/resume/jobs/<job_id>", methods=["GET"])
+@jwt_required(optional=True)
+def resume_job_status(job_id):
+    job = resume_jobs.get(job_id)
+    if not job or (job.get("user_id") and job["user_id"] != get_jwt_identity()):
+        return jsonify({"ok": False, "msg": "Job not found"}), 404
+    return jsonify({"ok": True, "job": JobStore.public(job)})
+
+def _analyze_batch_resume(data, filename):
+    try:
+        _, result, _ = analyze_resume_pdf(data)
+    except Exception as e:
+        print(f"Batch resume error for {filename}: {e}")
+        result = {"ok": False, "msg": f"Resume processing failed: {str(e)}"}
+    return {"filename": filename, **result}
+
+@app.route("/api/resume/upload_batch", methods=["POST"])
+@jwt_required(optional=True)
+def upload_resume_batch():
+    """Analyze many PDFs from one multipart request ("files" field).
+
+    Streams one NDJSON line per file, in completion order, with the same body
+    upload_resume returns plus "filename". Results are not saved to the
+    caller's profile; this endpoint is for screening other people's resumes.
+    """
+    files = [f for f in request.files.getlist("files") if f and f.filename]
+    if not files:
+        return jsonify({"ok": False, "msg": "No files uploaded"}), 400
+    if len(files) > MAX_BATCH_RESUMES:
+        return jsonify({"ok": False, "msg": f"At most {MAX_BATCH_RESUMES} files per batch"}), 400
+
+    # The request body can't be read once streaming starts, so read every file first
+    rejected = []
+    accepted = []
+    for file in files:
+        if file.filename.split('.')[-1].lower() != 'pdf':
+            rejected.append({"filename": file.filename, "ok": False, "msg": "Only PDF files are supported"})
+            continue
+        data = read_upload(file)
+        if data is None:
+            rejected.append({"filename": file.filename, "ok": False, "msg": resume_too_large_msg()})
+            continue
+        accepted.append((data, file.filename))
+
+    futures = [resume_batch_executor.submit(_analyze_batch_resume, data, name) for data, name in accepted]
+
+    def generate():
+        for result in rejected:
+            yield json.dumps(result) + "\n"
+        for future in as_completed(futures):
+            yield json.dumps(future.result()) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+@app.route("/api/cache/stats", methods=["GET"])
+def cache_stats():
+    """Hit/miss counters for the Gemini, resume analysis and job provider caches,
+    how many upstream calls were coalesced, and outbound HTTP latency."""
+    return jsonify({
+        "ok": True,
+        "caches": [gemini_cache.stats(), resume_cache.stats(), suggestion_cache.stats(), provider_cache.stats(), outlook_cache.stats()],
+        "single_flight": single_flight_stats(),
+        "upstreams": upstream_stats(),
+        "gemini_circuit": gemini_breaker.stats()
+    })
 
 # Analysis Endpoint
 @app.route("/api/analysis/evaluate", methods=["POST"])
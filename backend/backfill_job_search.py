@@ -0,0 +1,47 @@
+# Create the job_postings search indexes and fill skills_normalized on
+# postings saved before it existed (new saves maintain it themselves).
+# Run from the backend directory:
+#   python backfill_job_search.py
+import argparse
+
+import certifi
+from mongoengine import connect
+from pymongo import UpdateOne
+
+from config import MONGODB_URI, MONGO_DBNAME
+from models import JobPosting
+from utils.skill_normalizer import normalize_skill_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build job search indexes and backfill normalized skills")
+    parser.add_argument("--batch-size", type=int, default=500, help="postings per bulk update")
+    args = parser.parse_args()
+
+    connect(db=MONGO_DBNAME, host=MONGODB_URI, alias="default", tls=True, tlsCAFile=certifi.where())
+    JobPosting.ensure_indexes()
+    print("Ensured job_postings indexes")
+
+    collection = JobPosting._get_collection()
+    updated = 0
+    batch = []
+    for doc in collection.find({}, {"skills_required": 1, "skills_normalized": 1}):
+        normalized = sorted({normalize_skill_key(s) for s in doc.get("skills_required") or [] if s and s.strip()})
+        if normalized != doc.get("skills_normalized"):
+            batch.append((doc["_id"], normalized))
+        if len(batch) >= args.batch_size:
+            updated += _flush(collection, batch)
+    updated += _flush(collection, batch)
+    print(f"Backfilled skills_normalized on {updated} postings")
+
+
+def _flush(collection, batch):
+    if not batch:
+        return 0
+    result = collection.bulk_write([UpdateOne({"_id": _id}, {"$set": {"skills_normalized": skills}}) for _id, skills in batch])
+    batch.clear()
+    return result.modified_count
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Benchmark: context scoring of skill mentions on long resumes.
+# Compares the per-mention window scan against the precomputed ContextIndex.
+# Expect roughly 1.2-1.5x; the index build (one find pass per indicator) is
+# about half of the indexed time.
+# Run from the backend directory: python bench_skill_confidence.py
+import random
+import time
+
+from utils.skill_context import (
+    build_context_index, CONTEXT_RADIUS, POSITIVE_INDICATORS, NEGATIVE_INDICATORS, TECHNICAL_SECTIONS
+)
+
+MENTIONS = ["python", "react", "docker", "aws", "sql", "java", "kubernetes", "node.js"]
+FILLER = (
+    "worked on backend development for several projects using modern tooling and "
+    "built internal platform services with a small team over many months while "
+    "learning new things and planning to improve the deployment stack "
+).split()
+
+
+def window_scan_score(text, position, skill_name):
+    confidence = 0.5
+    context_start = max(0, position - CONTEXT_RADIUS)
+    context_end = min(len(text), position + len(skill_name) + CONTEXT_RADIUS)
+    context = text[context_start:context_end]
+    positive_count = sum(1 for indicator in POSITIVE_INDICATORS if indicator in context)
+    confidence += min(0.3, positive_count * 0.1)
+    negative_count = sum(1 for indicator in NEGATIVE_INDICATORS if indicator in context)
+    confidence -= min(0.4, negative_count * 0.2)
+    if any(section in context for section in TECHNICAL_SECTIONS):
+        confidence += 0.2
+    return min(1.0, max(0.0, confidence))
+
+
+def index_score(index, text_length, position, skill_name):
+    confidence = 0.5
+    context_start = max(0, position - CONTEXT_RADIUS)
+    context_end = min(text_length, position + len(skill_name) + CONTEXT_RADIUS)
+    confidence += min(0.3, index.count("positive", context_start, context_end, limit=3) * 0.1)
+    confidence -= min(0.4, index.count("negative", context_start, context_end, limit=2) * 0.2)
+    if index.count("sections", context_start, context_end, limit=1):
+        confidence += 0.2
+    return min(1.0, max(0.0, confidence))
+
+
+def make_resume(words, seed=7):
+    rng = random.Random(seed)
+    tokens = [rng.choice(MENTIONS) if rng.random() < 0.08 else rng.choice(FILLER) for _ in range(words)]
+    return " ".join(tokens)
+
+
+def find_mentions(text):
+    mentions = []
+    for name in MENTIONS:
+        pos = text.find(name)
+        while pos != -1:
+            mentions.append((pos, name))
+            pos = text.find(name, pos + 1)
+    return mentions
+
+
+def run(words, repeat=5):
+    text = make_resume(words)
+    mentions = find_mentions(text)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        expected = [window_scan_score(text, pos, name) for pos, name in mentions]
+    scan_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        index = build_context_index(text)
+        actual = [index_score(index, len(text), pos, name) for pos, name in mentions]
+    index_time = (time.perf_counter() - start) / repeat
+
+    assert actual == expected, "index scores differ from window scan"
+    print(f"{len(text):>8} chars {len(mentions):>6} mentions  "
+          f"scan {scan_time * 1000:8.2f} ms  index {index_time * 1000:8.2f} ms  "
+          f"speedup {scan_time / index_time:5.1f}x")
+
+
+if __name__ == "__main__":
+    for words in (1000, 5000, 20000, 80000):
+        run(words)
@@ -0,0 +1,39 @@
+# Compile data/skills_taxonomy.json into a versioned, memory-mappable artifact.
+# Run from the backend directory:
+#   python build_skill_taxonomy.py                 # build and activate
+#   python build_skill_taxonomy.py --no-activate   # build only
+#   python build_skill_taxonomy.py --activate skills-<version>.bin   # roll back/forward
+# Running workers switch to the activated artifact within SKILL_TAXONOMY_CHECK_INTERVAL seconds.
+import argparse
+import os
+
+from utils.skill_taxonomy import (
+    TAXONOMY_DIR, TAXONOMY_SOURCE, SkillTaxonomy, activate_taxonomy_artifact, build_taxonomy_artifact
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the compiled skill taxonomy artifact")
+    parser.add_argument("--source", default=TAXONOMY_SOURCE, help="taxonomy JSON source")
+    parser.add_argument("--out-dir", default=TAXONOMY_DIR, help="artifact directory")
+    parser.add_argument("--no-activate", action="store_true", help="do not update the CURRENT pointer")
+    parser.add_argument("--activate", metavar="FILENAME", help="point CURRENT at an existing artifact and exit")
+    args = parser.parse_args()
+
+    if args.activate:
+        path = os.path.join(args.out_dir, args.activate)
+        taxonomy = SkillTaxonomy(path)
+        activate_taxonomy_artifact(args.activate, args.out_dir)
+        print(f"Activated skill taxonomy {taxonomy.version} ({path})")
+        return
+
+    path = build_taxonomy_artifact(args.source, args.out_dir, activate=not args.no_activate)
+    taxonomy = SkillTaxonomy(path)
+    print(f"Built skill taxonomy {taxonomy.version}: {len(taxonomy)} skills, "
+          f"{len(taxonomy.matcher.patterns)} patterns, {os.path.getsize(path)} bytes -> {path}")
+    if args.no_activate:
+        print("Not activated; run with --activate " + os.path.basename(path))
+
+
+if __name__ == "__main__":
+    main()
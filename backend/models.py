@@ -4,6 +4,7 @@ from bson import ObjectId
 from datetime import datetime
 
 from config import MONGODB_URI, MONGO_DBNAME
+from utils.skill_normalizer import normalize_skill_key
 
 client = MongoClient(MONGODB_URI)
 db = client[MONGO_DBNAME]
@@ -151,8 +152,25 @@ class JobPosting(Document):
     posted_at = DateTimeField(default=datetime.utcnow)
     applicants = ListField(EmbeddedDocumentField(CandidateApplication), default=list)
     is_active = BooleanField(default=True)
-
-    meta = {'collection': 'job_postings'}
+    # Canonical lower-cased skills_required, kept in sync on save, for indexed skill filters
+    skills_normalized = ListField(StringField(), default=list)
+
+    meta = {
+        'collection': 'job_postings',
+        'indexes': [
+            {
+                'fields': ['$title', '$description', '$skills_required'],
+                'default_language': 'english',
+                'weights': {'title': 10, 'skills_required': 5, 'description': 1}
+            },
+            ('is_active', '-posted_at', '-id'),
+            ('is_active', 'skills_normalized', '-posted_at'),
+            ('posted_by', '-posted_at', '-id'),
+        ]
+    }
+
+    def clean(self):
+        self.skills_normalized = sorted({normalize_skill_key(s) for s in self.skills_required if s and s.strip()})
 
 class Employer(Document):
     name = StringField(required=True)
@@ -1,34 +1,45 @@
 from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
 import textrazor
 import os
 from dotenv import load_dotenv
+from utils.textrazor_client import analyze_text, analyze_texts
+from bson import ObjectId
+from models import User, JobPosting
+from utils.local_ats import analyze_ats_local, rank_resumes
 
 ats_bp = Blueprint("ats", __name__, url_prefix="/api/ats")
 
 load_dotenv()
 textrazor.api_key = os.getenv("TEXTRAZOR_API_KEY")
 
-def extract_skills_with_textrazor(text):
-    """Extract relevant skills from text using TextRazor API."""
-    if not text.strip():
-        return []
+# Default engine for /analyze; requests may override it with "engine"
+ATS_ENGINE = os.getenv("ATS_ENGINE", "local")
+MAX_BULK_ATS_RESUMES = int(os.getenv("MAX_BULK_ATS_RESUMES", "2000"))
 
-    client = textrazor.TextRazor(extractors=["entities", "topics"])
-    response = client.analyze(text)
+def skills_from_analysis(analysis):
+    """Relevant entity and topic names from a TextRazor analysis."""
     skills = set()
 
     # Extract entities based on relevance
-    for entity in response.entities():
-        if hasattr(entity, 'relevance_score') and entity.relevance_score > 0.1:
-            skills.add(entity.matched_text.lower())
+    for matched_text, relevance_score in analysis["entities"]:
+        if relevance_score > 0.1:
+            skills.add(matched_text.lower())
 
     # Extract topics based on score
-    for topic in response.topics():
-        if hasattr(topic, 'score') and topic.score > 0.3:
-            skills.add(topic.label.lower())
+    for label, score in analysis["topics"]:
+        if score > 0.3:
+            skills.add(label.lower())
 
     return list(skills)
 
+def extract_skills_with_textrazor(text):
+    """Extract relevant skills from text using TextRazor API."""
+    if not text.strip():
+        return []
+
+    return skills_from_analysis(analyze_text(text))
+
 @ats_bp.route("/analyze", methods=["POST"])
 def analyze_ats():
     try:
@@ -39,9 +50,17 @@ def analyze_ats():
         if not resume_text or not job_description:
             return jsonify({"error": "Missing resume or job description"}), 400
 
-        # Extract skills
-        resume_skills = extract_skills_with_textrazor(resume_text)
-        job_skills = extract_skills_with_textrazor(job_description)
+        engine = data.get("engine") or ATS_ENGINE
+        if engine not in ("local", "textrazor"):
+            return jsonify({"error": "engine must be 'local' or 'textrazor'"}), 400
+        if engine == "local":
+            return jsonify({**analyze_ats_local(resume_text, job_description), "engine": "local"})
+
+        # Extract skills; both texts are analyzed concurrently (and the JD is
+        # usually cached from an earlier candidate)
+        resume_analysis, job_analysis = analyze_texts(resume_text, job_description)
+        resume_skills = skills_from_analysis(resume_analysis)
+        job_skills = skills_from_analysis(job_analysis)
 
         # Compute matched skills and score
         matched_skills = list(set(resume_skills).intersection(set(job_skills)))
@@ -51,10 +70,88 @@ def analyze_ats():
             "score": score,
             "matched_skills": matched_skills,
             "required_skills": job_skills,
-            "found_skills": resume_skills
+            "found_skills": resume_skills,
+            "engine": "textrazor"
         })
 
     except textrazor.TextRazorAnalysisException as tre:
         return jsonify({"error": f"TextRazor API error: {str(tre)}"}), 500
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+@ats_bp.route("/analyze_bulk", methods=["POST"])
+@jwt_required()
+def analyze_ats_bulk():
+    """Rank many resumes against one job description with the local engine.
+
+    Body: job_description, plus "resumes" ([{"id", "text"}] or plain strings)
+    and/or "candidate_ids" (employers only; uses each user's saved resume).
+    Only candidates who applied to one of the requesting employer's postings
+    are scored; other ids, valid or not, come back in unavailable_candidate_ids.
+    Paged with "page" (1-based) and "page_size".
+    """
+    data = request.get_json() or {}
+    job_description = data.get("job_description", "")
+    resumes = data.get("resumes") or []
+    candidate_ids = data.get("candidate_ids") or []
+
+    if not job_description or not (resumes or candidate_ids):
+        return jsonify({"error": "Missing job description or resumes"}), 400
+    if len(resumes) + len(candidate_ids) > MAX_BULK_ATS_RESUMES:
+        return jsonify({"error": f"At most {MAX_BULK_ATS_RESUMES} resumes per request"}), 400
+
+    try:
+        page = max(1, int(data.get("page", 1)))
+        page_size = min(max(1, int(data.get("page_size", 50))), 500)
+    except (TypeError, ValueError):
+        return jsonify({"error": "page and page_size must be integers"}), 400
+
+    pairs = []
+    for index, resume in enumerate(resumes):
+        if isinstance(resume, dict):
+            pairs.append((resume.get("id", index), resume.get("text") or ""))
+        else:
+            pairs.append((index, str(resume)))
+
+    unavailable = []
+    if candidate_ids:
+        requester = User.objects(id=get_jwt_identity(), role="employer").first()
+        if not requester:
+            return jsonify({"error": "Only employers can score candidates by id"}), 403
+        requested = []
+        for cid in dict.fromkeys(map(str, candidate_ids)):
+            if ObjectId.is_valid(cid):
+                requested.append(ObjectId(cid))
+            else:
+                unavailable.append(cid)
+        applied = set()
+        if requested:
+            applied = {
+                str(cid) for cid in JobPosting.objects(
+                    posted_by=requester.id,
+                    applicants__candidate_id__in=requested
+                ).distinct("applicants.candidate_id")
+            }
+        allowed = [cid for cid in map(str, requested) if cid in applied]
+        found = {str(c.id): c.resume or "" for c in User.objects(id__in=allowed).only("id", "resume")}
+        for cid in map(str, requested):
+            if cid in found:
+                pairs.append((cid, found[cid]))
+            else:
+                unavailable.append(cid)
+
+    try:
+        required_skills, ranked = rank_resumes(job_description, pairs)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    start = (page - 1) * page_size
+    return jsonify({
+        "required_skills": required_skills,
+        "total": len(ranked),
+        "page": page,
+        "page_size": page_size,
+        "results": ranked[start:start + page_size],
+        "unavailable_candidate_ids": unavailable,
+        "engine": "local"
+    })
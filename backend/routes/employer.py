@@ -3,13 +3,16 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import JobPosting, User
 from datetime import datetime
 from bson import ObjectId
+import os
 import google.generativeai as genai
-from config import GEMINI_API_KEY
+from utils.gemini_client import get_model
+from utils.job_skill_suggestions import suggest_job_skills as suggest_skills_for_job
+from utils.pagination import keyset_match, page_params, paginate
 
 employer_bp = Blueprint("employer", __name__, url_prefix="/api/employer")
 
-# Configure Gemini
-genai.configure(api_key=GEMINI_API_KEY)
+MY_JOBS_PAGE_SIZE = int(os.getenv("MY_JOBS_PAGE_SIZE", "50"))
+MAX_MY_JOBS_PAGE_SIZE = 100
 
 
 @employer_bp.route("/post_job", methods=["POST"])
@@ -54,37 +57,49 @@ def my_jobs():
     if not employer:
         return jsonify({"msg": "Not authorized"}), 403
 
-    jobs = JobPosting.objects(posted_by=user_id)
-    jobs_list = []
+    try:
+        cursor, limit = page_params(request.args.get("cursor"), request.args.get("limit"), MY_JOBS_PAGE_SIZE, MAX_MY_JOBS_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    # Applicants are summarized in Mongo; /job-applicants/<job_id> lists them
+    sort_keys = ["posted_at", "_id"]
+    pipeline = [{"$match": {"posted_by": ObjectId(user_id)}}]
+    if cursor:
+        pipeline.append(keyset_match(sort_keys, cursor))
+    pipeline += [
+        {"$sort": {key: -1 for key in sort_keys}},
+        {"$limit": limit + 1},
+        {"$project": {
+            "title": 1, "company": 1, "description": 1, "location": 1, "salary": 1, "job_type": 1,
+            "skills_required": 1, "posted_at": 1, "is_active": 1,
+            "applicant_count": {"$size": {"$ifNull": ["$applicants", []]}},
+            "pending_count": {"$size": {"$filter": {
+                "input": {"$ifNull": ["$applicants", []]},
+                "cond": {"$eq": [{"$toLower": {"$ifNull": ["$$this.status", ""]}}, "pending"]}
+            }}}
+        }},
+    ]
+    jobs, next_cursor = paginate(list(JobPosting.objects.aggregate(pipeline)), limit, sort_keys)
 
+    jobs_list = []
     for job in jobs:
         jobs_list.append({
-            "id": str(job.id),
-            "title": job.title,
-            "company": job.company,
-            "description": job.description,
-            "location": job.location,
-            "salary": job.salary,
-            "job_type": job.job_type,
-            "skills_required": job.skills_required,
-            "posted_at": job.posted_at.isoformat() if job.posted_at else None,
-            "is_active": job.is_active,
-            "applicants": [
-                {
-                    "candidate_id": str(app.candidate_id),
-                    "candidate_name": app.candidate_name,
-                    "candidate_email": app.candidate_email,
-                    "ats_score": app.ats_score,
-                    "matched_skills": app.matched_skills,
-                    "missing_skills": app.missing_skills,
-                    "applied_at": app.applied_at.isoformat() if app.applied_at else None,
-                    "status": app.status
-                }
-                for app in job.applicants
-            ]
+            "id": str(job["_id"]),
+            "title": job.get("title"),
+            "company": job.get("company"),
+            "description": job.get("description"),
+            "location": job.get("location"),
+            "salary": job.get("salary"),
+            "job_type": job.get("job_type"),
+            "skills_required": job.get("skills_required", []),
+            "posted_at": job["posted_at"].isoformat() if job.get("posted_at") else None,
+            "is_active": job.get("is_active", True),
+            "applicant_count": job["applicant_count"],
+            "pending_count": job["pending_count"]
         })
 
-    return jsonify({"jobs": jobs_list}), 200
+    return jsonify({"jobs": jobs_list, "next_cursor": next_cursor}), 200
 
 
 @employer_bp.route("/delete-job/<job_id>", methods=["DELETE"])
@@ -239,50 +254,16 @@ def suggest_job_skills():
         return jsonify({"msg": "Please provide either job title or description"}), 400
 
     try:
-        model_names = ['models/gemini-2.5-pro', 'models/gemini-2.5-flash',
-                       'models/gemini-pro-latest', "models/gemma-3-27b-it"]
-        model = None
-
-        for model_name in model_names:
-            try:
-                model = genai.GenerativeModel(model_name)
-                break
-            except:
-                continue
-
-        if not model:
+        if not get_model():
             return jsonify({"msg": "Could not initialize Gemini model"}), 500
 
-        prompt = f"""Based on this job posting, suggest relevant technical skills:
-Job Title: {title}
-Job Description: {description}
-
-Please provide:
-1. Required Skills: Core technical skills absolutely needed for this role (5-8 skills)
-2. Complementary Skills: Nice-to-have skills that would be beneficial (3-5 skills)
-
-Return ONLY a JSON object in this exact format with no additional text:
-{{
-  "required_skills": ["skill1", "skill2", ...],
-  "complementary_skills": ["skill1", "skill2", ...]
-}}"""
-
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        if result_text.startswith("```json"):
-            result_text = result_text[7:]
-        if result_text.startswith("```"):
-            result_text = result_text[3:]
-        if result_text.endswith("```"):
-            result_text = result_text[:-3]
-
-        import json
-        skills_data = json.loads(result_text.strip())
+        skills_data = suggest_skills_for_job(title, description)
+        if skills_data is None:
+            return jsonify({"msg": "Failed to suggest skills"}), 500
 
         return jsonify({
-            "required_skills": skills_data.get("required_skills", []),
-            "complementary_skills": skills_data.get("complementary_skills", [])
+            "required_skills": skills_data["required_skills"],
+            "complementary_skills": skills_data["complementary_skills"]
         }), 200
 
     except Exception as e:
@@ -1,12 +1,17 @@
 from flask import Blueprint, jsonify
 import requests
+from utils.http_client import http_get
 
 external_jobs = Blueprint("external_jobs", __name__)
 
 @external_jobs.route("/external/github", methods=["GET"])
 def github_jobs():
     url = "https://jobs.github.com/positions.json?description=python"
-    response = requests.get(url)
+    try:
+        response = http_get(url, upstream="github_jobs")
+    except requests.RequestException as e:
+        print(f"GitHub jobs request failed: {e}")
+        return jsonify({"error": "Failed to fetch from GitHub"}), 500
     if response.status_code == 200:
         return jsonify(response.json())
     else:
@@ -1,11 +1,19 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import requests
 import os
+import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 from bson import ObjectId
 from models import JobPosting, User, CandidateApplication
+from utils.http_client import http_get
+from utils.provider_cache import provider_cache, provider_key
+from utils.single_flight import single_flight
+from utils.pagination import keyset_match, page_params, paginate
+from utils.skill_normalizer import normalize_skill_key
 
 load_dotenv()
 JSEARCH_API_KEY = os.getenv("JSEARCH_API_KEY")
@@ -14,6 +22,28 @@ ADZUNA_API_KEY = os.getenv("ADZUNA_API_KEY")
 
 jobs_bp = Blueprint("jobs", __name__, url_prefix="/api/jobs")
 
+# /search queries every source at once; each gets its own deadline (seconds)
+# and is reported in skipped_sources if it misses it
+SEARCH_DEADLINES = {
+    "internal": float(os.getenv("SEARCH_DEADLINE_INTERNAL", "3")),
+    "adzuna": float(os.getenv("SEARCH_DEADLINE_ADZUNA", "6")),
+    "jsearch": float(os.getenv("SEARCH_DEADLINE_JSEARCH", "6")),
+}
+SOURCE_CREDENTIALS = {
+    "adzuna": (ADZUNA_APP_ID, ADZUNA_API_KEY),
+    "jsearch": (JSEARCH_API_KEY,),
+}
+search_flight = single_flight("job_search")
+search_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SEARCH_WORKERS", "16")),
+    thread_name_prefix="job-search"
+)
+
+# Internal results are paged; clients pass back next_cursor for the next page
+INTERNAL_SEARCH_PAGE_SIZE = int(os.getenv("INTERNAL_SEARCH_PAGE_SIZE", "50"))
+MAX_INTERNAL_SEARCH_PAGE_SIZE = 100
+DESCRIPTION_SNIPPET_LENGTH = 200
+
 UK_CITIES = [
     "London", "Manchester", "Birmingham", "Leeds", "Glasgow", "Edinburgh",
     "Liverpool", "Bristol", "Sheffield", "Newcastle"
@@ -36,106 +66,197 @@ def determine_adzuna_location_params(location_input):
             where_param = location_input
     return country_code, where_param
 
-def fetch_jsearch_jobs(query, location=""):
-    try:
-        if not query:
-            query = "developer"
-        search_query = f"{query} {location}".strip()
-        url = "https://jsearch.p.rapidapi.com/search"
-        headers = {
-            "x-rapidapi-key": JSEARCH_API_KEY,
-            "x-rapidapi-host": "jsearch.p.rapidapi.com"
-        }
-        params = {"query": search_query, "page": "1", "num_pages": "1"}
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
-        return [{
-            "id": job.get("job_id"),
-            "title": job.get("job_title"),
-            "company": job.get("employer_name"),
-            "location": job.get("job_city") or job.get("job_country"),
-            "type": job.get("job_employment_type") or "Not specified",
-            "salary": job.get("job_salary_currency") or "Not specified",
-            "description": (job.get("job_description") or "")[:200] + "...",
-            "url": job.get("job_apply_link"),
-            "source": "JSearch",
-            "posted_date": job.get("job_posted_at_datetime_utc"),
-            "is_external": True
-        } for job in data.get("data", [])]
-    except Exception as e:
-        print(f"JSearch error: {e}")
-        return []
+def fetch_jsearch_jobs(query, location="", timeout=None):
+    """JSearch results in the common job shape; raises on request errors."""
+    if not query:
+        query = "developer"
+    search_query = f"{query} {location}".strip()
+    url = "https://jsearch.p.rapidapi.com/search"
+    headers = {
+        "x-rapidapi-key": JSEARCH_API_KEY,
+        "x-rapidapi-host": "jsearch.p.rapidapi.com"
+    }
+    params = {"query": search_query, "page": "1", "num_pages": "1"}
+    response = http_get(url, upstream="jsearch", headers=headers, params=params, timeout=timeout or SEARCH_DEADLINES["jsearch"])
+    response.raise_for_status()
+    data = response.json()
+    return [{
+        "id": job.get("job_id"),
+        "title": job.get("job_title"),
+        "company": job.get("employer_name"),
+        "location": job.get("job_city") or job.get("job_country"),
+        "type": job.get("job_employment_type") or "Not specified",
+        "salary": job.get("job_salary_currency") or "Not specified",
+        "description": (job.get("job_description") or "")[:200] + "...",
+        "url": job.get("job_apply_link"),
+        "source": "JSearch",
+        "posted_date": job.get("job_posted_at_datetime_utc"),
+        "is_external": True
+    } for job in data.get("data", [])]
 
-def fetch_adzuna_jobs(query, location_input="", results_per_page=10):
-    try:
-        country_code, where_param = determine_adzuna_location_params(location_input)
-        if not query:
-            query = "developer"
-        url = f"https://api.adzuna.com/v1/api/jobs/{country_code}/search/1"
-        params = {
-            "app_id": ADZUNA_APP_ID,
-            "app_key": ADZUNA_API_KEY,
-            "what": query,
-            "results_per_page": results_per_page,
-            "sort_by": "relevance",
-        }
-        if where_param:
-            params["where"] = where_param
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        jobs_data = response.json()
-        return [{
-            "id": job.get("id"),
+def fetch_adzuna_jobs(query, location_input="", results_per_page=10, timeout=None):
+    """Adzuna results in the common job shape; raises on request errors."""
+    country_code, where_param = determine_adzuna_location_params(location_input)
+    if not query:
+        query = "developer"
+    url = f"https://api.adzuna.com/v1/api/jobs/{country_code}/search/1"
+    params = {
+        "app_id": ADZUNA_APP_ID,
+        "app_key": ADZUNA_API_KEY,
+        "what": query,
+        "results_per_page": results_per_page,
+        "sort_by": "relevance",
+    }
+    if where_param:
+        params["where"] = where_param
+    response = http_get(url, upstream="adzuna", params=params, timeout=timeout or SEARCH_DEADLINES["adzuna"])
+    response.raise_for_status()
+    jobs_data = response.json()
+    return [{
+        "id": job.get("id"),
+        "title": job.get("title"),
+        "company": job.get("company", {}).get("display_name"),
+        "location": job.get("location", {}).get("display_name"),
+        "type": job.get("contract_type") or "Not specified",
+        "salary": f"{job.get('salary_min') or 'Not'} - {job.get('salary_max') or 'specified'}",
+        "description": (job.get("description") or "")[:200] + "...",
+        "url": job.get("redirect_url"),
+        "source": "Adzuna",
+        "posted_date": job.get("created"),
+        "is_external": True
+    } for job in jobs_data.get("results", [])]
+
+def fetch_internal_jobs(query="", location="", skills=[], cursor=None, limit=INTERNAL_SEARCH_PAGE_SIZE, page_info=None):
+    """Active internal postings in the common job shape; raises on database errors.
+
+    Served by indexes: `query` goes through the job_postings text index and
+    ranks by text score, `skills` match skills_normalized and rank by how
+    many were hit; otherwise newest first. Only the serialized fields (and
+    a description snippet) leave Mongo. Results are paged by keyset: pass
+    the previous page's next_cursor, which is written to `page_info` (None
+    on the last page).
+    """
+    match = {"is_active": True}
+    if query:
+        match["$text"] = {"$search": query}
+    if location and location.lower() not in ["in", "india"]:
+        match["location"] = {"$regex": re.escape(location), "$options": "i"}
+    skill_keys = sorted({normalize_skill_key(s) for s in skills if isinstance(s, str) and s.strip()})
+    if skill_keys:
+        match["skills_normalized"] = {"$in": skill_keys}
+
+    pipeline = [{"$match": match}]
+    sort_keys = ["posted_at", "_id"]
+    if query:
+        pipeline.append({"$addFields": {"rank": {"$meta": "textScore"}}})
+        sort_keys.insert(0, "rank")
+    elif skill_keys:
+        pipeline.append({"$addFields": {"rank": {"$size": {"$setIntersection": ["$skills_normalized", skill_keys]}}}})
+        sort_keys.insert(0, "rank")
+    if cursor:
+        pipeline.append(keyset_match(sort_keys, cursor))
+    pipeline += [
+        {"$sort": {key: -1 for key in sort_keys}},
+        {"$limit": limit + 1},
+        {"$project": {
+            "title": 1, "company": 1, "location": 1, "job_type": 1, "salary": 1,
+            "skills_required": 1, "posted_at": 1, "posted_by": 1, "rank": 1,
+            # One code point past the snippet length, to know whether to add "..."
+            "description": {"$substrCP": [{"$ifNull": ["$description", ""]}, 0, DESCRIPTION_SNIPPET_LENGTH + 1]}
+        }},
+    ]
+
+    docs, next_cursor = paginate(list(JobPosting.objects.aggregate(pipeline)), limit, sort_keys)
+    if page_info is not None:
+        page_info["next_cursor"] = next_cursor
+
+    internal_jobs = []
+    for job in docs:
+        description = job.get("description") or ""
+        internal_jobs.append({
+            "id": str(job["_id"]),
             "title": job.get("title"),
-            "company": job.get("company", {}).get("display_name"),
-            "location": job.get("location", {}).get("display_name"),
-            "type": job.get("contract_type") or "Not specified",
-            "salary": f"{job.get('salary_min') or 'Not'} - {job.get('salary_max') or 'specified'}",
-            "description": (job.get("description") or "")[:200] + "...",
-            "url": job.get("redirect_url"),
-            "source": "Adzuna",
-            "posted_date": job.get("created"),
-            "is_external": True
-        } for job in jobs_data.get("results", [])]
-    except Exception as e:
-        print(f"Adzuna error: {e}")
-        return []
+            "company": job.get("company"),
+            "location": job.get("location") or "Remote",
+            "type": job.get("job_type"),
+            "salary": job.get("salary") or "Not specified",
+            "description": description[:DESCRIPTION_SNIPPET_LENGTH] + "..." if len(description) > DESCRIPTION_SNIPPET_LENGTH else description,
+            "skills_required": job.get("skills_required", []),
+            "source": "Internal",
+            "posted_date": job["posted_at"].isoformat() if job.get("posted_at") else None,
+            "is_external": False,
+            "posted_by": str(job["posted_by"]) if job.get("posted_by") else None
+        })
+    return internal_jobs
 
-def fetch_internal_jobs(query="", location="", skills=[]):
-    try:
-        filters = {"is_active": True}
-        if query:
-            filters["$or"] = [
-                {"title": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}}
-            ]
-        if location and location.lower() not in ["in", "india"]:
-            filters["location"] = {"$regex": location, "$options": "i"}
-        if skills:
-            filters["skills_required"] = {"$elemMatch": {"$regex": "|".join([s.lower() for s in skills]), "$options": "i"}}
-
-        jobs = JobPosting.objects(__raw__=filters).order_by('-posted_at')
-        internal_jobs = []
-        for job in jobs:
-            internal_jobs.append({
-                "id": str(job.id),
-                "title": job.title,
-                "company": job.company,
-                "location": job.location or "Remote",
-                "type": job.job_type,
-                "salary": job.salary or "Not specified",
-                "description": job.description[:200] + "..." if len(job.description) > 200 else job.description,
-                "skills_required": job.skills_required,
-                "source": "Internal",
-                "posted_date": job.posted_at.isoformat() if job.posted_at else None,
-                "is_external": False,
-                "posted_by": str(job.posted_by.id) if job.posted_by else None
-            })
-        return internal_jobs
-    except Exception as e:
-        print(f"Error fetching internal jobs: {e}")
-        return []
+def search_sources(query, location, skills, cursor=None, limit=INTERNAL_SEARCH_PAGE_SIZE, page_info=None):
+    """(source, fetch callable) for each source a search queries, in display order.
+
+    `cursor` pages the internal results; their next_cursor goes to `page_info`.
+    External results only come with the first page, so a cursor page queries
+    the internal source alone. They go through the shared stale-while-
+    revalidate provider cache, and concurrent misses for the same key share
+    one upstream call.
+    """
+    internal = ("internal", lambda: fetch_internal_jobs(query, location, skills, cursor=cursor, limit=limit, page_info=page_info))
+    if cursor:
+        return [internal]
+
+    if not query and skills:
+        suggested_roles = suggest_top_roles(skills)
+        query_for_adzuna = " OR ".join(suggested_roles[:3])
+        query_for_jsearch = " ".join(suggested_roles[:3])
+    else:
+        combined_query = f"{query} {' '.join(skills)}".strip()
+        query_for_adzuna = combined_query
+        query_for_jsearch = combined_query
+
+    adzuna_key = provider_key("adzuna", query_for_adzuna, location)
+    jsearch_key = provider_key("jsearch", query_for_jsearch, location)
+    return [
+        internal,
+        ("adzuna", lambda: provider_cache.get_or_fetch(
+            adzuna_key,
+            lambda: search_flight.do(adzuna_key, lambda: fetch_adzuna_jobs(query_for_adzuna, location))
+        )),
+        ("jsearch", lambda: provider_cache.get_or_fetch(
+            jsearch_key,
+            lambda: search_flight.do(jsearch_key, lambda: fetch_jsearch_jobs(query_for_jsearch, location))
+        )),
+    ]
+
+def iter_source_results(sources):
+    """Run every source concurrently and yield (source, jobs, skipped_reason)
+    as each one finishes, or when its deadline passes.
+
+    A source is skipped ("not_configured", "timeout" or "error") with an
+    empty job list; the whole call takes at most the largest deadline.
+    """
+    started = time.monotonic()
+    pending = {}
+    for name, fetch in sources:
+        if name in SOURCE_CREDENTIALS and not all(SOURCE_CREDENTIALS[name]):
+            yield name, [], "not_configured"
+            continue
+        pending[search_executor.submit(fetch)] = (name, started + SEARCH_DEADLINES[name])
+
+    while pending:
+        next_deadline = min(deadline for _, deadline in pending.values())
+        done, _ = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+        for future in done:
+            name, _ = pending.pop(future)
+            try:
+                yield name, future.result(), None
+            except Exception as e:
+                print(f"{name} search error: {e}")
+                yield name, [], "error"
+        now = time.monotonic()
+        for future, (name, deadline) in list(pending.items()):
+            if deadline <= now and not future.done():
+                del pending[future]
+                future.cancel()
+                print(f"{name} search missed its {SEARCH_DEADLINES[name]:g}s deadline")
+                yield name, [], "timeout"
 
 def suggest_top_roles(skills):
     skill_to_role_map = {
@@ -166,32 +287,100 @@ def search_jobs():
         query = data.get("query", "").strip()
         location = data.get("location", "").strip()
         skills = data.get("skills", [])
+        try:
+            cursor, limit = page_params(data.get("cursor"), data.get("limit"), INTERNAL_SEARCH_PAGE_SIZE, MAX_INTERNAL_SEARCH_PAGE_SIZE)
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
 
-        internal_jobs = fetch_internal_jobs(query, location, skills)
-        if not query and skills:
-            suggested_roles = suggest_top_roles(skills)
-            query_for_adzuna = " OR ".join(suggested_roles[:3])
-            query_for_jsearch = " ".join(suggested_roles[:3])
-        else:
-            combined_query = f"{query} {' '.join(skills)}".strip()
-            query_for_adzuna = combined_query
-            query_for_jsearch = combined_query
+        results = {}
+        skipped_sources = []
+        page_info = {}
+        sources = search_sources(query, location, skills, cursor=cursor, limit=limit, page_info=page_info)
+        for name, jobs, skipped in iter_source_results(sources):
+            results[name] = jobs
+            if skipped:
+                skipped_sources.append({"source": name, "reason": skipped})
 
-        adzuna_jobs = fetch_adzuna_jobs(query_for_adzuna, location)
-        jsearch_jobs = fetch_jsearch_jobs(query_for_jsearch, location)
-        all_jobs = internal_jobs + adzuna_jobs + jsearch_jobs
+        internal_jobs = results.get("internal", [])
+        all_jobs = [job for name, _ in sources for job in results.get(name, [])]
 
         return jsonify({
             "success": True,
             "jobs": all_jobs,
             "count": len(all_jobs),
             "internal_count": len(internal_jobs),
+            "skipped_sources": skipped_sources,
+            "next_cursor": page_info.get("next_cursor"),
             "suggested_roles": suggest_top_roles(skills) if not query else []
         })
     except Exception as e:
         print(f"Search error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@jobs_bp.route("/search/stream", methods=["POST"])
+def search_jobs_stream():
+    """Streaming /search: one message per source as it arrives, internal first.
+
+    NDJSON by default; server-sent events with ?format=sse or an
+    "Accept: text/event-stream" header. Messages are {"type": "jobs",
+    "source", "jobs"}, {"type": "skipped", "source", "reason"} and a final
+    {"type": "done", ...} carrying the counts and next_cursor /search returns.
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    query = data.get("query", "").strip()
+    location = data.get("location", "").strip()
+    skills = data.get("skills", [])
+    try:
+        cursor, limit = page_params(data.get("cursor"), data.get("limit"), INTERNAL_SEARCH_PAGE_SIZE, MAX_INTERNAL_SEARCH_PAGE_SIZE)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    use_sse = request.args.get("format") == "sse" or "text/event-stream" in request.headers.get("Accept", "")
+
+    def encode(message):
+        if use_sse:
+            return f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        return json.dumps(message) + "\n"
+
+    def generate():
+        counts = {}
+        skipped_sources = []
+        held = []  # external batches that beat the internal query
+        internal_sent = False
+        page_info = {}
+        sources = search_sources(query, location, skills, cursor=cursor, limit=limit, page_info=page_info)
+        for name, jobs, skipped in iter_source_results(sources):
+            counts[name] = len(jobs)
+            if skipped:
+                skipped_sources.append({"source": name, "reason": skipped})
+                message = {"type": "skipped", "source": name, "reason": skipped}
+            else:
+                message = {"type": "jobs", "source": name, "jobs": jobs}
+            if name == "internal":
+                yield encode(message)
+                internal_sent = True
+                for message in held:
+                    yield encode(message)
+                held = []
+            elif internal_sent:
+                yield encode(message)
+            else:
+                held.append(message)
+        for message in held:
+            yield encode(message)
+        yield encode({
+            "type": "done",
+            "count": sum(counts.values()),
+            "internal_count": counts.get("internal", 0),
+            "skipped_sources": skipped_sources,
+            "next_cursor": page_info.get("next_cursor"),
+            "suggested_roles": suggest_top_roles(skills) if not query else []
+        })
+
+    if use_sse:
+        return Response(generate(), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    return Response(generate(), mimetype="application/x-ndjson")
+
 @jobs_bp.route("/apply/<job_id>", methods=["POST"])
 @jwt_required()
 def apply_to_job(job_id):
@@ -319,7 +508,7 @@ def test_adzuna():
         print(f"Testing Adzuna API with URL: {test_url}")
         print(f"Parameters: app_id={ADZUNA_APP_ID[:8]}..., what=software developer")
         
-        response = requests.get(test_url, params=test_params, timeout=10)
+        response = http_get(test_url, upstream="adzuna", params=test_params, timeout=10)
         
         print(f"Adzuna API Response Status: {response.status_code}")
         
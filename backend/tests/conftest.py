@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+# Tests import backend modules the way the app does ("from utils.x import ...")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _FakeDb:
+    def command(self, *args, **kwargs):
+        return {"ok": 1}
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """The Flask app module, imported without a MongoDB server or API keys.
+
+    The import-time connect/ping and ATS model warm-up are patched out, so
+    only code paths that don't reach Mongo can be exercised.
+    """
+    for name in ("flask", "flask_cors", "flask_jwt_extended", "flask_socketio", "mongoengine",
+                 "textrazor", "fitz", "certifi", "google.generativeai"):
+        pytest.importorskip(name)
+    import mongoengine
+    from mongoengine import connection
+    from utils import local_ats
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("MONGODB_URI", "mongodb://localhost:27017")
+        patch.setattr(mongoengine, "connect", lambda *args, **kwargs: None)
+        patch.setattr(connection, "get_db", lambda *args, **kwargs: _FakeDb())
+        patch.setattr(local_ats, "warm_ats_model", lambda: None)
+        import app
+    return app
@@ -0,0 +1,132 @@
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_jwt_extended")
+pytest.importorskip("mongoengine")
+pytest.importorskip("textrazor")
+
+from bson import ObjectId
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from routes import ats
+from utils import local_ats
+from utils.local_ats import AtsModel
+from utils.skill_taxonomy import get_skill_taxonomy
+
+EMPLOYER = str(ObjectId())
+OTHER_EMPLOYER = str(ObjectId())
+CANDIDATE = str(ObjectId())
+APPLIED = str(ObjectId())
+APPLIED_ELSEWHERE = str(ObjectId())
+STRANGER = str(ObjectId())
+
+
+class FakeQuerySet(list):
+    def first(self):
+        return self[0] if self else None
+
+    def only(self, *fields):
+        return self
+
+    def distinct(self, field):
+        return list(dict.fromkeys(value for doc in self for value in doc))
+
+
+class FakeUser:
+    def __init__(self, id, role, resume=""):
+        self.id = ObjectId(id)
+        self.role = role
+        self.resume = resume
+
+
+USERS = [
+    FakeUser(EMPLOYER, "employer"),
+    FakeUser(CANDIDATE, "employee", "python"),
+    FakeUser(APPLIED, "employee", "python kubernetes"),
+    FakeUser(APPLIED_ELSEWHERE, "employee", "python kubernetes git"),
+    FakeUser(STRANGER, "employee", "python"),
+]
+# Candidate ids that applied to each employer's postings
+APPLICANTS = {EMPLOYER: [CANDIDATE, APPLIED], OTHER_EMPLOYER: [APPLIED_ELSEWHERE]}
+
+
+class Users:
+    @staticmethod
+    def objects(id=None, role=None, id__in=None):
+        users = USERS
+        if id is not None:
+            users = [u for u in users if str(u.id) == str(id)]
+        if role is not None:
+            users = [u for u in users if u.role == role]
+        if id__in is not None:
+            users = [u for u in users if str(u.id) in id__in]
+        return FakeQuerySet(users)
+
+
+class JobPostings:
+    @staticmethod
+    def objects(posted_by, applicants__candidate_id__in):
+        applied = [ObjectId(cid) for cid in APPLICANTS.get(str(posted_by), [])]
+        return FakeQuerySet([[cid for cid in applied if cid in applicants__candidate_id__in]])
+
+
+@pytest.fixture
+def client(monkeypatch):
+    taxonomy = get_skill_taxonomy()
+    monkeypatch.setattr(local_ats, "_model", AtsModel(taxonomy.version, {}, 0, 0))
+    monkeypatch.setattr(ats, "User", Users)
+    monkeypatch.setattr(ats, "JobPosting", JobPostings)
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-with-enough-length"
+    JWTManager(app)
+    app.register_blueprint(ats.ats_bp)
+    client = app.test_client()
+    with app.app_context():
+        client.tokens = {uid: create_access_token(identity=uid) for uid in (EMPLOYER, CANDIDATE)}
+    return client
+
+
+def bulk(client, body, as_user=EMPLOYER):
+    return client.post("/api/ats/analyze_bulk", json=body, headers={"Authorization": f"Bearer {client.tokens[as_user]}"})
+
+
+def test_analyze_uses_the_local_engine_by_default(client):
+    body = client.post("/api/ats/analyze", json={
+        "resume_text": "Python developer", "job_description": "Python and Docker"
+    }).get_json()
+    assert body["engine"] == "local"
+    assert body["matched_skills"] == ["Python"]
+    assert body["score"] == 50.0
+
+    response = client.post("/api/ats/analyze", json={"resume_text": "x", "job_description": "y", "engine": "other"})
+    assert response.status_code == 400
+
+
+def test_bulk_ranks_and_pages_resumes(client):
+    resumes = [{"id": "r1", "text": "python"}, "python docker", {"id": "r3", "text": ""}]
+    body = bulk(client, {"job_description": "Python and Docker", "resumes": resumes, "page_size": 2}).get_json()
+    assert body["total"] == 3
+    assert [(r["id"], r["score"]) for r in body["results"]] == [(1, 100.0), ("r1", 50.0)]
+    body = bulk(client, {"job_description": "Python and Docker", "resumes": resumes, "page": 2, "page_size": 2}).get_json()
+    assert [r["id"] for r in body["results"]] == ["r3"]
+
+
+def test_bulk_validates_input(client):
+    assert bulk(client, {"resumes": ["python"]}).status_code == 400
+    assert bulk(client, {"job_description": "Python", "resumes": ["python"], "page": "x"}).status_code == 400
+    assert client.post("/api/ats/analyze_bulk", json={"job_description": "Python", "resumes": ["x"]}).status_code == 401
+
+
+def test_candidate_ids_are_limited_to_the_employers_applicants(client):
+    body = bulk(client, {
+        "job_description": "Python and Kubernetes",
+        "candidate_ids": [APPLIED, CANDIDATE, APPLIED, APPLIED_ELSEWHERE, STRANGER, "not-an-id"],
+    }).get_json()
+    assert [(r["id"], r["score"]) for r in body["results"]] == [(APPLIED, 100.0), (CANDIDATE, 50.0)]
+    assert sorted(body["unavailable_candidate_ids"]) == sorted(["not-an-id", APPLIED_ELSEWHERE, STRANGER])
+
+
+def test_only_employers_score_by_candidate_id(client):
+    response = bulk(client, {"job_description": "Python", "candidate_ids": [APPLIED]}, as_user=CANDIDATE)
+    assert response.status_code == 403
@@ -0,0 +1,78 @@
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import TieredCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TieredCache(default_ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=30)
+    cache.set("c", 3, ttl=None)  # None falls back to default_ttl
+    clock[0] += 11
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+    assert cache.get("b") == 2
+    clock[0] += 20
+    assert cache.get("b", "gone") == "gone"
+
+
+def test_no_default_ttl_means_no_expiry(clock):
+    cache = TieredCache()
+    cache.set("a", 1)
+    clock[0] += 10 ** 6
+    assert cache.get("a") == 1
+
+
+def test_evicts_least_recently_used(clock):
+    cache = TieredCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_disk_tier_survives_a_new_instance(clock, tmp_path):
+    TieredCache(disk_dir=str(tmp_path), default_ttl=10).set("k", {"x": [1, 2]})
+    cache = TieredCache(disk_dir=str(tmp_path))
+    assert cache.get("k") == {"x": [1, 2]}
+    assert cache.stats()["disk_hits"] == 1
+    clock[0] += 11
+    assert cache.get("k") is None
+    assert TieredCache(disk_dir=str(tmp_path)).get("k") is None
+
+
+def test_delete_removes_both_tiers(clock, tmp_path):
+    cache = TieredCache(disk_dir=str(tmp_path))
+    cache.set("k", 1)
+    cache.delete("k")
+    assert cache.get("k") is None
+    assert TieredCache(disk_dir=str(tmp_path)).get("k") is None
+
+
+def test_unserializable_values_stay_in_memory(clock, tmp_path):
+    cache = TieredCache(disk_dir=str(tmp_path))
+    cache.set("k", object)
+    assert cache.get("k") is object
+    assert TieredCache(disk_dir=str(tmp_path)).get("k") is None
+
+
+def test_stats_count_hits_and_misses(clock):
+    cache = TieredCache(name="t", maxsize=5)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    assert cache.stats() == {
+        "name": "t", "size": 1, "maxsize": 5, "hits": 1, "disk_hits": 0, "misses": 1, "hit_rate": 0.5,
+    }
@@ -0,0 +1,117 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_jwt_extended")
+pytest.importorskip("mongoengine")
+pytest.importorskip("google.generativeai")
+
+from bson import ObjectId
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from routes import employer
+
+EMPLOYER = ObjectId()
+
+
+def matches(doc, query):
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not doc[key] < condition["$lt"]:
+                return False
+        elif doc[key] != condition:
+            return False
+    return True
+
+
+class FakeJobPostings:
+    """Runs the $match/$sort/$limit stages of my-jobs over in-memory postings."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.pipelines = []
+        self.objects = self
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        docs = list(self.docs)
+        for stage in pipeline:
+            if "$match" in stage:
+                docs = [doc for doc in docs if matches(doc, stage["$match"])]
+            elif "$sort" in stage:
+                for key in reversed(list(stage["$sort"])):
+                    docs.sort(key=lambda doc: doc[key], reverse=stage["$sort"][key] == -1)
+            elif "$limit" in stage:
+                docs = docs[:stage["$limit"]]
+        return iter([{
+            **doc,
+            "applicant_count": len(doc["applicants"]),
+            "pending_count": sum(1 for a in doc["applicants"] if a["status"].lower() == "pending"),
+        } for doc in docs])
+
+
+class Users:
+    @staticmethod
+    def objects(id=None, role=None):
+        found = [object()] if str(id) == str(EMPLOYER) and role == "employer" else []
+        return type("QuerySet", (list,), {"first": lambda self: self[0] if self else None})(found)
+
+
+@pytest.fixture
+def postings(monkeypatch):
+    docs = []
+    for i in range(7):
+        docs.append({
+            "_id": ObjectId(), "posted_by": EMPLOYER, "title": f"Job {i}",
+            # Pairs of postings share a timestamp, so _id has to break ties
+            "posted_at": datetime(2024, 1, 1 + i // 2),
+            "applicants": [{"status": "Pending"}, {"status": "Reviewed"}][:i % 3],
+        })
+    docs.append({"_id": ObjectId(), "posted_by": ObjectId(), "title": "Someone else's", "posted_at": datetime(2024, 2, 1), "applicants": []})
+    fake = FakeJobPostings(docs)
+    monkeypatch.setattr(employer, "JobPosting", fake)
+    monkeypatch.setattr(employer, "User", Users)
+    return fake
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-with-enough-length"
+    JWTManager(app)
+    app.register_blueprint(employer.employer_bp, url_prefix="/api/employer")
+    client = app.test_client()
+    with app.app_context():
+        client.headers = {"Authorization": f"Bearer {create_access_token(identity=str(EMPLOYER))}"}
+    return client
+
+
+def test_cursor_pages_cover_every_job_once_newest_first(client, postings):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/employer/my-jobs", query_string=params, headers=client.headers).get_json()
+        assert len(body["jobs"]) <= 3
+        seen.extend(body["jobs"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    expected = sorted((d for d in postings.docs if d["posted_by"] == EMPLOYER), key=lambda d: (d["posted_at"], d["_id"]), reverse=True)
+    assert [job["id"] for job in seen] == [str(d["_id"]) for d in expected]
+    assert len(postings.pipelines) == 3
+    job = next(job for job in seen if job["title"] == "Job 2")
+    assert (job["applicant_count"], job["pending_count"]) == (2, 1)
+
+
+def test_rejects_bad_paging_parameters(client, postings):
+    for params in ({"cursor": "forged"}, {"limit": 0}):
+        response = client.get("/api/employer/my-jobs", query_string=params, headers=client.headers)
+        assert response.status_code == 400
+    assert postings.pipelines == []
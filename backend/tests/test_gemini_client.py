@@ -0,0 +1,109 @@
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+from utils import gemini_client
+from utils.gemini_client import GeminiUnavailable, call_gemini
+from utils.rate_limit import CircuitBreaker, TokenBucket
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60, name="gemini")
+    monkeypatch.setattr(gemini_client, "gemini_breaker", breaker)
+    monkeypatch.setattr(gemini_client, "gemini_bucket", TokenBucket(1000, 100))
+    monkeypatch.setattr(gemini_client, "GEMINI_MAX_RETRIES", 2)
+    monkeypatch.setattr(gemini_client.time, "sleep", lambda seconds: None)
+    return breaker
+
+
+def failing_call():
+    raise ConnectionError("upstream down")
+
+
+def test_retried_request_counts_one_failure(breaker):
+    with pytest.raises(ConnectionError):
+        call_gemini(failing_call)
+    assert breaker.state == "closed"
+    assert breaker.stats()["failures"] == 1
+
+
+def test_retry_that_succeeds_counts_success(breaker):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise ConnectionError("blip")
+        return "ok"
+
+    assert call_gemini(flaky) == "ok"
+    assert breaker.stats()["failures"] == 0
+
+
+def test_half_open_trial_without_a_rate_slot_reopens(breaker, monkeypatch):
+    breaker.state = "open"
+    breaker._opened_at = gemini_client.time.monotonic() - 60
+    monkeypatch.setattr(gemini_client.gemini_bucket, "acquire", lambda timeout=None: False)
+    with pytest.raises(GeminiUnavailable):
+        call_gemini(lambda: "never called")
+    assert breaker.state == "open"
+
+
+class FakeStream:
+    """A streamed response: yields its chunks and records how far it was read."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            if self.closed:
+                return
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeModel:
+    model_name = "fake-model"
+
+    def __init__(self, chunks):
+        self.stream = FakeStream(chunks)
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        return self.stream
+
+
+STREAM_CHUNKS = ['```json\n{"extractedSkills": ["Python", ', '"SQL"], ', '"suggestedSkills": ["Docker"', ']}\n```']
+
+
+def test_stream_stops_and_closes_once_stop_keys_are_read(breaker):
+    model = FakeModel(STREAM_CHUNKS)
+    arrays = gemini_client.stream_json_arrays(model, "prompt", stop_keys=("extractedSkills",), ttl=0)
+    assert arrays == {"extractedSkills": ["Python", "SQL"]}
+    assert model.stream.read == 2
+    assert model.stream.closed
+
+
+def test_stream_is_closed_when_the_consumer_raises(breaker):
+    model = FakeModel(STREAM_CHUNKS)
+
+    def on_item(key, value):
+        raise RuntimeError("client went away")
+
+    with pytest.raises(RuntimeError):
+        gemini_client.stream_json_arrays(model, "prompt", on_item=on_item, ttl=0)
+    assert model.stream.read == 1
+    assert model.stream.closed
+
+
+def test_close_stream_cancels_the_transport_call():
+    cancelled = []
+    response = type("Response", (), {"_iterator": type("Call", (), {"cancel": lambda self: cancelled.append(1)})()})()
+    gemini_client.close_stream(response)
+    assert cancelled == [1]
@@ -0,0 +1,90 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from utils import http_client
+from utils.http_client import ResponseTooLarge, http_get, http_post, upstream_stats
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(1)
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = b"x" * 100
+        self.send_response(200)
+        if self.path != "/chunked":
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def stats_for(upstream):
+    return next(s for s in upstream_stats() if s["upstream"] == upstream)
+
+
+def test_reads_body_and_records_latency(base_url):
+    response = http_get(base_url + "/ok", upstream="test-ok")
+    assert response.content == b"x" * 100
+    assert http_post(base_url + "/echo", upstream="test-ok", data=b"hello").content == b"hello"
+    stats = stats_for("test-ok")
+    assert stats["requests"] == 2
+    assert stats["failures"] == 0
+    assert stats["max_ms"] >= stats["p50_ms"] > 0
+
+
+def test_declared_length_over_cap_is_rejected(base_url):
+    with pytest.raises(ResponseTooLarge):
+        http_get(base_url + "/ok", upstream="test-large", max_bytes=10)
+    assert stats_for("test-large")["failures"] == 1
+
+
+def test_streamed_body_over_cap_is_rejected(base_url):
+    with pytest.raises(ResponseTooLarge):
+        http_get(base_url + "/chunked", max_bytes=10)
+
+
+def test_read_timeout(base_url):
+    with pytest.raises(requests.Timeout):
+        http_get(base_url + "/slow", upstream="test-slow", timeout=0.2)
+    assert stats_for("test-slow")["failures"] == 1
+
+
+def test_http_errors_are_counted_not_raised(base_url):
+    assert http_get(base_url + "/missing", upstream="test-404").status_code == 404
+    stats = stats_for("test-404")
+    assert (stats["failures"], stats["http_errors"]) == (0, 1)
+
+
+def test_timeouts_default_and_split():
+    assert http_client._timeouts(None) == (http_client.HTTP_CONNECT_TIMEOUT, http_client.HTTP_READ_TIMEOUT)
+    assert http_client._timeouts(1) == (1, 1)
+    assert http_client._timeouts(20) == (http_client.HTTP_CONNECT_TIMEOUT, 20)
+    assert http_client._timeouts((2, 5)) == (2, 5)
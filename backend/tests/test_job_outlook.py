@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from utils.cache import TieredCache
+from utils.rate_limit import TokenBucket
+
+
+@pytest.fixture
+def calls(app_module, monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fetch(job_title, country, app_id, app_key, max_age_days=None):
+        with lock:
+            calls.append((country, max_age_days))
+        if country == "xx":
+            raise app_module.requests.exceptions.RequestException("upstream down")
+        return {"total_jobs": max_age_days, "avg_salary": 1000, "demand_score": 7, "is_remote_friendly": True}
+
+    monkeypatch.setattr(app_module, "fetch_adzuna_data", fetch)
+    monkeypatch.setattr(app_module, "ADZUNA_APP_ID", "id")
+    monkeypatch.setattr(app_module, "ADZUNA_API_KEY", "key")
+    monkeypatch.setattr(app_module, "adzuna_bucket", TokenBucket(1000, 100))
+    monkeypatch.setattr(app_module, "outlook_cache", TieredCache(maxsize=64, name="test_outlook"))
+    return calls
+
+
+def outlook(app_module, countries, job_title="Data Engineer"):
+    client = app_module.app.test_client()
+    return client.post("/api/job_outlook", json={"job_title": job_title, "countries": countries})
+
+
+def test_fetches_each_country_and_window_once(app_module, calls):
+    response = outlook(app_module, ["IN", " in ", "gb"])
+    assert response.status_code == 200
+    body = response.get_json()
+    assert set(body["countries"]) == {"in", "gb"}
+    assert body["countries"]["gb"]["historical"]["6_months_ago"]["total_jobs"] == 180
+    assert body["countries"]["in"]["total_jobs_found"] == 30
+    assert sorted(calls) == sorted((c, d) for c in ("in", "gb") for d in app_module.OUTLOOK_WINDOWS)
+
+
+def test_repeat_outlook_is_served_from_cache(app_module, calls):
+    assert outlook(app_module, ["gb"]).status_code == 200
+    assert outlook(app_module, ["gb"]).status_code == 200
+    assert len(calls) == len(app_module.OUTLOOK_WINDOWS)
+
+
+def test_rejects_bad_country_lists(app_module, calls, monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_OUTLOOK_COUNTRIES", 2)
+    assert outlook(app_module, ["in", "gb", "us"]).status_code == 400
+    assert outlook(app_module, []).status_code == 400
+    assert outlook(app_module, "in").status_code == 400
+    assert outlook(app_module, ["in"], job_title="").status_code == 400
+    assert calls == []
+
+
+def test_upstream_failure_returns_500(app_module, calls):
+    response = outlook(app_module, ["xx"])
+    assert response.status_code == 500
+    assert "upstream down" in response.get_json()["msg"]
+
+
+def test_abandoned_fetch_stops_waiting_for_a_slot(app_module, calls, monkeypatch):
+    bucket = TokenBucket(0.001, 1)
+    bucket.acquire()
+    monkeypatch.setattr(app_module, "adzuna_bucket", bucket)
+    abandoned = threading.Event()
+    threading.Timer(0.2, abandoned.set).start()
+    with pytest.raises(CancelledError):
+        app_module.rate_limited_fetch_adzuna_data("Data Engineer", "gb", 30, abandoned)
+    assert calls == []
@@ -0,0 +1,183 @@
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_jwt_extended")
+pytest.importorskip("mongoengine")
+
+from bson import ObjectId
+from flask import Flask
+
+from routes import jobs
+from utils.pagination import decode_cursor, encode_cursor
+
+INTERNAL_JOB = {"id": "1", "title": "Backend Developer", "source": "Internal", "is_external": False}
+ADZUNA_JOB = {"id": "a", "title": "Python Developer", "source": "Adzuna", "is_external": True}
+JSEARCH_JOB = {"id": "j", "title": "Data Engineer", "source": "JSearch", "is_external": True}
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(jobs.jobs_bp, url_prefix="/api/jobs")
+    return app.test_client()
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Fake fetchers for every source; `calls` records which ones ran."""
+    state = {"calls": [], "delay": {}, "cursors": []}
+
+    def fake(name, result):
+        def fetch(*args, **kwargs):
+            state["calls"].append(name)
+            time.sleep(state["delay"].get(name, 0))
+            if isinstance(result, Exception):
+                raise result
+            return [dict(job) for job in result]
+        return fetch
+
+    def fetch_internal(query="", location="", skills=[], cursor=None, limit=None, page_info=None):
+        state["cursors"].append(cursor)
+        page_info["next_cursor"] = "next-page"
+        return fake("internal", [INTERNAL_JOB])()
+
+    monkeypatch.setattr(jobs, "fetch_internal_jobs", fetch_internal)
+    monkeypatch.setattr(jobs, "fetch_adzuna_jobs", fake("adzuna", [ADZUNA_JOB]))
+    monkeypatch.setattr(jobs, "fetch_jsearch_jobs", fake("jsearch", [JSEARCH_JOB]))
+    monkeypatch.setattr(jobs.provider_cache, "get_or_fetch", lambda key, fetch: fetch())
+    monkeypatch.setattr(jobs, "SOURCE_CREDENTIALS", {"adzuna": ("id", "key"), "jsearch": ("key",)})
+    return state
+
+
+def test_first_page_merges_sources_in_display_order(client, sources):
+    response = client.post("/api/jobs/search", json={"query": "python"})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [job["id"] for job in body["jobs"]] == ["1", "a", "j"]
+    assert (body["count"], body["internal_count"]) == (3, 1)
+    assert body["next_cursor"] == "next-page"
+    assert body["skipped_sources"] == []
+
+
+def test_cursor_page_contains_internal_results_only(client, sources):
+    cursor = encode_cursor([1.5, datetime(2024, 1, 1), "abc"])
+    body = client.post("/api/jobs/search", json={"query": "python", "cursor": cursor}).get_json()
+    assert [job["source"] for job in body["jobs"]] == ["Internal"]
+    assert sources["calls"] == ["internal"]
+    assert sources["cursors"] == [cursor]
+    assert body["skipped_sources"] == []
+
+
+def test_rejects_an_edited_cursor(client, sources):
+    cursor = encode_cursor([1.5])
+    response = client.post("/api/jobs/search", json={"query": "python", "cursor": cursor[:-2] + "AA"})
+    assert response.status_code == 400
+    assert sources["calls"] == []
+
+
+def test_unconfigured_failing_and_slow_sources_are_skipped(client, sources, monkeypatch):
+    monkeypatch.setattr(jobs, "SOURCE_CREDENTIALS", {"adzuna": (None, None), "jsearch": ("key",)})
+    monkeypatch.setattr(jobs, "SEARCH_DEADLINES", {"internal": 1, "adzuna": 1, "jsearch": 0.05})
+    sources["delay"]["jsearch"] = 0.5
+    started = time.monotonic()
+    body = client.post("/api/jobs/search", json={"query": "python"}).get_json()
+    assert time.monotonic() - started < 0.4
+    assert [job["id"] for job in body["jobs"]] == ["1"]
+    assert body["skipped_sources"] == [
+        {"source": "adzuna", "reason": "not_configured"},
+        {"source": "jsearch", "reason": "timeout"},
+    ]
+
+
+def test_failing_source_is_skipped(client, sources, monkeypatch):
+    monkeypatch.setattr(jobs, "fetch_jsearch_jobs", lambda *args, **kwargs: 1 / 0)
+    body = client.post("/api/jobs/search", json={"query": "golang"}).get_json()
+    assert [job["id"] for job in body["jobs"]] == ["1", "a"]
+    assert body["skipped_sources"] == [{"source": "jsearch", "reason": "error"}]
+
+
+def test_stream_sends_internal_first_then_a_summary(client, sources):
+    sources["delay"]["internal"] = 0.1
+    response = client.post("/api/jobs/search/stream", json={"query": "python"})
+    assert response.mimetype == "application/x-ndjson"
+    messages = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(m["type"], m.get("source")) for m in messages[:1]] == [("jobs", "internal")]
+    assert {m["source"] for m in messages[1:3]} == {"adzuna", "jsearch"}
+    assert messages[-1] == {
+        "type": "done", "count": 3, "internal_count": 1, "skipped_sources": [],
+        "next_cursor": "next-page", "suggested_roles": [],
+    }
+
+
+def test_stream_as_server_sent_events(client, sources):
+    cursor = encode_cursor([1.5])
+    response = client.post("/api/jobs/search/stream?format=sse", json={"query": "python", "cursor": cursor})
+    assert response.mimetype == "text/event-stream"
+    events = response.get_data(as_text=True).strip().split("\n\n")
+    assert [event.splitlines()[0] for event in events] == ["event: jobs", "event: done"]
+    assert json.loads(events[0].splitlines()[1][len("data: "):])["jobs"][0]["id"] == "1"
+
+
+class FakeJobPostings:
+    """JobPosting stand-in whose aggregate records the pipeline and returns `docs`."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.pipelines = []
+        self.objects = self
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return iter(self.docs)
+
+
+def internal_doc(i, **fields):
+    return {"_id": ObjectId(), "title": f"Job {i}", "posted_at": datetime(2024, 1, i + 1), "rank": 2.0, **fields}
+
+
+def test_internal_search_ranks_by_text_score(monkeypatch):
+    postings = FakeJobPostings([internal_doc(i) for i in range(3)])
+    monkeypatch.setattr(jobs, "JobPosting", postings)
+    page_info = {}
+    results = jobs.fetch_internal_jobs("python", "Pune (Remote)", limit=2, page_info=page_info)
+
+    match, add_fields, sort = postings.pipelines[0][:3]
+    assert match["$match"]["$text"] == {"$search": "python"}
+    assert match["$match"]["location"] == {"$regex": r"Pune\ \(Remote\)", "$options": "i"}
+    assert add_fields == {"$addFields": {"rank": {"$meta": "textScore"}}}
+    assert list(sort["$sort"]) == ["rank", "posted_at", "_id"]
+    assert [job["title"] for job in results] == ["Job 0", "Job 1"]
+    assert decode_cursor(page_info["next_cursor"]) == [2.0, datetime(2024, 1, 2), postings.docs[1]["_id"]]
+
+    jobs.fetch_internal_jobs("python", cursor=page_info["next_cursor"], limit=2)
+    keyset = postings.pipelines[1][2]["$match"]["$or"]
+    assert keyset[0] == {"rank": {"$lt": 2.0}}
+    assert keyset[2] == {"rank": 2.0, "posted_at": datetime(2024, 1, 2), "_id": {"$lt": postings.docs[1]["_id"]}}
+
+
+def test_internal_search_by_skills_ranks_by_overlap(monkeypatch):
+    postings = FakeJobPostings([internal_doc(0, description="x" * 250, posted_by=ObjectId())])
+    monkeypatch.setattr(jobs, "JobPosting", postings)
+    page_info = {}
+    results = jobs.fetch_internal_jobs(skills=["Python", " python ", "", 3], page_info=page_info)
+
+    pipeline = postings.pipelines[0]
+    assert pipeline[0]["$match"] == {"is_active": True, "skills_normalized": {"$in": ["python"]}}
+    assert pipeline[1] == {"$addFields": {"rank": {"$size": {"$setIntersection": ["$skills_normalized", ["python"]]}}}}
+    assert "$text" not in pipeline[0]["$match"]
+    assert results[0]["description"] == "x" * jobs.DESCRIPTION_SNIPPET_LENGTH + "..."
+    assert results[0]["posted_by"] == str(postings.docs[0]["posted_by"])
+    assert page_info["next_cursor"] is None
+
+
+def test_internal_listing_without_query_is_newest_first(monkeypatch):
+    postings = FakeJobPostings([])
+    monkeypatch.setattr(jobs, "JobPosting", postings)
+    assert jobs.fetch_internal_jobs(location="India") == []
+    match, sort = postings.pipelines[0][:2]
+    assert match == {"$match": {"is_active": True}}
+    assert sort == {"$sort": {"posted_at": -1, "_id": -1}}
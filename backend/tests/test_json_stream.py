@@ -0,0 +1,45 @@
+import json
+
+from utils.json_stream import JsonArrayStream
+
+RESPONSE = '```json\n{"matched": ["Python", "SQL"], "missing": ["Go \\"lang\\"", "C\\u002b\\u002b"], "score": 72}\n```'
+
+
+def feed_all(stream, text, size):
+    completed = []
+    for i in range(0, len(text), size):
+        completed.extend(stream.feed(text[i:i + size]))
+    return completed
+
+
+def test_same_result_for_any_chunking():
+    expected = {"matched": ["Python", "SQL"], "missing": ['Go "lang"', "C++"]}
+    for size in (1, 2, 3, 7, len(RESPONSE)):
+        stream = JsonArrayStream()
+        completed = feed_all(stream, RESPONSE, size)
+        assert stream.arrays == expected
+        assert completed == [(k, v) for k, values in expected.items() for v in values]
+        assert stream.closed == {"matched", "missing"}
+        assert stream.done
+
+
+def test_agrees_with_json_loads():
+    body = json.dumps({"a": ["x", "é", "\\", "\n"], "b": []})
+    stream = JsonArrayStream()
+    stream.feed(body)
+    assert stream.arrays == json.loads(body)
+
+
+def test_ignores_nested_containers_and_text_after_the_object():
+    stream = JsonArrayStream()
+    stream.feed('Sure! {"a": [["skip"], {"k": "skip"}, "keep"], "meta": {"b": ["skip"]}} then {"c": ["x"]}')
+    assert stream.arrays == {"a": ["keep"]}
+    assert stream.done
+
+
+def test_truncated_response_keeps_completed_strings():
+    stream = JsonArrayStream()
+    stream.feed('{"matched": ["Python", "Dja')
+    assert stream.arrays == {"matched": ["Python"]}
+    assert not stream.closed
+    assert not stream.done
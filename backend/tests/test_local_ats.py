@@ -0,0 +1,85 @@
+import random
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("mongoengine")
+
+from utils import local_ats
+from utils.local_ats import AtsModel, JobScorer, score_skills
+from utils.skill_taxonomy import get_skill_taxonomy
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """A ready model for the active taxonomy where Kubernetes is rare and Git is everywhere."""
+    taxonomy = get_skill_taxonomy()
+    doc_freq = {taxonomy.index("Git"): 95, taxonomy.index("Kubernetes"): 5, taxonomy.index("Python"): 50}
+    model = AtsModel(taxonomy.version, doc_freq, 100, 4)
+    monkeypatch.setattr(local_ats, "_model", model)
+    return model
+
+
+def test_rare_skills_weigh_more(model):
+    taxonomy = get_skill_taxonomy()
+    weights = local_ats.analyze_job("Kubernetes, Python and Git")
+    assert weights[taxonomy.index("Kubernetes")] > weights[taxonomy.index("Python")] > weights[taxonomy.index("Git")]
+
+
+def test_local_analysis_payload(model):
+    result = local_ats.analyze_ats_local("Python and Git, some Java", "Kubernetes, Python and Git")
+    assert result["required_skills"] == ["Kubernetes", "Python", "Git"]
+    assert result["matched_skills"] == ["Python", "Git"]
+    assert set(result["found_skills"]) == {"Python", "Git", "Java"}
+    assert 0 < result["score"] < 50  # Kubernetes alone outweighs the other two
+
+
+def test_job_scorer_matches_the_weighted_share():
+    rng = random.Random(5)
+    for _ in range(50):
+        n_skills = rng.randint(1, 40)
+        weights = {s: rng.random() * 3 for s in rng.sample(range(n_skills), rng.randint(0, n_skills))}
+        scorer = JobScorer(weights, n_skills)
+        for _ in range(20):
+            found = {s for s in range(n_skills + 5) if rng.random() < 0.4}
+            mask = sum(1 << s for s in found)
+            assert scorer.score(mask) == score_skills(found, weights)
+
+
+def test_ranks_resumes_best_first_keeping_input_order_on_ties(model):
+    required, results = local_ats.rank_resumes(
+        "Kubernetes, Python and Git",
+        [("a", "git"), ("b", "kubernetes python git"), ("c", "git"), ("d", "")],
+    )
+    assert required == ["Kubernetes", "Python", "Git"]
+    assert [r["id"] for r in results] == ["b", "a", "c", "d"]
+    assert results[0]["score"] == 100.0 and results[0]["missing_skills"] == []
+    assert results[1]["matched_skills"] == ["Git"]
+    assert results[1]["missing_skills"] == ["Kubernetes", "Python"]
+
+
+def test_model_is_built_off_the_request_path(monkeypatch):
+    release = threading.Event()
+    built = threading.Event()
+    taxonomy = get_skill_taxonomy()
+
+    def slow_build(taxonomy):
+        release.wait(5)
+        built.set()
+        return AtsModel(taxonomy.version, {0: 1}, 10, 3)
+
+    monkeypatch.setattr(local_ats, "_model", None)
+    monkeypatch.setattr(local_ats, "build_ats_model", slow_build)
+    first = local_ats.get_ats_model()
+    second = local_ats.get_ats_model()  # one build at a time
+    assert (first.n_docs, second.n_docs) == (0, 0)
+    assert first.idf(0) == first.idf(1)
+
+    release.set()
+    assert built.wait(5)
+    deadline = time.monotonic() + 5
+    while local_ats._building and time.monotonic() < deadline:
+        time.sleep(0.01)
+    model = local_ats.get_ats_model()
+    assert (model.n_docs, model.taxonomy_version) == (10, taxonomy.version)
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("bson")
+
+from bson import ObjectId
+
+from utils.pagination import decode_cursor, encode_cursor, keyset_match, page_params, paginate
+
+KEYS = ["rank", "posted_at", "_id"]
+
+
+def sample_values():
+    return [1.5, datetime(2026, 3, 1, 12, 30), ObjectId("65f0c0ffee0000000000abcd")]
+
+
+def test_cursor_round_trips_datetimes_and_object_ids():
+    values = decode_cursor(encode_cursor(sample_values()))
+    assert values[0] == 1.5
+    assert values[1].replace(tzinfo=None) == datetime(2026, 3, 1, 12, 30)
+    assert values[2] == ObjectId("65f0c0ffee0000000000abcd")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "abc.def.ghi", "%%%.%%%", "W10.AAAA"])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_edited_payload_is_rejected():
+    payload, signature = encode_cursor([1, "a"]).split(".")
+    forged = encode_cursor([0, "a"]).split(".")[0]
+    with pytest.raises(ValueError):
+        decode_cursor(f"{forged}.{signature}")
+    with pytest.raises(ValueError):
+        decode_cursor(f"{payload}.{signature[:-2]}AA")
+
+
+def test_signed_cursor_still_cannot_carry_operators():
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([{"$ne": None}, 1, 2]))
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([]))
+
+
+def test_keyset_match_selects_rows_after_the_cursor():
+    rank, posted_at, last_id = sample_values()
+    stage = keyset_match(KEYS, encode_cursor([rank, posted_at, last_id]))
+    branches = stage["$match"]["$or"]
+    assert branches[0] == {"rank": {"$lt": rank}}
+    assert branches[1]["rank"] == rank and branches[1]["posted_at"]["$lt"].replace(tzinfo=None) == posted_at
+    assert branches[2]["_id"] == {"$lt": last_id}
+
+
+def test_keyset_match_rejects_cursor_for_other_sort_keys():
+    with pytest.raises(ValueError):
+        keyset_match(["posted_at", "_id"], encode_cursor(sample_values()))
+
+
+def test_paginate_returns_cursor_only_when_more_rows_exist():
+    rows = [{"posted_at": datetime(2026, 1, day), "_id": ObjectId()} for day in (3, 2, 1)]
+    page, cursor = paginate(rows, 2, ["posted_at", "_id"])
+    assert page == rows[:2]
+    assert decode_cursor(cursor)[1] == rows[1]["_id"]
+    assert paginate(rows, 3, ["posted_at", "_id"]) == (rows, None)
+
+
+def test_page_params():
+    assert page_params(None, None, 50, 100) == (None, 50)
+    assert page_params("", "500", 50, 100) == (None, 100)
+    with pytest.raises(ValueError):
+        page_params(None, "0", 50, 100)
+    with pytest.raises(ValueError):
+        page_params("tampered", None, 50, 100)
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+if os.name != "posix":
+    pytest.skip("PDF worker processes need POSIX", allow_module_level=True)
+
+from utils import pdf_pool
+from utils.pdf_pool import PdfParseError, PdfParsePool
+
+
+def make_pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def pool():
+    pool = PdfParsePool(max_workers=2, timeout=30)
+    yield pool
+    while not pool._idle.empty():
+        pool._idle.get_nowait().kill()
+
+
+def test_parses_in_a_reused_worker(pool):
+    assert pool.parse(make_pdf("Python and SQL")).strip() == "Python and SQL"
+    worker = pool._idle.get_nowait()
+    pool._idle.put(worker)
+    assert pool.parse(make_pdf("Docker"), max_chars=3) == "Doc"
+    assert pool._idle.get_nowait() is worker
+
+
+def test_parse_errors_keep_the_worker(pool):
+    with pytest.raises(PdfParseError) as error:
+        pool.parse(b"not a pdf")
+    assert error.value.code == "parse_error"
+    assert pool._idle.qsize() == 1
+    assert pool.parse(make_pdf("still works")).strip() == "still works"
+
+
+def test_dead_idle_worker_is_replaced(pool):
+    pool.parse(make_pdf("first"))
+    worker = pool._idle.get_nowait()
+    worker.kill()
+    pool._idle.put(worker)
+    assert pool.parse(make_pdf("second")).strip() == "second"
+
+
+def test_timeout_kills_the_worker():
+    pool = PdfParsePool(max_workers=1, timeout=0)
+    with pytest.raises(PdfParseError) as error:
+        pool.parse(make_pdf("slow"))
+    assert error.value.code == "timeout"
+    assert pool._idle.empty()
+
+
+def test_workers_are_recycled_after_max_docs(pool, monkeypatch):
+    monkeypatch.setattr(pdf_pool, "PDF_WORKER_MAX_DOCS", 1)
+    pool.parse(make_pdf("one"))
+    assert pool._idle.empty()
+
+
+def test_busy_pool_fails_fast(monkeypatch):
+    monkeypatch.setattr(pdf_pool, "PDF_PARSE_QUEUE_TIMEOUT", 0)
+    pool = PdfParsePool(max_workers=1)
+    pool._slots.acquire()
+    with pytest.raises(PdfParseError) as error:
+        pool.parse(make_pdf("queued"))
+    assert error.value.code == "busy"
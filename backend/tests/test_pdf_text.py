@@ -0,0 +1,45 @@
+import io
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from utils.pdf_text import extract_pdf_text, iter_pdf_pages, read_upload
+
+
+def make_pdf(pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class Upload:
+    def __init__(self, data):
+        self.stream = io.BytesIO(data)
+
+
+def test_read_upload_refuses_oversized_files():
+    assert read_upload(Upload(b"x" * 10), max_bytes=10) == b"x" * 10
+    assert read_upload(Upload(b"x" * 11), max_bytes=10) is None
+
+
+def test_pages_are_read_in_memory_up_to_the_page_limit():
+    data = make_pdf([f"Page {i} Python" for i in range(5)])
+    pages = list(iter_pdf_pages(data, max_pages=3))
+    assert [page.strip() for page in pages] == ["Page 0 Python", "Page 1 Python", "Page 2 Python"]
+
+
+def test_text_stops_at_the_character_limit():
+    data = make_pdf(["A" * 50, "B" * 50, "C" * 50])
+    assert extract_pdf_text(data, max_chars=1000).count("A") == 50
+    text = extract_pdf_text(data, max_chars=60)
+    assert len(text) == 60
+    assert "C" not in text
+
+
+def test_malformed_pdf_raises():
+    with pytest.raises(Exception):
+        extract_pdf_text(b"not a pdf")
@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from utils import provider_cache as provider_cache_module
+from utils.provider_cache import ProviderCache, provider_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(provider_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ProviderCache(str(tmp_path / "cache.sqlite3"), soft_ttl=10, hard_ttl=100, name="test")
+    yield cache
+    cache._executor.shutdown(wait=True)
+
+
+class Fetcher:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"jobs": [self.calls]}
+
+
+def test_provider_key_ignores_case_and_spacing():
+    assert provider_key("remotive", " Data  Engineer", "Berlin ", 2) == provider_key("remotive", "data engineer", "berlin", 2)
+    assert provider_key("remotive", "data engineer") != provider_key("remotive", "data engineer", page=2)
+
+
+def test_fresh_entries_are_served_without_fetching(cache):
+    fetch = Fetcher()
+    assert cache.get_or_fetch("k", fetch) == {"jobs": [1]}
+    assert cache.get_or_fetch("k", fetch) == {"jobs": [1]}
+    assert fetch.calls == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_stale_entry_is_served_then_refreshed_once(cache, clock):
+    fetch = Fetcher()
+    cache.get_or_fetch("k", fetch)
+    clock[0] += 11
+    release = threading.Event()
+
+    def slow_fetch():
+        release.wait(5)
+        return fetch()
+
+    assert cache.get_or_fetch("k", slow_fetch) == {"jobs": [1]}
+    assert cache.get_or_fetch("k", slow_fetch) == {"jobs": [1]}  # refresh already claimed
+    release.set()
+    cache._executor.shutdown(wait=True)
+    assert fetch.calls == 2
+    assert cache.stats()["stale_hits"] == 2
+    assert cache.stats()["refreshes"] == 1
+    assert cache.get_or_fetch("k", fetch) == {"jobs": [2]}
+
+
+def test_shared_between_instances(cache, tmp_path):
+    cache.get_or_fetch("k", Fetcher())
+    other = ProviderCache(cache.path, soft_ttl=10, hard_ttl=100)
+    try:
+        assert other.get_or_fetch("k", pytest.fail) == {"jobs": [1]}
+    finally:
+        other._executor.shutdown(wait=True)
+
+
+def test_hard_expired_entries_are_fetched_in_the_foreground(cache, clock):
+    fetch = Fetcher()
+    cache.get_or_fetch("k", fetch)
+    clock[0] += 101
+    assert cache.get_or_fetch("k", fetch) == {"jobs": [2]}
+    assert cache.stats()["misses"] == 2
+
+
+def test_fetch_errors_propagate_and_are_not_cached(cache):
+    def failing():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("k", failing)
+    assert cache.get_or_fetch("k", Fetcher()) == {"jobs": [1]}
+
+
+def test_failed_refresh_keeps_the_stale_copy(cache, clock):
+    cache.get_or_fetch("k", Fetcher())
+    clock[0] += 11
+
+    def failing():
+        raise RuntimeError("upstream down")
+
+    assert cache.get_or_fetch("k", failing) == {"jobs": [1]}
+    cache._executor.shutdown(wait=True)
+    assert cache.stats()["refreshes"] == 0
+    assert cache.get_or_fetch("k", failing) == {"jobs": [1]}
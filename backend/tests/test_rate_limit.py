@@ -0,0 +1,91 @@
+import pytest
+
+from utils import rate_limit
+from utils.rate_limit import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def open_breaker(clock, reset_timeout=60):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_opens_after_threshold_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_admits_one_trial_after_reset_timeout(clock):
+    breaker = open_breaker(clock)
+    clock[0] += 59
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+
+
+def test_successful_trial_closes(clock):
+    breaker = open_breaker(clock)
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_for_another_timeout(clock):
+    breaker = open_breaker(clock)
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock[0] += 30
+    assert not breaker.allow()
+    clock[0] += 30
+    assert breaker.allow()
+
+
+def test_aborted_trial_reopens_instead_of_sticking_half_open(clock):
+    breaker = open_breaker(clock)
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.abort()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock[0] += 60
+    assert breaker.allow()
+
+
+def test_abandoned_trial_is_replaced_after_reset_timeout(clock):
+    breaker = open_breaker(clock)
+    clock[0] += 60
+    assert breaker.allow()
+    # The trial never reports back
+    clock[0] += 59
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+
+
+def test_abort_while_closed_is_a_no_op(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.abort()
+    assert breaker.stats() == {"name": "circuit", "state": "closed", "failures": 1}
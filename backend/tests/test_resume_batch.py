@@ -0,0 +1,69 @@
+import functools
+import io
+import json
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def client(app_module, monkeypatch):
+    release_slow = threading.Event()
+
+    def analyze(data, on_keywords=None, deadline=None, on_late=None, on_skill=None):
+        if data == b"%PDF-slow":
+            release_slow.wait(5)
+        if data == b"%PDF-broken":
+            raise RuntimeError("worker crashed")
+        return "text", {"ok": True, "extracted_skills": [data.decode()]}, 200
+
+    monkeypatch.setattr(app_module, "analyze_resume_pdf", analyze)
+    client = app_module.app.test_client()
+    client.release_slow = release_slow
+    return client
+
+
+def upload(client, files):
+    data = {"files": [(io.BytesIO(content), name) for name, content in files]}
+    return client.post("/api/resume/upload_batch", data=data, content_type="multipart/form-data")
+
+
+def read_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_streams_one_line_per_file(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "read_upload", functools.partial(app_module.read_upload, max_bytes=20))
+    response = upload(client, [
+        ("a.pdf", b"%PDF-a"),
+        ("notes.txt", b"hello"),
+        ("big.pdf", b"%PDF-" + b"x" * 20),
+        ("broken.pdf", b"%PDF-broken"),
+        ("b.PDF", b"%PDF-b"),
+    ])
+    assert response.mimetype == "application/x-ndjson"
+    lines = read_lines(response)
+    assert lines[:2] == [
+        {"filename": "notes.txt", "ok": False, "msg": "Only PDF files are supported"},
+        {"filename": "big.pdf", "ok": False, "msg": app_module.resume_too_large_msg()},
+    ]
+    by_name = {line["filename"]: line for line in lines}
+    assert by_name["a.pdf"] == {"filename": "a.pdf", "ok": True, "extracted_skills": ["%PDF-a"]}
+    assert by_name["b.PDF"]["ok"] is True
+    assert by_name["broken.pdf"] == {"filename": "broken.pdf", "ok": False, "msg": "Resume processing failed: worker crashed"}
+    assert len(lines) == 5
+
+
+def test_results_arrive_in_completion_order(client):
+    timer = threading.Timer(0.3, client.release_slow.set)
+    timer.start()
+    lines = read_lines(upload(client, [("slow.pdf", b"%PDF-slow"), ("fast.pdf", b"%PDF-fast")]))
+    timer.cancel()
+    assert [line["filename"] for line in lines] == ["fast.pdf", "slow.pdf"]
+
+
+def test_rejects_empty_and_oversized_batches(client, app_module, monkeypatch):
+    assert client.post("/api/resume/upload_batch", data={}).status_code == 400
+    monkeypatch.setattr(app_module, "MAX_BATCH_RESUMES", 2)
+    response = upload(client, [(f"{i}.pdf", b"%PDF") for i in range(3)])
+    assert response.status_code == 400
@@ -0,0 +1,36 @@
+def test_cache_key_follows_the_gemini_prompt(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "gemini_model", object())
+    before = app_module.resume_cache_key("text", "abc")
+    assert app_module.resume_cache_key("text", "abc") == before
+
+    original = app_module.create_improved_gemini_prompt
+    monkeypatch.setattr(app_module, "create_improved_gemini_prompt", lambda text: original(text) + "Be brief.")
+    assert app_module.resume_cache_key("text", "abc") != before
+
+
+def test_cache_key_without_gemini_ignores_the_prompt(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "gemini_model", None)
+    before = app_module.resume_cache_key("pdf", "abc")
+    monkeypatch.setattr(app_module, "create_improved_gemini_prompt", lambda text: "changed")
+    assert app_module.resume_cache_key("pdf", "abc") == before
+    assert before.endswith(":keywords")
+
+
+def test_analyses_are_cached_by_pdf_and_by_text(app_module, monkeypatch):
+    texts = {b"%PDF-a": "Python developer resume", b"%PDF-b": "Python developer resume"}
+    extracted = []
+    analyzed = []
+    monkeypatch.setattr(app_module, "resume_cache", app_module.TieredCache(name="test_resume_cache"))
+    monkeypatch.setattr(app_module, "extract_text_from_pdf", lambda data: extracted.append(data) or texts[data])
+
+    def analyze(raw_text, on_keywords=None, deadline=None, on_late=None, on_skill=None):
+        analyzed.append(raw_text)
+        return {"ok": True, "extracted_skills": ["Python"]}, True
+
+    monkeypatch.setattr(app_module, "analyze_resume_text", analyze)
+    first = app_module.analyze_resume_pdf(b"%PDF-a")
+    assert app_module.analyze_resume_pdf(b"%PDF-a") == first
+    # Same text re-exported to a different PDF: parsed again, not re-analyzed
+    assert app_module.analyze_resume_pdf(b"%PDF-b") == first
+    assert extracted == [b"%PDF-a", b"%PDF-b"]
+    assert analyzed == ["Python developer resume"]
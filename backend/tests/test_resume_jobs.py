@@ -0,0 +1,85 @@
+import io
+
+import pytest
+
+from utils.job_store import JobStore
+
+RESULT = {"ok": True, "extracted_skills": ["Python"], "suggested_skills": []}
+
+
+@pytest.fixture
+def app(app_module, monkeypatch):
+    """The app with a fresh job store, inline job execution and recorded socket events."""
+    events = []
+    monkeypatch.setattr(app_module, "resume_jobs", JobStore(ttl=3600))
+    monkeypatch.setattr(app_module.socketio, "emit", lambda event, payload, room=None: events.append((event, payload, room)))
+    monkeypatch.setattr(app_module, "save_resume_analysis", lambda uid, raw_text, result: None)
+    app_module.events = events
+    return app_module
+
+
+def analyze(calls, before_keywords=None):
+    def fake(data, on_keywords=None, deadline=None, on_late=None, on_skill=None):
+        calls.append(data)
+        if before_keywords:
+            before_keywords()
+        on_keywords({"ok": True, "extracted_skills": ["Python"], "partial": True})
+        on_skill("Django")
+        return "resume text", RESULT, 200
+    return fake
+
+
+def test_job_runs_and_pushes_progress(app, monkeypatch):
+    calls = []
+    monkeypatch.setattr(app, "analyze_resume_pdf", analyze(calls))
+    job = app.resume_jobs.create(user_id="u1", filename="cv.pdf")
+    app.run_resume_job(job["id"], b"%PDF")
+
+    assert calls == [b"%PDF"]
+    assert [(event, room) for event, _, room in app.events] == [
+        ("resume_analysis_progress", "u1"),
+        ("resume_analysis_skill", "u1"),
+        ("resume_analysis_complete", "u1"),
+    ]
+    stored = app.resume_jobs.get(job["id"])
+    assert (stored["status"], stored["result"], stored["http_status"]) == ("complete", RESULT, 200)
+
+
+def test_missing_or_expired_job_is_not_run(app, monkeypatch):
+    calls = []
+    monkeypatch.setattr(app, "analyze_resume_pdf", analyze(calls))
+    app.run_resume_job("no-such-job", b"%PDF")
+
+    store = JobStore(ttl=0)
+    monkeypatch.setattr(app, "resume_jobs", store)
+    job = store.create(user_id="u1", filename="cv.pdf")
+    store._jobs[job["id"]]["_touched"] -= 1
+    store.create(user_id="u2", filename="other.pdf")  # expires the first one
+    app.run_resume_job(job["id"], b"%PDF")
+
+    assert calls == []
+    assert app.events == []
+
+
+def test_job_expiring_mid_run_pushes_nothing_more(app, monkeypatch):
+    calls = []
+    job = app.resume_jobs.create(user_id="u1", filename="cv.pdf")
+    monkeypatch.setattr(app, "analyze_resume_pdf", analyze(calls, lambda: app.resume_jobs._jobs.clear()))
+    app.run_resume_job(job["id"], b"%PDF")
+
+    assert calls == [b"%PDF"]
+    assert [event for event, _, _ in app.events] == ["resume_analysis_skill"]
+
+
+def test_async_upload_returns_a_job_to_poll(app, monkeypatch):
+    monkeypatch.setattr(app, "analyze_resume_pdf", analyze([]))
+    monkeypatch.setattr(app.resume_job_executor, "submit", lambda fn, *args: fn(*args))
+    client = app.app.test_client()
+
+    response = client.post("/api/resume/upload?async=1", data={"file": (io.BytesIO(b"%PDF-1.4"), "cv.pdf")})
+    assert response.status_code == 202
+    body = response.get_json()
+    status = client.get(body["status_url"]).get_json()
+    assert status["job"]["status"] == "complete"
+    assert status["job"]["result"] == RESULT
+    assert client.get("/api/resume/jobs/unknown").status_code == 404
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight, single_flight, single_flight_stats
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def slow():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"jobs": [1, 2]}
+
+    def caller():
+        results.append(flight.do("key", slow))
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    wait_until(lambda: flight.stats()["in_flight"] == 1)
+    followers = [threading.Thread(target=caller) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    wait_until(lambda: flight.stats()["coalesced"] == 4)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results == [{"jobs": [1, 2]}] * 5
+    assert flight.stats() == {"name": "test", "calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_error_reaches_every_follower():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    error = ValueError("upstream 503")
+    raised = []
+
+    def failing():
+        release.wait(timeout=5)
+        raise error
+
+    def caller():
+        try:
+            flight.do("key", failing)
+        except ValueError as e:
+            raised.append(e)
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    wait_until(lambda: flight.stats()["in_flight"] == 1)
+    followers = [threading.Thread(target=caller) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    wait_until(lambda: flight.stats()["coalesced"] == 3)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(timeout=5)
+
+    assert raised == [error] * 4
+
+
+def test_finished_calls_are_not_reused():
+    flight = SingleFlight("test")
+    values = iter([1, 2])
+    assert flight.do("key", lambda: next(values)) == 1
+    assert flight.do("key", lambda: next(values)) == 2
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
+    assert flight.do("key", lambda: 3) == 3
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(timeout=5)
+
+    threads = [threading.Thread(target=flight.do, args=(key, slow)) for key in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: flight.stats()["in_flight"] == 2)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert len(calls) == 2
+
+
+def test_registry_returns_one_instance_per_upstream():
+    assert single_flight("test-registry") is single_flight("test-registry")
+    assert any(s["name"] == "test-registry" for s in single_flight_stats())
@@ -0,0 +1,35 @@
+from bench_skill_confidence import find_mentions, index_score, make_resume, window_scan_score
+from utils import skill_context
+from utils.skill_context import build_context_index
+
+
+def test_index_scores_match_the_window_scan():
+    for words, seed in ((300, 1), (2000, 2), (2000, 3)):
+        text = make_resume(words, seed)
+        index = build_context_index(text)
+        for pos, name in find_mentions(text):
+            assert index_score(index, len(text), pos, name) == window_scan_score(text, pos, name)
+
+
+def test_index_counts_distinct_indicators_inside_the_window():
+    text = "skills: worked with python using docker, worked on it again; want to learn go"
+    index = build_context_index(text)
+    for group, indicators in skill_context.CONTEXT_GROUPS.items():
+        for start in range(0, len(text), 7):
+            for end in range(start, len(text) + 1, 5):
+                expected = sum(1 for indicator in set(indicators) if indicator in text[start:end])
+                assert index.count(group, start, end) == expected
+                assert index.count(group, start, end, limit=2) == min(2, expected)
+
+
+def test_unindexed_calls_build_one_index_per_text(app_module, monkeypatch):
+    built = []
+    monkeypatch.setattr(skill_context, "build_context_index", lambda text: built.append(text) or skill_context.ContextIndex(text, skill_context.CONTEXT_GROUPS))
+    skill_context.cached_context_index.cache_clear()
+    text = make_resume(500)
+    mentions = find_mentions(text)
+    scores = [app_module.calculate_skill_confidence(text, pos, name) for pos, name in mentions]
+    skill_context.cached_context_index.cache_clear()
+
+    assert built == [text]
+    assert scores == [window_scan_score(text, pos, name) for pos, name in mentions]
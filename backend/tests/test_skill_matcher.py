@@ -0,0 +1,45 @@
+import random
+
+from utils.skill_matcher import compile_skill_matcher
+
+SKILLS = {
+    "Java": {"aliases": ["java se"]},
+    "JavaScript": {"aliases": ["js", "ecmascript"]},
+    "Node.js": {"aliases": ["node", "nodejs"]},
+    "SQL": {"aliases": []},
+    "NoSQL": {"aliases": ["no-sql"]},
+    "C": {"aliases": []},
+}
+
+
+def brute_force(matcher, text):
+    hits = set()
+    for pid, pattern in enumerate(matcher.patterns):
+        pos = text.find(pattern)
+        while pos != -1:
+            hits.add((pos, pid))
+            pos = text.find(pattern, pos + 1)
+    return hits
+
+
+def test_finds_every_overlapping_occurrence():
+    matcher = compile_skill_matcher(SKILLS)
+    rng = random.Random(3)
+    words = ["java", "javascript", "js", "node", "nodejs", "node.js", "sql", "nosql", "no-sql", "x", " "]
+    for _ in range(50):
+        text = "".join(rng.choice(words) for _ in range(40))
+        assert set(matcher.iter_matches(text)) == brute_force(matcher, text)
+
+
+def test_word_matches_skip_glued_hits():
+    matcher = compile_skill_matcher(SKILLS)
+    text = "javascript, node.js and nosql; no javas"
+    hits = sorted((pos, pattern) for pos, pattern, _ in matcher.iter_word_matches(text))
+    # punctuation is a boundary, so "node.js" also yields "node" and "js"; "java" glued to "s" doesn't count
+    assert hits == [(0, "javascript"), (12, "node"), (12, "node.js"), (17, "js"), (24, "nosql")]
+
+
+def test_aliases_map_to_their_skill_and_single_chars_are_ignored():
+    matcher = compile_skill_matcher(SKILLS)
+    found = {pattern: skills for _, pattern, skills in matcher.iter_word_matches("ecmascript and c and sql")}
+    assert found == {"ecmascript": (1,), "sql": (3,)}
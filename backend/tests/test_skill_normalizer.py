@@ -0,0 +1,78 @@
+from utils.skill_normalizer import SkillNormalizer, max_distance, normalize_key, osa_distance
+
+
+class FakeTaxonomy:
+    version = "test"
+
+    def __init__(self, skills):
+        self._names = list(skills)
+        self._skills = skills
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def aliases(self, skill_id):
+        return self._skills[self._names[skill_id]][0]
+
+    def weight(self, skill_id):
+        return self._skills[self._names[skill_id]][1]
+
+
+NORMALIZER = SkillNormalizer(FakeTaxonomy({
+    "JavaScript": (["js", "ecmascript"], 1.0),
+    "Kubernetes": (["k8s"], 1.0),
+    "Vue.js": (["vue"], 1.0),
+    "Rust": ([], 1.0),
+    "Ruby": ([], 1.5),
+    "Go": (["golang"], 1.0),
+}))
+
+
+def test_normalize_key_ignores_case_and_separators():
+    assert normalize_key(" Vue.js ") == normalize_key("vue js") == normalize_key("VUE_JS") == "vuejs"
+
+
+def test_osa_distance():
+    assert osa_distance("python", "python") == 0
+    assert osa_distance("pyhton", "python") == 1  # transposition
+    assert osa_distance("pythn", "python") == 1
+    assert osa_distance("ca", "abc") == 3  # OSA can't edit a transposed pair again
+    assert osa_distance("", "go") == 2
+
+
+def test_max_distance_grows_with_length():
+    assert [max_distance("x" * n) for n in (3, 4, 7, 8)] == [0, 1, 1, 2]
+
+
+def test_exact_aliases():
+    assert NORMALIZER.resolve("K8S") == ("Kubernetes", 1.0, "exact")
+    assert NORMALIZER.resolve("vue js") == ("Vue.js", 1.0, "exact")
+    assert NORMALIZER.resolve("  ") == (None, 0.0, None)
+
+
+def test_typos_resolve_with_lower_confidence():
+    name, confidence, method = NORMALIZER.resolve("Kubernets")
+    assert (name, method) == ("Kubernetes", "fuzzy")
+    assert confidence == round(1 - 1 / 10, 3)
+    assert NORMALIZER.resolve("javscrpit")[0] == "JavaScript"
+
+
+def test_short_keys_must_match_exactly():
+    assert NORMALIZER.resolve("gp") == (None, 0.0, None)
+    assert NORMALIZER.resolve("unrelated") == (None, 0.0, None)
+
+
+def test_ties_halve_confidence_and_prefer_heavier_skill():
+    name, confidence, _ = NORMALIZER.resolve("rusy")
+    assert name == "Ruby"
+    assert confidence == round((1 - 1 / 4) / 2, 3)
+
+
+def test_confidence_is_scored_against_the_returned_skill():
+    normalizer = SkillNormalizer(FakeTaxonomy({
+        "Java": ([], 1.0),
+        "Jakarta EE": (["javaee"], 2.0),
+    }))
+    # "javae" is one edit from both "java" and "javaee"; the heavier skill wins
+    # and is scored by its own six-letter key, not by the four-letter "java"
+    assert normalizer.resolve("javae") == ("Jakarta EE", round((1 - 1 / 6) / 2, 3), "fuzzy")
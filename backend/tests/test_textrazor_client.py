@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+pytest.importorskip("requests")
+textrazor = pytest.importorskip("textrazor")
+
+from utils import textrazor_client
+from utils.cache import TieredCache
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def post(url, upstream=None, headers=None, data=None, timeout=None):
+        calls.append(data["text"])
+        if data["text"] == "broken":
+            return FakeResponse({"ok": False, "error": "quota exceeded"}, 400)
+        return FakeResponse({"ok": True, "response": {
+            "entities": [{"matchedText": data["text"], "relevanceScore": 0.5}],
+            "topics": [{"label": "Software", "score": 0.9}]
+        }})
+
+    monkeypatch.setattr(textrazor_client, "http_post", post)
+    monkeypatch.setattr(textrazor_client, "textrazor_cache", TieredCache(maxsize=16, name="test"))
+    return calls
+
+
+def test_analyses_are_cached_by_content(calls):
+    expected = {"entities": [["python", 0.5]], "topics": [["Software", 0.9]]}
+    assert textrazor_client.analyze_text("python") == expected
+    assert textrazor_client.analyze_text("python") == expected
+    assert calls == ["python"]
+
+
+def test_blank_text_is_not_sent(calls):
+    assert textrazor_client.analyze_text("  \n") == {"entities": [], "topics": []}
+    assert calls == []
+
+
+def test_errors_raise_and_are_not_cached(calls):
+    for _ in range(2):
+        with pytest.raises(textrazor.TextRazorAnalysisException, match="quota exceeded"):
+            textrazor_client.analyze_text("broken")
+    assert calls == ["broken", "broken"]
+
+
+def test_analyze_texts_runs_concurrently_in_argument_order(calls, monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+    original = textrazor_client.analyze_text
+
+    def analyze(text):
+        barrier.wait()  # both texts must be in flight at once
+        return original(text)
+
+    monkeypatch.setattr(textrazor_client, "analyze_text", analyze)
+    resume, job = textrazor_client.analyze_texts("resume", "job")
+    assert resume["entities"] == [["resume", 0.5]]
+    assert job["entities"] == [["job", 0.5]]
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class TieredCache:
+    """Thread-safe in-memory LRU with an optional on-disk tier.
+
+    Values must be JSON-serializable. With `disk_dir` set, every entry is also
+    written to disk (one file per key) so it survives restarts and is shared
+    by workers on the same host; memory misses fall back to the disk copy.
+    Entries expire after `ttl` seconds (per call, or `default_ttl`); None
+    means they never do.
+    """
+
+    def __init__(self, maxsize=256, disk_dir=None, name="cache", default_ttl=None):
+        self.maxsize = maxsize
+        self.disk_dir = disk_dir
+        self.name = name
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, digest[:2], digest + ".json")
+
+    def _remember(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _miss(self, default):
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if not self.disk_dir:
+            return self._miss(default)
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                record = json.load(f)
+            value, expires_at = record["value"], record["expires_at"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return self._miss(default)
+        if expires_at is not None and expires_at <= now:
+            return self._miss(default)
+        self._remember(key, value, expires_at)
+        with self._lock:
+            self.hits += 1
+            self.disk_hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        self._remember(key, value, expires_at)
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"expires_at": expires_at, "value": value}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"{self.name}: disk write failed: {e}")
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk_dir:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
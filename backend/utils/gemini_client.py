@@ -1,13 +1,255 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from config import GEMINI_API_KEY
+from utils.cache import TieredCache
+from utils.json_stream import JsonArrayStream
+from utils.rate_limit import TokenBucket, CircuitBreaker
+from utils.single_flight import single_flight
 
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
 
-def gemini_analyze(prompt, model="gemini-2.5-flash", max_output_tokens=800):
-    resp = genai.generate_text(
-        model=model,
-        prompt=prompt,
-        max_output_tokens=max_output_tokens
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "models/gemini-2.5-pro")
+
+# Stream JSON skill answers and parse them incrementally (stops generation
+# as soon as the needed arrays are complete); 0 falls back to full responses
+GEMINI_STREAMING = os.getenv("GEMINI_STREAMING", "1") == "1"
+
+# Every Gemini call in the process shares these limits. The bucket should
+# match the project's requests-per-minute quota; while the breaker is open
+# calls raise GeminiUnavailable at once and callers fall back to keywords.
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_RATE_PER_MINUTE = float(os.getenv("GEMINI_RATE_PER_MINUTE", "60"))
+GEMINI_RATE_BURST = int(os.getenv("GEMINI_RATE_BURST", "5"))
+GEMINI_MAX_WAIT = float(os.getenv("GEMINI_MAX_WAIT", "10"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "2"))
+GEMINI_RETRY_BASE_DELAY = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "0.5"))
+GEMINI_RETRY_MAX_DELAY = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "8"))
+
+_gemini_slots = threading.BoundedSemaphore(GEMINI_MAX_CONCURRENCY)
+gemini_bucket = TokenBucket(GEMINI_RATE_PER_MINUTE / 60.0, GEMINI_RATE_BURST)
+gemini_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("GEMINI_BREAKER_FAILURES", "5")),
+    reset_timeout=float(os.getenv("GEMINI_BREAKER_RESET", "60")),
+    name="gemini"
+)
+
+# Quota, overload and transport errors; anything else (bad request, blocked
+# prompt) would fail the same way again and means Gemini itself is healthy
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class GeminiUnavailable(Exception):
+    """Raised without calling Gemini: circuit open, or no rate/concurrency slot in time."""
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_model(name=GEMINI_MODEL):
+    """Shared GenerativeModel for `name`, or None when no API key is configured."""
+    if not GEMINI_API_KEY:
+        return None
+    with _models_lock:
+        if name not in _models:
+            _models[name] = genai.GenerativeModel(name)
+        return _models[name]
+
+
+def call_gemini(call):
+    """Run `call()` under the shared concurrency, rate and circuit-breaker limits,
+    retrying retryable errors with jittered exponential backoff.
+
+    The breaker sees one outcome per call_gemini, however many attempts it took.
+    """
+    if not gemini_breaker.allow():
+        raise GeminiUnavailable("Gemini circuit is open")
+    outcome = None
+    try:
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            if not gemini_bucket.acquire(timeout=GEMINI_MAX_WAIT):
+                raise GeminiUnavailable("Gemini rate limit reached")
+            if not _gemini_slots.acquire(timeout=GEMINI_MAX_WAIT):
+                raise GeminiUnavailable("Too many concurrent Gemini calls")
+            try:
+                result = call()
+            except RETRYABLE_ERRORS as e:
+                outcome = "failure"
+                if attempt == GEMINI_MAX_RETRIES:
+                    raise
+                delay = random.uniform(0, min(GEMINI_RETRY_MAX_DELAY, GEMINI_RETRY_BASE_DELAY * 2 ** attempt))
+                print(f"Gemini call failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+            except Exception:
+                outcome = "success"
+                raise
+            else:
+                outcome = "success"
+                return result
+            finally:
+                _gemini_slots.release()
+            time.sleep(delay)
+    finally:
+        if outcome == "success":
+            gemini_breaker.record_success()
+        elif outcome == "failure":
+            gemini_breaker.record_failure()
+        else:
+            # No rate/concurrency slot, or interrupted: Gemini was never reached
+            gemini_breaker.abort()
+
+
+# Responses are cached by model, generation config and whitespace-normalized
+# prompt; callers pass a shorter `ttl` for answers that go stale faster.
+GEMINI_CACHE_TTL = int(os.getenv("GEMINI_CACHE_TTL", str(7 * 24 * 3600)))
+gemini_cache = TieredCache(
+    maxsize=int(os.getenv("GEMINI_CACHE_SIZE", "1024")),
+    disk_dir=os.getenv("GEMINI_CACHE_DIR") or None,
+    name="gemini_cache",
+    default_ttl=GEMINI_CACHE_TTL
+)
+# Identical requests made while one is in flight wait for it instead
+gemini_flight = single_flight("gemini")
+
+
+def normalize_prompt(prompt):
+    return " ".join(prompt.split())
+
+
+def gemini_cache_key(model_name, prompt, generation_config=None):
+    payload = json.dumps(
+        [model_name, generation_config or {}, normalize_prompt(prompt)],
+        sort_keys=True,
+        default=str
     )
-    return resp.generations[0].text if resp.generations else ""
+    return "gemini:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_gemini_call(model_name, prompt, generation_config, call, ttl=None):
+    """Return `call()`'s text, served from gemini_cache when possible.
+
+    Identical calls already in flight are joined rather than repeated.
+    Empty responses are not cached; `ttl=0` bypasses the cache entirely.
+    """
+    key = gemini_cache_key(model_name, prompt, generation_config)
+    if ttl == 0:
+        return gemini_flight.do(key, call)
+    cached = gemini_cache.get(key)
+    if cached is not None:
+        return cached
+
+    def call_and_cache():
+        text = call()
+        if text:
+            gemini_cache.set(key, text, ttl=ttl)
+        return text
+
+    return gemini_flight.do(key, call_and_cache)
+
+
+def response_text(response):
+    """First candidate's text from a generate_content response, or ""."""
+    if response and response.candidates:
+        candidate = response.candidates[0]
+        if candidate.content and candidate.content.parts:
+            return candidate.content.parts[0].text.strip()
+    return ""
+
+
+def generate_text(model, prompt, generation_config=None, ttl=None):
+    """model.generate_content(prompt) through the response cache; returns the text."""
+    def call():
+        if generation_config:
+            response = call_gemini(lambda: model.generate_content(prompt, generation_config=generation_config))
+        else:
+            response = call_gemini(lambda: model.generate_content(prompt))
+        return response_text(response)
+
+    return cached_gemini_call(model.model_name, prompt, generation_config, call, ttl)
+
+
+def gemini_analyze(prompt, model="gemini-2.5-flash", max_output_tokens=800):
+    def call():
+        resp = call_gemini(lambda: genai.generate_text(
+            model=model,
+            prompt=prompt,
+            max_output_tokens=max_output_tokens
+        ))
+        return resp.generations[0].text if resp.generations else ""
+
+    return cached_gemini_call(model, prompt, {"max_output_tokens": max_output_tokens}, call)
+
+
+def close_stream(response):
+    """Stop a streamed generate_content response's upstream request, if still open."""
+    # The response keeps the transport stream as `_iterator`: a gRPC call
+    # (cancel) or, on the REST transport, a generator (close)
+    stream = getattr(response, "_iterator", response)
+    stop = getattr(stream, "cancel", None) or getattr(stream, "close", None)
+    if callable(stop):
+        try:
+            stop()
+        except Exception as e:
+            print(f"Closing Gemini stream failed: {e}")
+
+
+def stream_json_arrays(model, prompt, generation_config=None, on_item=None, stop_keys=None, max_items=None, ttl=None):
+    """Stream a JSON completion through JsonArrayStream; returns its `arrays`.
+
+    `on_item(key, value)` is called for each array string as soon as it is
+    complete. Generation stops early once every key in `stop_keys` has been
+    closed, or `max_items` strings under `stop_keys` have been read; the
+    upstream stream is closed whenever reading stops, including on errors.
+    The streamed text is cached under its own key, so partial completions
+    are only ever re-read by this parser.
+    """
+    stop_keys = set(stop_keys or ())
+    emitted = set()
+
+    def consume(chunks):
+        parser = JsonArrayStream()
+        for chunk in chunks:
+            text = chunk if isinstance(chunk, str) else chunk.text
+            yield text
+            for key, value in parser.feed(text):
+                if on_item and (key, value) not in emitted:
+                    emitted.add((key, value))
+                    on_item(key, value)
+            if parser.done or (stop_keys and stop_keys <= parser.closed):
+                return
+            if max_items and sum(len(parser.arrays.get(k, ())) for k in stop_keys) >= max_items:
+                return
+
+    def call():
+        # Retries restart the stream; `emitted` keeps on_item from repeating itself
+        def attempt():
+            response = model.generate_content(prompt, generation_config=generation_config, stream=True)
+            try:
+                return "".join(consume(response))
+            finally:
+                close_stream(response)
+        return call_gemini(attempt)
+
+    stream_config = dict(generation_config or {}, stream=True)
+    text = cached_gemini_call(model.model_name, prompt, stream_config, call, ttl)
+    parser = JsonArrayStream()
+    for key, value in parser.feed(text or ""):
+        if on_item and (key, value) not in emitted:
+            emitted.add((key, value))
+            on_item(key, value)
+    return parser.arrays
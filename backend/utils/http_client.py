@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared outbound HTTP for every third-party integration: one keep-alive
+# session with a connection pool per host, so repeat calls to a provider
+# reuse a warm TLS connection. Every call gets connect/read timeouts and a
+# response-size cap, and its latency is recorded under an upstream name.
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_MAX_RESPONSE_BYTES = int(os.getenv("HTTP_MAX_RESPONSE_BYTES", str(5 * 1024 * 1024)))
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "16"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+LATENCY_WINDOW = 256
+
+
+class ResponseTooLarge(requests.RequestException):
+    """The response body exceeded the allowed size."""
+
+
+_session = requests.Session()
+for _prefix in ("https://", "http://"):
+    _session.mount(_prefix, HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE))
+
+
+class _UpstreamStats:
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.http_errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(upstream, elapsed, status=None):
+    with _stats_lock:
+        stats = _stats.setdefault(upstream, _UpstreamStats())
+        stats.requests += 1
+        stats.latencies.append(elapsed)
+        if status is None:
+            stats.failures += 1
+        elif status >= 400:
+            stats.http_errors += 1
+
+
+def _timeouts(timeout):
+    if timeout is None:
+        return (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    if isinstance(timeout, (int, float)):
+        return (min(HTTP_CONNECT_TIMEOUT, timeout), timeout)
+    return timeout
+
+
+def _read_body(response, max_bytes):
+    declared = response.headers.get("Content-Length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise ResponseTooLarge(f"{response.url}: {declared} bytes exceeds limit of {max_bytes}")
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise ResponseTooLarge(f"{response.url}: response exceeds limit of {max_bytes} bytes")
+    return bytes(body)
+
+
+def http_request(method, url, upstream=None, timeout=None, max_bytes=None, **kwargs):
+    """requests-style call over the shared pool; returns a fully read Response.
+
+    `timeout` is a (connect, read) pair or one number of seconds (default
+    HTTP_CONNECT_TIMEOUT/HTTP_READ_TIMEOUT). Bodies over `max_bytes`
+    (default HTTP_MAX_RESPONSE_BYTES) raise ResponseTooLarge. Latency is
+    recorded under `upstream`, which defaults to the host name.
+    """
+    upstream = upstream or urlsplit(url).hostname
+    max_bytes = max_bytes or HTTP_MAX_RESPONSE_BYTES
+    started = time.monotonic()
+    try:
+        response = _session.request(method, url, timeout=_timeouts(timeout), stream=True, **kwargs)
+        try:
+            body = _read_body(response, max_bytes)
+        finally:
+            response.close()  # returns the connection to the pool
+    except Exception:
+        _record(upstream, time.monotonic() - started)
+        raise
+    response._content = body
+    _record(upstream, time.monotonic() - started, response.status_code)
+    return response
+
+
+def http_get(url, upstream=None, **kwargs):
+    return http_request("GET", url, upstream=upstream, **kwargs)
+
+
+def http_post(url, upstream=None, **kwargs):
+    return http_request("POST", url, upstream=upstream, **kwargs)
+
+
+def upstream_stats():
+    """Request counts and latency percentiles (ms) per upstream."""
+    with _stats_lock:
+        snapshot = [(name, s.requests, s.failures, s.http_errors, sorted(s.latencies)) for name, s in _stats.items()]
+    result = []
+    for name, count, failures, http_errors, latencies in snapshot:
+        pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1) if latencies else 0.0
+        result.append({
+            "upstream": name,
+            "requests": count,
+            "failures": failures,
+            "http_errors": http_errors,
+            "p50_ms": pick(0.5),
+            "p95_ms": pick(0.95),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        })
+    return result
@@ -0,0 +1,211 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from mongoengine import signals
+
+from models import JobPosting
+from utils.cache import TieredCache
+from utils.gemini_client import get_model, generate_text, stream_json_arrays, GEMINI_STREAMING
+from utils.json_stream import JsonArrayStream
+from utils.skill_normalizer import get_skill_normalizer, SKILL_MAP_MIN_CONFIDENCE
+from utils.skill_taxonomy import get_skill_taxonomy
+
+# One Gemini-backed skill suggester for both job-skill endpoints. Results are
+# cached by a fingerprint of the normalized title and description; an edit
+# whose word shingles are at least JOB_SKILL_SIMILARITY Jaccard-similar to a
+# recent posting reuses that posting's suggestions. Creating a JobPosting, or
+# saving a new title or description, warms the cache in the background.
+
+JOB_SKILL_CACHE_TTL = int(os.getenv("JOB_SKILL_CACHE_TTL", str(7 * 24 * 3600)))
+JOB_SKILL_SIMILARITY = float(os.getenv("JOB_SKILL_SIMILARITY", "0.9"))
+JOB_SKILL_RECENT = int(os.getenv("JOB_SKILL_RECENT", "512"))
+SHINGLE_SIZE = 3
+
+suggestion_cache = TieredCache(
+    maxsize=int(os.getenv("JOB_SKILL_CACHE_SIZE", "1024")),
+    disk_dir=os.getenv("JOB_SKILL_CACHE_DIR") or None,
+    name="job_skill_suggestions",
+    default_ttl=JOB_SKILL_CACHE_TTL
+)
+_precompute_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-skills")
+
+_WORD = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+
+
+def create_job_skill_suggestion_prompt(job_description, job_title=""):
+    """
+    Creates a prompt for Gemini to suggest required and complementary skills for a job.
+    """
+    example_skills = list(get_skill_taxonomy())[:20]
+
+    return f"""
+CRITICAL: Analyze the following job {job_title if job_title else "description"} and suggest the MOST RELEVANT
+technical skills a candidate should possess. Also, suggest a few complementary skills that would make a candidate stand out.
+
+Return ONLY valid JSON in this format:
+{{
+    "requiredSkills": ["skill1", "skill2"],
+    "complementarySkills": ["skillX", "skillY"]
+}}
+
+RULES:
+1. REQUIRED_SKILLS: Extract 5-10 core technical skills explicitly mentioned or strongly implied.
+2. COMPLEMENTARY_SKILLS: Suggest 2-5 additional technical skills that are often paired with the required skills
+   for this type of role, even if not explicitly mentioned.
+3. Use standard names (e.g., "JavaScript" not "JS", "Kubernetes" not "K8s").
+4. Focus on technical skills: programming languages, frameworks, tools, databases, cloud, DevOps, AI/ML.
+5. Examples of skills: {', '.join(example_skills)}
+
+Job Title: {job_title}
+Job Description:
+{job_description[:3000]}
+
+Return only JSON, no explanation.
+"""
+
+
+def _words(text):
+    return _WORD.findall((text or "").lower())
+
+
+def job_fingerprint(title, description):
+    normalized = " ".join(_words(title)) + "\n" + " ".join(_words(description)[:600])
+    key = f"{normalized}:{get_skill_taxonomy().version}"
+    return "job_skills:" + hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def job_shingles(title, description):
+    # Title words are tagged so a title change weighs like a description change
+    words = ["t:" + w for w in _words(title)] + _words(description)[:600]
+    if len(words) < SHINGLE_SIZE:
+        return frozenset([tuple(words)])
+    return frozenset(tuple(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+
+
+class _RecentJobs:
+    """Shingle sets of recently suggested postings, for near-duplicate lookup."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, fingerprint, shingles):
+        with self._lock:
+            self._entries[fingerprint] = shingles
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def most_similar(self, shingles, threshold):
+        with self._lock:
+            entries = list(self._entries.items())
+        best, best_score = None, threshold
+        for fingerprint, other in entries:
+            small, large = sorted((len(shingles), len(other)))
+            if not large or small / large < best_score:
+                continue  # Jaccard can't exceed the size ratio
+            score = len(shingles & other) / len(shingles | other)
+            if score >= best_score:
+                best, best_score = fingerprint, score
+        return best
+
+
+_recent_jobs = _RecentJobs(JOB_SKILL_RECENT)
+
+
+def _canonical(skills):
+    normalizer = get_skill_normalizer()
+    result = []
+    for skill in skills:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        name, confidence, _ = normalizer.resolve(skill)
+        name = name if name and confidence >= SKILL_MAP_MIN_CONFIDENCE else skill.strip()
+        if name not in result:
+            result.append(name)
+    return result
+
+
+def _ask_gemini(title, description):
+    model = get_model()
+    if not model:
+        return None
+    prompt = create_job_skill_suggestion_prompt(description, title)
+    generation_config = {"max_output_tokens": 500, "temperature": 0.1, "top_p": 0.8, "top_k": 40}
+    if GEMINI_STREAMING:
+        arrays = stream_json_arrays(
+            model,
+            prompt,
+            generation_config=generation_config,
+            stop_keys=("requiredSkills", "complementarySkills"),
+            ttl=0
+        )
+    else:
+        parser = JsonArrayStream()
+        parser.feed(generate_text(model, prompt, generation_config=generation_config, ttl=0))
+        arrays = parser.arrays
+    if not arrays:
+        return None
+    return {
+        "required_skills": _canonical(arrays.get("requiredSkills", [])),
+        "complementary_skills": _canonical(arrays.get("complementarySkills", []))
+    }
+
+
+def suggest_job_skills(title, description):
+    """Required and complementary skills for a posting, or None if Gemini is
+    unavailable. Skill names are mapped to taxonomy spellings where known."""
+    fingerprint = job_fingerprint(title, description)
+    shingles = job_shingles(title, description)
+
+    cached = suggestion_cache.get(fingerprint)
+    if cached is None:
+        similar = _recent_jobs.most_similar(shingles, JOB_SKILL_SIMILARITY)
+        if similar:
+            cached = suggestion_cache.get(similar)
+            if cached is not None:
+                suggestion_cache.set(fingerprint, cached)
+    if cached is not None:
+        _recent_jobs.add(fingerprint, shingles)
+        return cached
+
+    result = _ask_gemini(title, description)
+    if result is not None:
+        suggestion_cache.set(fingerprint, result)
+        _recent_jobs.add(fingerprint, shingles)
+    return result
+
+
+def precompute_job_skills(title, description):
+    """Warm the suggestion cache for a posting without blocking the caller."""
+    if not get_model() or suggestion_cache.get(job_fingerprint(title, description)) is not None:
+        return
+
+    def run():
+        try:
+            suggest_job_skills(title, description)
+        except Exception as e:
+            print(f"Job skill precompute failed: {e}")
+
+    _precompute_executor.submit(run)
+
+
+def _on_job_saving(sender, document, **kwargs):
+    # Changed fields are cleared by the time post_save runs; note them here
+    changed = document._get_changed_fields()
+    document._skill_text_changed = "title" in changed or "description" in changed
+
+
+def _on_job_saved(sender, document, **kwargs):
+    # Applicant and status saves don't change what the posting asks for
+    if kwargs.get("created") or getattr(document, "_skill_text_changed", False):
+        precompute_job_skills(document.title, document.description)
+
+
+signals.pre_save_post_validation.connect(_on_job_saving, sender=JobPosting)
+signals.post_save.connect(_on_job_saved, sender=JobPosting)
@@ -0,0 +1,47 @@
+import threading
+import time
+import uuid
+
+
+class JobStore:
+    """In-memory registry of background jobs, expired `ttl` seconds after their last update.
+
+    Jobs live in the worker process that accepted them; with several web
+    workers, status polls need the same sticky routing Socket.IO already does.
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        stale = [job_id for job_id, job in self._jobs.items() if now - job["_touched"] > self.ttl]
+        for job_id in stale:
+            del self._jobs[job_id]
+
+    def create(self, **fields):
+        now = time.time()
+        job = {"id": uuid.uuid4().hex, "status": "queued", "created_at": now, "updated_at": now, **fields}
+        job["_touched"] = time.monotonic()
+        with self._lock:
+            self._expire(job["_touched"])
+            self._jobs[job["id"]] = job
+        return dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.update(fields, updated_at=time.time(), _touched=time.monotonic())
+            return dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    @staticmethod
+    def public(job):
+        return {k: v for k, v in job.items() if not k.startswith("_")}
@@ -0,0 +1,89 @@
+import json
+
+
+class JsonArrayStream:
+    """Incremental tokenizer for a streamed JSON object of string arrays.
+
+    Feed it chunks of model output as they arrive; every string completed
+    inside a top-level array is appended to `arrays[key]`, where key is the
+    object key that array belongs to, and returned from `feed` as (key, value).
+    Text around the object (```json fences, commentary) is skipped, and a
+    truncated response still yields every string completed before the cut.
+    """
+
+    def __init__(self):
+        self.arrays = {}
+        self.closed = set()  # keys whose array has been fully read
+        self.done = False    # outermost object closed
+        self._stack = []     # [kind, key] per open container; kind is "{" or "["
+        self._in_string = False
+        self._escape = False
+        self._buf = []
+        self._expect_key = False
+        self._key = None
+
+    def _finish_string(self):
+        raw = "".join(self._buf)
+        self._buf = []
+        try:
+            value = json.loads(f'"{raw}"')
+        except ValueError:
+            value = raw
+        top = self._stack[-1]
+        if top[0] == "{":
+            if self._expect_key:
+                self._key = value
+            return None
+        if top[1] is not None and len(self._stack) == 2:
+            self.arrays.setdefault(top[1], []).append(value)
+            return top[1], value
+        return None
+
+    def feed(self, chunk):
+        """Consume a chunk; returns the (key, value) strings it completed."""
+        completed = []
+        for ch in chunk:
+            if self.done:
+                break
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    self._buf.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    self._buf.append(ch)
+                elif ch == '"':
+                    self._in_string = False
+                    item = self._finish_string()
+                    if item:
+                        completed.append(item)
+                else:
+                    self._buf.append(ch)
+                continue
+
+            if not self._stack:
+                if ch == "{":
+                    self._stack.append(["{", None])
+                    self._expect_key = True
+                continue
+
+            top = self._stack[-1]
+            if ch == '"':
+                self._in_string = True
+            elif ch == ":" and top[0] == "{":
+                self._expect_key = False
+            elif ch == ",":
+                self._expect_key = top[0] == "{"
+            elif ch in "{[":
+                key = self._key if top[0] == "{" else None
+                self._stack.append([ch, key])
+                self._expect_key = ch == "{"
+            elif ch in "}]":
+                kind, key = self._stack.pop()
+                if kind == "[" and key is not None and len(self._stack) == 1:
+                    self.arrays.setdefault(key, [])
+                    self.closed.add(key)
+                if not self._stack:
+                    self.done = True
+                self._expect_key = False
+        return completed
@@ -0,0 +1,220 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import Counter
+
+from models import JobPosting
+from utils.cache import TieredCache
+from utils.skill_taxonomy import get_skill_taxonomy
+
+# Offline ATS scoring: skills are found with the compiled taxonomy matcher,
+# and each skill the job asks for is weighted by BM25 (its IDF across our job
+# postings times its saturated frequency in this description), so a posting
+# that stresses Kubernetes counts it for more than the Git every job lists.
+# The score is the weighted share of required skills the resume covers.
+
+ATS_MODEL_REFRESH = int(os.getenv("ATS_MODEL_REFRESH", "3600"))
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def skill_counts(text, taxonomy=None):
+    """Counter of skill id -> word-bounded mentions of its name or aliases."""
+    taxonomy = taxonomy or get_skill_taxonomy()
+    counts = Counter()
+    for _, _, skill_ids in taxonomy.matcher.iter_word_matches((text or "").lower()):
+        counts.update(skill_ids)
+    return counts
+
+
+class AtsModel:
+    """Document frequencies of skills across job postings."""
+
+    def __init__(self, taxonomy_version, doc_freq, n_docs, avg_len):
+        self.taxonomy_version = taxonomy_version
+        self.doc_freq = doc_freq
+        self.n_docs = n_docs
+        self.avg_len = avg_len
+        self.built_at = time.monotonic()
+
+    def idf(self, skill_id):
+        df = self.doc_freq.get(skill_id, 0)
+        return math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def requirement_weights(self, counts):
+        """BM25 weight of each skill in a job description's skill counts."""
+        length = sum(counts.values())
+        avg_len = self.avg_len or length or 1
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_len)
+        return {
+            skill_id: self.idf(skill_id) * tf * (BM25_K1 + 1) / (tf + norm)
+            for skill_id, tf in counts.items()
+        }
+
+
+def build_ats_model(taxonomy=None):
+    taxonomy = taxonomy or get_skill_taxonomy()
+    doc_freq = Counter()
+    lengths = []
+    try:
+        for job in JobPosting.objects.only("title", "description", "skills_required"):
+            text = " ".join([job.title or "", job.description or "", " ".join(job.skills_required or [])])
+            counts = skill_counts(text, taxonomy)
+            doc_freq.update(counts.keys())
+            lengths.append(sum(counts.values()))
+    except Exception as e:
+        print(f"ATS model: could not read job postings ({e}); using uniform weights")
+    avg_len = sum(lengths) / len(lengths) if lengths else 0
+    print(f"Built ATS model from {len(lengths)} job postings")
+    return AtsModel(taxonomy.version, dict(doc_freq), len(lengths), avg_len)
+
+
+_model = None
+_model_lock = threading.Lock()
+_building = False
+
+
+def _build(taxonomy):
+    global _model, _building
+    try:
+        _model = build_ats_model(taxonomy)
+    finally:
+        with _model_lock:
+            _building = False
+
+
+def get_ats_model():
+    """Current model, never built on the request path: it is (re)built on a
+    background thread at startup, when the taxonomy changes and every
+    ATS_MODEL_REFRESH seconds. Until a build for the active taxonomy is
+    ready, every skill gets the same IDF."""
+    global _building
+    taxonomy = get_skill_taxonomy()
+    model = _model
+    current = model is not None and model.taxonomy_version == taxonomy.version
+    if not current or time.monotonic() - model.built_at > ATS_MODEL_REFRESH:
+        with _model_lock:
+            if not _building:
+                _building = True
+                threading.Thread(target=_build, args=(taxonomy,), daemon=True, name="ats-model").start()
+    if not current:
+        return AtsModel(taxonomy.version, {}, 0, 0)
+    return model
+
+
+def warm_ats_model():
+    """Start the first model build; call once the database is connected."""
+    get_ats_model()
+
+
+def analyze_job(job_description, model=None):
+    """Required skill ids of a job description and their BM25 weights."""
+    model = model or get_ats_model()
+    return model.requirement_weights(skill_counts(job_description))
+
+
+def score_skills(found_ids, weights):
+    """Weighted share (0-100) of the required skills present in `found_ids`."""
+    total = sum(weights.values())
+    if not total:
+        return 0
+    matched = sum(w for skill_id, w in weights.items() if skill_id in found_ids)
+    return round(matched / total * 100, 2)
+
+
+def analyze_ats_local(resume_text, job_description):
+    """Same payload as the TextRazor ATS analysis, computed offline."""
+    taxonomy = get_skill_taxonomy()
+    weights = analyze_job(job_description)
+    found = set(skill_counts(resume_text, taxonomy))
+    required = sorted(weights, key=lambda skill_id: (-weights[skill_id], skill_id))
+    return {
+        "score": score_skills(found, weights),
+        "matched_skills": [taxonomy.name(s) for s in required if s in found],
+        "required_skills": [taxonomy.name(s) for s in required],
+        "found_skills": [taxonomy.name(s) for s in sorted(found)]
+    }
+
+
+# ------------------------------
+# Bulk scoring
+# ------------------------------
+# A resume is reduced to a bitmask of the skill ids it mentions (cached by
+# content hash). The job side becomes, for every byte of that mask, a
+# 256-entry table of summed requirement weights, so scoring a resume is one
+# table lookup per 8 skills instead of a set intersection.
+
+_mask_cache = TieredCache(maxsize=int(os.getenv("ATS_MASK_CACHE_SIZE", "8192")), name="ats_skill_masks")
+
+
+def skill_mask(text, taxonomy=None):
+    taxonomy = taxonomy or get_skill_taxonomy()
+    key = f"{taxonomy.version}:{hashlib.sha256((text or '').encode('utf-8')).hexdigest()}"
+    mask = _mask_cache.get(key)
+    if mask is None:
+        mask = 0
+        for skill_id in skill_counts(text, taxonomy):
+            mask |= 1 << skill_id
+        _mask_cache.set(key, mask)
+    return mask
+
+
+class JobScorer:
+    """Scores skill masks against one job description's requirement weights."""
+
+    def __init__(self, weights, n_skills):
+        self.weights = weights
+        self.total = sum(weights.values())
+        self.required_mask = 0
+        for skill_id in weights:
+            self.required_mask |= 1 << skill_id
+        self.tables = []
+        for base in range(0, n_skills, 8):
+            byte_weights = [weights.get(base + bit, 0.0) for bit in range(8)]
+            table = [0.0] * 256
+            for value in range(1, 256):
+                low = value & -value
+                table[value] = table[value ^ low] + byte_weights[low.bit_length() - 1]
+            self.tables.append(table)
+
+    def score(self, mask):
+        if not self.total:
+            return 0
+        mask &= self.required_mask
+        matched = 0.0
+        for table in self.tables:
+            if not mask:
+                break
+            matched += table[mask & 0xFF]
+            mask >>= 8
+        return round(matched / self.total * 100, 2)
+
+
+def rank_resumes(job_description, resumes):
+    """Score (id, text) pairs against one job description, best first.
+
+    Returns (required skill names, ranked results); each result carries the
+    id, score and matched/missing skill names.
+    """
+    taxonomy = get_skill_taxonomy()
+    weights = analyze_job(job_description)
+    scorer = JobScorer(weights, len(taxonomy))
+    required = sorted(weights, key=lambda skill_id: (-weights[skill_id], skill_id))
+
+    scored = []
+    for order, (resume_id, text) in enumerate(resumes):
+        mask = skill_mask(text, taxonomy)
+        scored.append((-scorer.score(mask), order, resume_id, mask))
+    scored.sort()
+
+    results = []
+    for neg_score, _, resume_id, mask in scored:
+        results.append({
+            "id": resume_id,
+            "score": -neg_score,
+            "matched_skills": [taxonomy.name(s) for s in required if mask >> s & 1],
+            "missing_skills": [taxonomy.name(s) for s in required if not mask >> s & 1]
+        })
+    return [taxonomy.name(s) for s in required], results
@@ -0,0 +1,89 @@
+import base64
+import hashlib
+import hmac
+import os
+from datetime import datetime
+
+from bson import ObjectId, json_util
+
+from config import JWT_SECRET
+
+# Keyset pagination for aggregations sorted descending on a tuple of fields
+# (ending in a unique one, normally _id). A cursor is the sort key of the last
+# row of a page, as base64 extended JSON, so datetimes and ObjectIds survive
+# the round trip and the next page is an index-friendly range match instead
+# of a growing skip. Cursor values end up in a $match, so cursors are signed
+# and may only hold plain scalars: an edited one is rejected rather than
+# letting a client smuggle query operators in.
+
+CURSOR_SECRET = (os.getenv("CURSOR_SECRET") or JWT_SECRET).encode("utf-8")
+_SIGNATURE_BYTES = 16
+_CURSOR_TYPES = (bool, int, float, str, datetime, ObjectId, type(None))
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _signature(payload):
+    return hmac.new(CURSOR_SECRET, payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def encode_cursor(values):
+    payload = json_util.dumps(values).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_signature(payload))}"
+
+
+def decode_cursor(cursor):
+    """Sort-key values from a cursor string; ValueError if malformed or edited."""
+    try:
+        payload_text, signature_text = cursor.split(".")
+        payload = _b64decode(payload_text)
+        signature = _b64decode(signature_text)
+    except (AttributeError, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not hmac.compare_digest(signature, _signature(payload)):
+        raise ValueError("Invalid cursor")
+    try:
+        values = json_util.loads(payload)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or not values or not all(isinstance(v, _CURSOR_TYPES) for v in values):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def keyset_match(keys, cursor):
+    """$match stage selecting the rows after `cursor` in descending `keys` order."""
+    values = decode_cursor(cursor)
+    if len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+    branches = []
+    for i, key in enumerate(keys):
+        branch = dict(zip(keys[:i], values[:i]))
+        branch[key] = {"$lt": values[i]}
+        branches.append(branch)
+    return {"$match": {"$or": branches}}
+
+
+def page_params(cursor, limit, default, maximum):
+    """Validated (cursor, limit) from request values; ValueError if either is bad."""
+    cursor = cursor or None
+    if cursor:
+        decode_cursor(cursor)
+    limit = int(limit or default)
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return cursor, min(limit, maximum)
+
+
+def paginate(docs, limit, keys):
+    """(page, next cursor or None) from up to limit + 1 rows fetched in order."""
+    if len(docs) <= limit:
+        return docs, None
+    page = docs[:limit]
+    return page, encode_cursor([page[-1].get(key) for key in keys])
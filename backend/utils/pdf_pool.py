@@ -0,0 +1,248 @@
+import os
+import queue
+import select
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from utils.pdf_text import extract_pdf_text, MAX_RESUME_PAGES, MAX_RESUME_TEXT_CHARS
+
+# PDF parsing runs in separate worker processes so a pathological document
+# can only stall or bloat its own worker: the parent waits at most
+# PDF_PARSE_TIMEOUT seconds, then kills and replaces it. Workers are plain
+# `python -m utils.pdf_pool` subprocesses (not forks of the web worker) that
+# reply on a pipe of their own, so whatever PyMuPDF prints (stdout goes to
+# stderr) can't corrupt a reply. They cap their virtual address space (RLIMIT_AS) at
+# PDF_PARSE_MAX_ADDRESS_SPACE_MB above baseline. That bounds mappings, not
+# resident memory, so it is set well above what a resume needs in RSS.
+
+PDF_PARSE_ISOLATED = os.getenv("PDF_PARSE_ISOLATED", "1") == "1" and os.name == "posix"
+PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", str(os.cpu_count() or 2)))
+PDF_PARSE_TIMEOUT = float(os.getenv("PDF_PARSE_TIMEOUT", "15"))
+PDF_PARSE_QUEUE_TIMEOUT = float(os.getenv("PDF_PARSE_QUEUE_TIMEOUT", "30"))
+PDF_PARSE_MAX_ADDRESS_SPACE_MB = int(
+    os.getenv("PDF_PARSE_MAX_ADDRESS_SPACE_MB") or os.getenv("PDF_PARSE_MAX_MEMORY_MB") or "1024"
+)
+PDF_WORKER_MAX_DOCS = int(os.getenv("PDF_WORKER_MAX_DOCS", "200"))
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# request: max_pages, max_chars, data length, data
+# reply:   status, payload length, utf-8 payload (text or error message)
+_REQUEST = struct.Struct("<III")
+_REPLY = struct.Struct("<BI")
+_STATUS_CODES = {0: "ok", 1: "parse_error", 2: "memory_limit"}
+
+
+class PdfParseError(Exception):
+    """Structured PDF failure; `code` is one of parse_error, timeout,
+    memory_limit, worker_crashed or busy."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+    def to_dict(self):
+        return {"error": self.code, "msg": self.message}
+
+
+def _read_exact(fd, size, deadline):
+    chunks = []
+    remaining = size
+    while remaining:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            raise TimeoutError
+        ready, _, _ = select.select([fd], [], [], timeout)
+        if not ready:
+            raise TimeoutError
+        chunk = os.read(fd, min(remaining, 1 << 20))
+        if not chunk:
+            raise EOFError
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+class _Worker:
+    def __init__(self):
+        reply_fd, child_fd = os.pipe()
+        try:
+            self.proc = subprocess.Popen(
+                [sys.executable, "-m", "utils.pdf_pool", str(PDF_PARSE_MAX_ADDRESS_SPACE_MB), str(child_fd)],
+                cwd=BACKEND_DIR,
+                stdin=subprocess.PIPE,
+                stdout=2,  # stray prints from the worker go to our stderr
+                pass_fds=(child_fd,),
+            )
+        except BaseException:
+            os.close(reply_fd)
+            raise
+        finally:
+            os.close(child_fd)
+        self.reply = os.fdopen(reply_fd, "rb", buffering=0)
+        self.docs = 0
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def kill(self):
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=5)
+        except Exception:
+            pass
+        for stream in (self.proc.stdin, self.reply):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def send(self, data, max_pages, max_chars):
+        self.proc.stdin.write(_REQUEST.pack(max_pages, max_chars, len(data)))
+        self.proc.stdin.write(data)
+        self.proc.stdin.flush()
+
+    def receive(self, timeout):
+        deadline = time.monotonic() + timeout
+        fd = self.reply.fileno()
+        status, length = _REPLY.unpack(_read_exact(fd, _REPLY.size, deadline))
+        payload = _read_exact(fd, length, deadline).decode("utf-8")
+        self.docs += 1
+        return _STATUS_CODES.get(status, "parse_error"), payload
+
+
+class PdfParsePool:
+    """Bounded pool of PDF parser processes with per-document time and address-space limits."""
+
+    def __init__(self, max_workers=PDF_PARSE_WORKERS, timeout=PDF_PARSE_TIMEOUT):
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._idle = queue.LifoQueue()
+
+    def _checkout(self):
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return _Worker()
+            if worker.alive():
+                return worker
+
+    def _checkin(self, worker):
+        if worker.alive() and worker.docs < PDF_WORKER_MAX_DOCS:
+            self._idle.put(worker)
+        else:
+            worker.kill()
+
+    def parse(self, data, max_pages=MAX_RESUME_PAGES, max_chars=MAX_RESUME_TEXT_CHARS):
+        """Extract text from PDF bytes in a worker process; raises PdfParseError."""
+        if not self._slots.acquire(timeout=PDF_PARSE_QUEUE_TIMEOUT):
+            raise PdfParseError("busy", "PDF parser is busy, please retry shortly")
+        try:
+            worker = self._checkout()
+            try:
+                try:
+                    worker.send(data, max_pages, max_chars)
+                except OSError:
+                    # Idle worker died since its last job; retry once on a fresh one
+                    worker.kill()
+                    worker = _Worker()
+                    worker.send(data, max_pages, max_chars)
+                status, payload = worker.receive(self.timeout)
+            except TimeoutError:
+                worker.kill()
+                raise PdfParseError("timeout", f"PDF parsing exceeded {self.timeout:g}s")
+            except (EOFError, OSError, struct.error):
+                worker.kill()
+                raise PdfParseError("worker_crashed", "PDF parser process exited unexpectedly")
+            if status == "memory_limit":
+                # The worker exits after hitting its address-space limit; never hand it out again
+                worker.kill()
+            else:
+                self._checkin(worker)
+        finally:
+            self._slots.release()
+
+        if status != "ok":
+            raise PdfParseError(status, payload)
+        return payload
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def parse_pdf(data, max_pages=MAX_RESUME_PAGES, max_chars=MAX_RESUME_TEXT_CHARS):
+    """Extract text from PDF bytes, isolated in the shared worker pool when enabled."""
+    global _pool
+    if not PDF_PARSE_ISOLATED:
+        try:
+            return extract_pdf_text(data, max_pages, max_chars)
+        except MemoryError:
+            raise PdfParseError("memory_limit", "PDF exceeded the parser memory limit")
+        except Exception as e:
+            raise PdfParseError("parse_error", str(e))
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PdfParsePool()
+    return _pool.parse(data, max_pages, max_chars)
+
+
+# ------------------------------
+# Worker process
+# ------------------------------
+def _limit_address_space(max_mb):
+    """Cap the virtual address space (RLIMIT_AS) at the current size plus
+    `max_mb`; allocations beyond it raise MemoryError. This is not an RSS
+    limit: mapped but untouched memory counts against it too."""
+    try:
+        import resource
+        with open("/proc/self/statm") as f:
+            baseline = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        limit = baseline + max_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, OSError, ValueError):
+        pass
+
+
+def _worker_main(max_address_space_mb, reply_fd):
+    stdin = os.fdopen(os.dup(0), "rb", buffering=0)
+    reply = os.fdopen(reply_fd, "wb", buffering=0)
+    _limit_address_space(max_address_space_mb)
+
+    def read_exact(size):
+        buf = bytearray()
+        while len(buf) < size:
+            chunk = stdin.read(size - len(buf))
+            if not chunk:
+                raise EOFError
+            buf += chunk
+        return bytes(buf)
+
+    while True:
+        try:
+            max_pages, max_chars, length = _REQUEST.unpack(read_exact(_REQUEST.size))
+            data = read_exact(length)
+        except EOFError:
+            return
+        exit_after = False
+        try:
+            status, payload = 0, extract_pdf_text(data, max_pages, max_chars)
+        except MemoryError:
+            status, payload, exit_after = 2, "PDF exceeded the parser address-space limit", True
+        except Exception as e:
+            status, payload = 1, str(e) or e.__class__.__name__
+        # MuPDF can return lone surrogates, which strict UTF-8 refuses
+        encoded = payload.encode("utf-8", errors="replace")
+        reply.write(_REPLY.pack(status, len(encoded)) + encoded)
+        if exit_after:
+            return
+
+
+if __name__ == "__main__":
+    _worker_main(int(sys.argv[1]), int(sys.argv[2]))
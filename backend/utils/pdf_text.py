@@ -0,0 +1,39 @@
+import os
+
+import fitz  # PyMuPDF
+
+# Ceilings for resume PDFs parsed on the upload path
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(10 * 1024 * 1024)))
+MAX_RESUME_PAGES = int(os.getenv("MAX_RESUME_PAGES", "30"))
+MAX_RESUME_TEXT_CHARS = int(os.getenv("MAX_RESUME_TEXT_CHARS", "200000"))
+
+
+def read_upload(file, max_bytes=MAX_RESUME_BYTES):
+    """Read an uploaded file into memory; returns None if it exceeds `max_bytes`."""
+    data = file.stream.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        return None
+    return data
+
+
+def iter_pdf_pages(data, max_pages=MAX_RESUME_PAGES):
+    """Yield the text of each page of an in-memory PDF, up to `max_pages` pages."""
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        for page_number in range(min(doc.page_count, max_pages)):
+            yield doc.load_page(page_number).get_text()
+    finally:
+        doc.close()
+
+
+def extract_pdf_text(data, max_pages=MAX_RESUME_PAGES, max_chars=MAX_RESUME_TEXT_CHARS):
+    """Join page texts, stopping once `max_chars` characters have been collected."""
+    pages = []
+    collected = 0
+    for page_text in iter_pdf_pages(data, max_pages):
+        pages.append(page_text)
+        collected += len(page_text)
+        if collected >= max_chars:
+            break
+    text = "".join(pages)
+    return text[:max_chars]
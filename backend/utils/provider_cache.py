@@ -0,0 +1,155 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Stale-while-revalidate cache for external job provider results, kept in a
+# SQLite file so every gunicorn worker on the host shares it. Entries are
+# fresh for `soft_ttl` seconds; after that, until `hard_ttl`, they are still
+# served at once while one worker refreshes them in the background (the
+# refresh is claimed in the row, so workers don't all refresh together).
+
+PROVIDER_CACHE_PATH = os.getenv(
+    "PROVIDER_CACHE_PATH", os.path.join(tempfile.gettempdir(), "job_provider_cache.sqlite3")
+)
+PROVIDER_CACHE_SOFT_TTL = int(os.getenv("PROVIDER_CACHE_SOFT_TTL", "600"))
+PROVIDER_CACHE_HARD_TTL = int(os.getenv("PROVIDER_CACHE_HARD_TTL", str(6 * 3600)))
+# How long a worker's refresh claim blocks other workers from refreshing
+REFRESH_CLAIM_SECONDS = 60
+PURGE_INTERVAL = 300
+
+
+def provider_key(source, query, location="", page=1):
+    """Cache key for one page of a provider search; whitespace and case don't matter."""
+    normalize = lambda text: " ".join((text or "").lower().split())
+    return f"{source}:{normalize(query)}:{normalize(location)}:{page}"
+
+
+class ProviderCache:
+    """SWR cache of JSON-serializable provider results in a shared SQLite file."""
+
+    def __init__(self, path, soft_ttl, hard_ttl, name="provider_cache", refresh_workers=4):
+        self.path = path
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.name = name
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._last_purge = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="provider-refresh")
+        self._db().execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " fresh_until REAL NOT NULL, expires_at REAL NOT NULL,"
+            " refreshing_until REAL NOT NULL DEFAULT 0)"
+        )
+
+    def _db(self):
+        # sqlite3 connections can't be shared across threads; one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, attr):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def _store(self, key, value):
+        now = time.time()
+        self._db().execute(
+            "INSERT OR REPLACE INTO entries (key, value, fresh_until, expires_at, refreshing_until)"
+            " VALUES (?, ?, ?, ?, 0)",
+            (key, json.dumps(value), now + self.soft_ttl, now + self.hard_ttl)
+        )
+        if now - self._last_purge > PURGE_INTERVAL:
+            self._last_purge = now
+            self._db().execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+
+    def _claim_refresh(self, key, now):
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+        cursor = self._db().execute(
+            "UPDATE entries SET refreshing_until = ? WHERE key = ? AND refreshing_until <= ?",
+            (now + REFRESH_CLAIM_SECONDS, key, now)
+        )
+        if cursor.rowcount:
+            return True
+        with self._lock:
+            self._refreshing.discard(key)
+        return False
+
+    def _refresh(self, key, fetch):
+        try:
+            self._store(key, fetch())
+            self._count("refreshes")
+        except Exception as e:
+            # Keep serving the stale copy; the claim lapses and a later read retries
+            print(f"{self.name}: refresh of {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_fetch(self, key, fetch):
+        """Cached value for `key`, calling `fetch()` on a miss. Stale values are
+        returned immediately and refreshed in the background. Errors from a
+        foreground fetch propagate and are not cached."""
+        now = time.time()
+        try:
+            row = self._db().execute(
+                "SELECT value, fresh_until FROM entries WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"{self.name}: read failed: {e}")
+            row = None
+
+        if row is not None:
+            value, fresh_until = json.loads(row[0]), row[1]
+            if fresh_until > now:
+                self._count("hits")
+            else:
+                self._count("stale_hits")
+                try:
+                    if self._claim_refresh(key, now):
+                        self._executor.submit(self._refresh, key, fetch)
+                except sqlite3.Error as e:
+                    print(f"{self.name}: refresh claim failed: {e}")
+                    with self._lock:
+                        self._refreshing.discard(key)
+            return value
+
+        self._count("misses")
+        value = fetch()
+        try:
+            self._store(key, value)
+        except sqlite3.Error as e:
+            print(f"{self.name}: write failed: {e}")
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+provider_cache = ProviderCache(PROVIDER_CACHE_PATH, PROVIDER_CACHE_SOFT_TTL, PROVIDER_CACHE_HARD_TTL)
@@ -0,0 +1,79 @@
+import threading
+
+# Request coalescing for upstream calls: while a call for some key is in
+# flight, other threads asking for the same key wait for it and share its
+# result (or exception) instead of issuing an identical request. Nothing is
+# kept once the call finishes; caching is left to the callers.
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time within this process."""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """`fn()`, or the outcome of an identical call already in flight."""
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+            }
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def single_flight(name):
+    """Shared SingleFlight for one upstream, created on first use."""
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name)
+        return _flights[name]
+
+
+def single_flight_stats():
+    with _flights_lock:
+        flights = list(_flights.values())
+    return [flight.stats() for flight in flights]
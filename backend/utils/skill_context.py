@@ -0,0 +1,91 @@
+from bisect import bisect_left
+from functools import lru_cache
+
+# Context words scored by calculate_skill_confidence within CONTEXT_RADIUS
+# characters on either side of a skill mention.
+CONTEXT_RADIUS = 100
+
+POSITIVE_INDICATORS = [
+    "experience", "worked", "using", "with", "in", "knowledge", "familiar",
+    "proficient", "expert", "skilled", "developed", "built", "created",
+    "implemented", "programming", "coding", "development", "project",
+    "years", "months", "framework", "library", "language", "database",
+    "tool", "platform", "technology", "stack", "api", "application"
+]
+
+NEGATIVE_INDICATORS = [
+    "learning", "want to learn", "interested in", "planning to",
+    "considering", "might", "could", "should", "wish", "hope"
+]
+
+TECHNICAL_SECTIONS = [
+    "technical skills", "programming", "technologies", "experience",
+    "projects", "work experience", "skills", "expertise", "tools"
+]
+
+
+# Named indicator groups indexed by build_context_index
+CONTEXT_GROUPS = {
+    "positive": POSITIVE_INDICATORS,
+    "negative": NEGATIVE_INDICATORS,
+    "sections": TECHNICAL_SECTIONS,
+}
+
+
+class ContextIndex:
+    """Sorted start offsets of every context indicator in one text.
+
+    Built once per resume so each skill mention asks "how many indicators of
+    a group occur inside text[start:end]?" with binary searches over the
+    indicators actually present, instead of substring scans of the window.
+
+    The gain is modest: bench_skill_confidence.py measures about 1.2-1.5x
+    over the window scan (including the index build) on 6k-500k character
+    resumes, since the scan's `in` checks already run in C.
+    """
+
+    def __init__(self, text, groups):
+        positions_by_indicator = {}
+        self._groups = {}
+        for name, indicators in groups.items():
+            present = []
+            for indicator in dict.fromkeys(indicators):
+                positions = positions_by_indicator.get(indicator)
+                if positions is None:
+                    positions = positions_by_indicator[indicator] = _find_all(text, indicator)
+                if positions:
+                    present.append((indicator, len(indicator), positions))
+            # Most frequent first so capped counts stop as early as possible
+            present.sort(key=lambda entry: len(entry[2]), reverse=True)
+            self._groups[name] = present
+
+    def count(self, group, start, end, limit=None):
+        """Distinct indicators of `group` with `indicator in text[start:end]`, stopping at `limit`."""
+        found = 0
+        for _, length, positions in self._groups[group]:
+            idx = bisect_left(positions, start)
+            if idx < len(positions) and positions[idx] + length <= end:
+                found += 1
+                if found == limit:
+                    break
+        return found
+
+
+def _find_all(text, needle):
+    positions = []
+    pos = text.find(needle)
+    while pos != -1:
+        positions.append(pos)
+        pos = text.find(needle, pos + 1)
+    return positions
+
+
+def build_context_index(text):
+    return ContextIndex(text, CONTEXT_GROUPS)
+
+
+@lru_cache(maxsize=8)
+def cached_context_index(text):
+    """build_context_index(text), shared by calls for the same text, for
+    callers that score mentions one at a time without keeping an index."""
+    return build_context_index(text)
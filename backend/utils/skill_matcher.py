@@ -0,0 +1,166 @@
+from bisect import bisect_left
+
+_MAX_CACHED_TRANSITIONS = 1 << 18
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every skill name and alias.
+
+    The automaton is stored as flat arrays (CSR layout: per-state edge ranges
+    sorted by character code) so one pass over the text finds every
+    occurrence of every pattern, independent of how many skills exist. The
+    arrays can be plain lists or memoryviews over a compiled taxonomy file.
+    """
+
+    def __init__(self, patterns, pattern_lengths, pattern_skills,
+                 edge_offsets, edge_chars, edge_targets, fail,
+                 output_offsets, output_patterns):
+        self.patterns = patterns
+        self.pattern_skills = pattern_skills
+        self._pattern_lengths = pattern_lengths
+        self._edge_offsets = edge_offsets
+        self._edge_chars = edge_chars
+        self._edge_targets = edge_targets
+        self._fail = fail
+        self._output_offsets = output_offsets
+        self._output_patterns = output_patterns
+        # Lazily filled DFA transitions: (state << 21 | code) -> next state,
+        # so hot characters skip the edge search and failure-link walk
+        self._delta = {}
+
+    def _step(self, state, code):
+        edge_offsets = self._edge_offsets
+        edge_chars = self._edge_chars
+        fail = self._fail
+        while True:
+            lo, hi = edge_offsets[state], edge_offsets[state + 1]
+            if lo != hi:
+                idx = bisect_left(edge_chars, code, lo, hi)
+                if idx < hi and edge_chars[idx] == code:
+                    return self._edge_targets[idx]
+            if state == 0:
+                return 0
+            state = fail[state]
+
+    def iter_matches(self, text):
+        """Yield (position, pattern_id) for every occurrence in `text`, overlaps included."""
+        output_offsets = self._output_offsets
+        output_patterns = self._output_patterns
+        pattern_lengths = self._pattern_lengths
+        delta = self._delta
+        if len(delta) > _MAX_CACHED_TRANSITIONS:
+            delta.clear()
+        state = 0
+        for i, ch in enumerate(text):
+            key = state << 21 | ord(ch)
+            nxt = delta.get(key)
+            if nxt is None:
+                nxt = delta[key] = self._step(state, ord(ch))
+            state = nxt
+            start, end = output_offsets[state], output_offsets[state + 1]
+            if start != end:
+                for j in range(start, end):
+                    pid = output_patterns[j]
+                    yield i - pattern_lengths[pid] + 1, pid
+
+    def iter_word_matches(self, text):
+        """Yield (position, pattern, skill_ids) for hits not glued to alphanumeric neighbours."""
+        text_len = len(text)
+        patterns = self.patterns
+        pattern_skills = self.pattern_skills
+        for pos, pid in self.iter_matches(text):
+            end = pos + self._pattern_lengths[pid]
+            if pos > 0 and text[pos - 1].isalnum():
+                continue
+            if end < text_len and text[end].isalnum():
+                continue
+            yield pos, patterns[pid], pattern_skills[pid]
+
+
+def compile_matcher_tables(skills_db):
+    """Compile a {skill: {"aliases": [...], ...}} taxonomy into matcher arrays.
+
+    Names are lower-cased and single-character names are skipped, matching
+    the rules of the original per-skill scan. Skills are referred to by
+    their position in `skills_db`.
+    """
+    patterns = []
+    pattern_ids = {}
+    pattern_skills = []
+
+    for skill_id, (skill_name, skill_info) in enumerate(skills_db.items()):
+        for name in [skill_name] + list(skill_info.get("aliases", [])):
+            name_lower = name.lower()
+            if len(name_lower) <= 1:
+                continue
+            pid = pattern_ids.get(name_lower)
+            if pid is None:
+                pid = pattern_ids[name_lower] = len(patterns)
+                patterns.append(name_lower)
+                pattern_skills.append([])
+            if skill_id not in pattern_skills[pid]:
+                pattern_skills[pid].append(skill_id)
+
+    # Trie
+    children = [{}]
+    own_output = [[]]
+    for pid, pattern in enumerate(patterns):
+        state = 0
+        for ch in pattern:
+            code = ord(ch)
+            nxt = children[state].get(code)
+            if nxt is None:
+                nxt = children[state][code] = len(children)
+                children.append({})
+                own_output.append([])
+            state = nxt
+        own_output[state].append(pid)
+
+    # Failure links (BFS), outputs merged along the failure chain
+    fail = [0] * len(children)
+    outputs = [list(out) for out in own_output]
+    queue = list(children[0].values())
+    head = 0
+    while head < len(queue):
+        state = queue[head]
+        head += 1
+        for code, nxt in children[state].items():
+            f = fail[state]
+            while f and code not in children[f]:
+                f = fail[f]
+            fail[nxt] = children[f].get(code, 0)
+            outputs[nxt].extend(outputs[fail[nxt]])
+            queue.append(nxt)
+
+    edge_offsets, edge_chars, edge_targets = [0], [], []
+    output_offsets, output_patterns = [0], []
+    for state, edges in enumerate(children):
+        for code in sorted(edges):
+            edge_chars.append(code)
+            edge_targets.append(edges[code])
+        edge_offsets.append(len(edge_chars))
+        output_patterns.extend(outputs[state])
+        output_offsets.append(len(output_patterns))
+
+    return {
+        "patterns": patterns,
+        "pattern_skills": pattern_skills,
+        "edge_offsets": edge_offsets,
+        "edge_chars": edge_chars,
+        "edge_targets": edge_targets,
+        "fail": fail,
+        "output_offsets": output_offsets,
+        "output_patterns": output_patterns,
+    }
+
+
+def compile_skill_matcher(skills_db):
+    """Build an in-memory SkillMatcher straight from a taxonomy dict."""
+    tables = compile_matcher_tables(skills_db)
+    return SkillMatcher(
+        tables["patterns"],
+        [len(p) for p in tables["patterns"]],
+        [tuple(ids) for ids in tables["pattern_skills"]],
+        tables["edge_offsets"], tables["edge_chars"], tables["edge_targets"], tables["fail"],
+        tables["output_offsets"], tables["output_patterns"],
+    )
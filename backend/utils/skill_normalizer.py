@@ -0,0 +1,132 @@
+import os
+import re
+import threading
+from itertools import combinations
+
+from utils.skill_taxonomy import get_skill_taxonomy
+
+# Maps free-text skill strings ("reactjs", "k8s", "Pyhton") to canonical
+# taxonomy names without a network call. Exact alias hits are looked up in a
+# dict; typos go through a symmetric-delete index (every string within
+# MAX_EDIT_DISTANCE deletions of each key), verified with the optimal string
+# alignment distance.
+
+MAX_EDIT_DISTANCE = 2
+# Matches below this confidence aren't trusted as the canonical name (the
+# skill mapping endpoints send them to Gemini instead)
+SKILL_MAP_MIN_CONFIDENCE = float(os.getenv("SKILL_MAP_MIN_CONFIDENCE", "0.75"))
+_SEPARATORS = re.compile(r"[\s._\-/]+")
+
+
+def normalize_key(text):
+    """Lower-case and drop separators, so "Vue.js", "vue js" and "vuejs" collide."""
+    return _SEPARATORS.sub("", text.strip().lower())
+
+
+def max_distance(key):
+    """Edits tolerated for a key of this length; short keys must match exactly."""
+    if len(key) <= 3:
+        return 0
+    if len(key) <= 7:
+        return 1
+    return MAX_EDIT_DISTANCE
+
+
+def _deletes(key, distance):
+    variants = {key}
+    for n in range(1, min(distance, len(key) - 1) + 1):
+        for positions in combinations(range(len(key)), n):
+            variants.add("".join(ch for i, ch in enumerate(key) if i not in positions))
+    return variants
+
+
+def osa_distance(a, b):
+    """Levenshtein distance that also counts adjacent transpositions as one edit."""
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[len(b)]
+
+
+class SkillNormalizer:
+    """Resolve skill strings to canonical taxonomy names, with a confidence in [0, 1]."""
+
+    def __init__(self, taxonomy):
+        self.version = taxonomy.version
+        self._exact = {}
+        for skill_id, name in enumerate(taxonomy):
+            for alias in [name] + list(taxonomy.aliases(skill_id)):
+                self._exact.setdefault(normalize_key(alias), name)
+        self._weights = {name: taxonomy.weight(i) for i, name in enumerate(taxonomy)}
+
+        self._deletes = {}
+        for key in self._exact:
+            for variant in _deletes(key, max_distance(key)):
+                self._deletes.setdefault(variant, []).append(key)
+
+    def resolve(self, text):
+        """Return (canonical name or None, confidence, method), method being
+        "exact", "fuzzy" or None."""
+        key = normalize_key(text or "")
+        if not key:
+            return None, 0.0, None
+        name = self._exact.get(key)
+        if name:
+            return name, 1.0, "exact"
+
+        limit = max_distance(key)
+        if not limit:
+            return None, 0.0, None
+        best = {}
+        for variant in _deletes(key, limit):
+            for candidate in self._deletes.get(variant, ()):
+                if candidate in best:
+                    continue
+                best[candidate] = osa_distance(key, candidate)
+
+        matches = [(d, c) for c, d in best.items() if d <= min(limit, max_distance(c))]
+        if not matches:
+            return None, 0.0, None
+        distance = min(d for d, _ in matches)
+        closest = [c for d, c in matches if d == distance]
+        names = {self._exact[c] for c in closest}
+        name = max(names, key=lambda n: (self._weights[n], n))
+        # Scored against the returned skill's own key, not another skill's
+        candidate = min((c for c in closest if self._exact[c] == name), key=len)
+        confidence = 1.0 - distance / max(len(key), len(candidate))
+        if len(names) > 1:
+            # Equally close to different skills ("rusy": Rust or Ruby?)
+            confidence /= 2
+        return name, round(confidence, 3), "fuzzy"
+
+
+_normalizer = None
+_normalizer_lock = threading.Lock()
+
+
+def get_skill_normalizer():
+    """Normalizer for the active taxonomy; rebuilt when the taxonomy version changes."""
+    global _normalizer
+    taxonomy = get_skill_taxonomy()
+    normalizer = _normalizer
+    if normalizer is None or normalizer.version != taxonomy.version:
+        with _normalizer_lock:
+            if _normalizer is None or _normalizer.version != taxonomy.version:
+                _normalizer = SkillNormalizer(taxonomy)
+            normalizer = _normalizer
+    return normalizer
+
+
+def normalize_skill_key(skill, min_confidence=SKILL_MAP_MIN_CONFIDENCE):
+    """Lower-cased canonical name for a skill string, or the cleaned input if unknown."""
+    name, confidence, _ = get_skill_normalizer().resolve(skill)
+    if name and confidence >= min_confidence:
+        return name.lower()
+    return " ".join(skill.split()).lower()
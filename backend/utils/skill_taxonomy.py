@@ -0,0 +1,344 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Mapping
+
+from utils.skill_matcher import SkillMatcher, compile_matcher_tables
+
+# Compiled taxonomy artifact
+# --------------------------
+# The skill taxonomy lives in data/skills_taxonomy.json and is compiled by
+# build_skill_taxonomy.py into data/taxonomy/skills-<version>.bin. The file
+# named in data/taxonomy/CURRENT is memory-mapped read-only, so every worker
+# on a host shares its pages; pointing CURRENT at a new build swaps it in
+# without a restart.
+#
+# Layout (little-endian): header, section table, 8-byte aligned sections.
+#   header:  magic "SKTX", u32 format, u32 section count, u32 version length, version
+#   section: 24s name, 1s typecode, 7 pad bytes, u64 offset, u64 item count
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TAXONOMY_SOURCE = os.getenv("SKILL_TAXONOMY_SOURCE", os.path.join(BACKEND_DIR, "data", "skills_taxonomy.json"))
+TAXONOMY_DIR = os.getenv("SKILL_TAXONOMY_DIR", os.path.join(BACKEND_DIR, "data", "taxonomy"))
+TAXONOMY_CHECK_INTERVAL = float(os.getenv("SKILL_TAXONOMY_CHECK_INTERVAL", "30"))
+CURRENT_POINTER = "CURRENT"
+
+MAGIC = b"SKTX"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sIII")
+_SECTION = struct.Struct("<24sc7xQQ")
+
+
+class TaxonomyError(Exception):
+    pass
+
+
+def _align(n, to=8):
+    return (n + to - 1) // to * to
+
+
+def _u32(values):
+    return array("I", values)
+
+
+def taxonomy_version(skills_db):
+    """Content hash of a taxonomy; identical sources compile to the same version."""
+    canonical = json.dumps(skills_db, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def write_taxonomy_artifact(skills_db, path, version=None):
+    """Compile `skills_db` (name -> category/aliases/weight) into a binary artifact at `path`."""
+    version = version or taxonomy_version(skills_db)
+
+    strings, string_ids = [], {}
+
+    def intern(value):
+        sid = string_ids.get(value)
+        if sid is None:
+            sid = string_ids[value] = len(strings)
+            strings.append(value)
+        return sid
+
+    names, categories, weights = [], [], []
+    alias_offsets, alias_strings = [0], []
+    for skill_name, skill_info in skills_db.items():
+        names.append(intern(skill_name))
+        categories.append(intern(skill_info.get("category", "General")))
+        weights.append(float(skill_info.get("weight", 1.0)))
+        alias_strings.extend(intern(alias) for alias in skill_info.get("aliases", []))
+        alias_offsets.append(len(alias_strings))
+
+    name_index = sorted(range(len(names)), key=lambda i: strings[names[i]].encode("utf-8"))
+
+    tables = compile_matcher_tables(skills_db)
+    pattern_ids = [intern(p) for p in tables["patterns"]]
+    pattern_skill_offsets, pattern_skills = [0], []
+    for skill_ids in tables["pattern_skills"]:
+        pattern_skills.extend(skill_ids)
+        pattern_skill_offsets.append(len(pattern_skills))
+
+    blob = bytearray()
+    string_offsets = [0]
+    for value in strings:
+        blob += value.encode("utf-8")
+        string_offsets.append(len(blob))
+
+    sections = [
+        ("strings", "B", array("B", bytes(blob))),
+        ("string_offsets", "I", _u32(string_offsets)),
+        ("skill_names", "I", _u32(names)),
+        ("skill_categories", "I", _u32(categories)),
+        ("skill_weights", "d", array("d", weights)),
+        ("alias_offsets", "I", _u32(alias_offsets)),
+        ("alias_strings", "I", _u32(alias_strings)),
+        ("name_index", "I", _u32(name_index)),
+        ("patterns", "I", _u32(pattern_ids)),
+        ("pattern_lengths", "I", _u32([len(p) for p in tables["patterns"]])),
+        ("pattern_skill_offsets", "I", _u32(pattern_skill_offsets)),
+        ("pattern_skills", "I", _u32(pattern_skills)),
+        ("edge_offsets", "I", _u32(tables["edge_offsets"])),
+        ("edge_chars", "I", _u32(tables["edge_chars"])),
+        ("edge_targets", "I", _u32(tables["edge_targets"])),
+        ("fail", "I", _u32(tables["fail"])),
+        ("output_offsets", "I", _u32(tables["output_offsets"])),
+        ("output_patterns", "I", _u32(tables["output_patterns"])),
+    ]
+
+    version_bytes = version.encode("utf-8")
+    offset = _align(_HEADER.size + len(version_bytes)) + _SECTION.size * len(sections)
+    table, payload = [], []
+    for name, typecode, data in sections:
+        offset = _align(offset)
+        raw = data.tobytes()
+        table.append(_SECTION.pack(name.encode("ascii"), typecode.encode("ascii"), offset, len(data)))
+        payload.append((offset, raw))
+        offset += len(raw)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), len(version_bytes)))
+        f.write(version_bytes)
+        f.write(b"\0" * (_align(f.tell()) - f.tell()))
+        for entry in table:
+            f.write(entry)
+        for start, raw in payload:
+            f.write(b"\0" * (start - f.tell()))
+            f.write(raw)
+    os.replace(tmp_path, path)
+    return version
+
+
+class _StringTable:
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __getitem__(self, sid):
+        return str(self._blob[self._offsets[sid]:self._offsets[sid + 1]], "utf-8")
+
+    def raw(self, sid):
+        return self._blob[self._offsets[sid]:self._offsets[sid + 1]].tobytes()
+
+
+class _StringColumn:
+    """Sequence view mapping row -> decoded string."""
+
+    def __init__(self, strings, ids):
+        self._strings = strings
+        self._ids = ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        return self._strings[self._ids[i]]
+
+
+class _Ragged:
+    """Sequence view over (offsets, values): row i -> tuple of values."""
+
+    def __init__(self, offsets, values):
+        self._offsets = offsets
+        self._values = values
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        return tuple(self._values[self._offsets[i]:self._offsets[i + 1]])
+
+
+class SkillTaxonomy(Mapping):
+    """Read-only view of a compiled taxonomy artifact, backed by mmap.
+
+    Behaves like the old COMPREHENSIVE_SKILLS_DB dict (name -> {"category",
+    "aliases", "weight"}, in taxonomy order) and exposes the compiled
+    SkillMatcher, whose skill ids are positions in that order.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise TaxonomyError("Compiled taxonomy artifacts are little-endian only")
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, fmt, section_count, version_len = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise TaxonomyError(f"{path} is not a format {FORMAT_VERSION} skill taxonomy")
+        self.version = str(view[_HEADER.size:_HEADER.size + version_len], "utf-8")
+
+        sections = {}
+        pos = _align(_HEADER.size + version_len)
+        for _ in range(section_count):
+            name, typecode, offset, count = _SECTION.unpack_from(view, pos)
+            pos += _SECTION.size
+            typecode = typecode.decode("ascii")
+            size = struct.calcsize(typecode)
+            raw = view[offset:offset + count * size]
+            sections[name.rstrip(b"\0").decode("ascii")] = raw if typecode == "B" else raw.cast(typecode)
+
+        self._strings = _StringTable(sections["strings"], sections["string_offsets"])
+        self._names = sections["skill_names"]
+        self._categories = sections["skill_categories"]
+        self._weights = sections["skill_weights"]
+        self._aliases = _Ragged(sections["alias_offsets"], sections["alias_strings"])
+        self._name_index = sections["name_index"]
+
+        self.matcher = SkillMatcher(
+            _StringColumn(self._strings, sections["patterns"]),
+            sections["pattern_lengths"],
+            _Ragged(sections["pattern_skill_offsets"], sections["pattern_skills"]),
+            sections["edge_offsets"], sections["edge_chars"], sections["edge_targets"],
+            sections["fail"], sections["output_offsets"], sections["output_patterns"],
+        )
+
+    def index(self, name):
+        """Position of skill `name` in taxonomy order, or None."""
+        key = name.encode("utf-8")
+        lo, hi = 0, len(self._name_index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            skill_id = self._name_index[mid]
+            candidate = self._strings.raw(self._names[skill_id])
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return skill_id
+        return None
+
+    def name(self, skill_id):
+        return self._strings[self._names[skill_id]]
+
+    def category(self, skill_id):
+        return self._strings[self._categories[skill_id]]
+
+    def weight(self, skill_id):
+        return self._weights[skill_id]
+
+    def aliases(self, skill_id):
+        return [self._strings[sid] for sid in self._aliases[skill_id]]
+
+    def record(self, skill_id):
+        return {
+            "category": self.category(skill_id),
+            "aliases": self.aliases(skill_id),
+            "weight": self.weight(skill_id),
+        }
+
+    def __getitem__(self, name):
+        skill_id = self.index(name)
+        if skill_id is None:
+            raise KeyError(name)
+        return self.record(skill_id)
+
+    def __contains__(self, name):
+        return isinstance(name, str) and self.index(name) is not None
+
+    def __iter__(self):
+        return (self.name(i) for i in range(len(self._names)))
+
+    def __len__(self):
+        return len(self._names)
+
+
+def load_taxonomy_source(path=TAXONOMY_SOURCE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_taxonomy_artifact(source=TAXONOMY_SOURCE, out_dir=TAXONOMY_DIR, activate=True):
+    """Compile `source` into out_dir/skills-<version>.bin; optionally point CURRENT at it."""
+    skills_db = load_taxonomy_source(source)
+    version = taxonomy_version(skills_db)
+    os.makedirs(out_dir, exist_ok=True)
+    filename = f"skills-{version}.bin"
+    path = os.path.join(out_dir, filename)
+    if not os.path.exists(path):
+        write_taxonomy_artifact(skills_db, path, version)
+    if activate:
+        activate_taxonomy_artifact(filename, out_dir)
+    return path
+
+
+def activate_taxonomy_artifact(filename, out_dir=TAXONOMY_DIR):
+    """Atomically point CURRENT at `filename`; running workers pick it up on their next check."""
+    pointer = os.path.join(out_dir, CURRENT_POINTER)
+    tmp_pointer = f"{pointer}.{os.getpid()}.tmp"
+    with open(tmp_pointer, "w") as f:
+        f.write(filename + "\n")
+    os.replace(tmp_pointer, pointer)
+
+
+def current_taxonomy_path(out_dir=TAXONOMY_DIR):
+    try:
+        with open(os.path.join(out_dir, CURRENT_POINTER)) as f:
+            filename = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(out_dir, filename) if filename else None
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+_last_check = 0.0
+
+
+def get_skill_taxonomy():
+    """Current SkillTaxonomy, re-reading CURRENT at most every TAXONOMY_CHECK_INTERVAL seconds.
+
+    With no compiled artifact yet, the JSON source is compiled on first use.
+    """
+    global _taxonomy, _last_check
+    now = time.monotonic()
+    if _taxonomy is not None and now - _last_check < TAXONOMY_CHECK_INTERVAL:
+        return _taxonomy
+
+    with _taxonomy_lock:
+        if _taxonomy is not None and now - _last_check < TAXONOMY_CHECK_INTERVAL:
+            return _taxonomy
+        _last_check = now
+        try:
+            path = current_taxonomy_path()
+            if path is None or not os.path.exists(path):
+                path = build_taxonomy_artifact()
+            if _taxonomy is None or path != _taxonomy.path:
+                taxonomy = SkillTaxonomy(path)
+                print(f"Loaded skill taxonomy {taxonomy.version} ({len(taxonomy)} skills) from {path}")
+                # In-flight requests keep the old mapping alive until they finish
+                _taxonomy = taxonomy
+        except Exception as e:
+            if _taxonomy is None:
+                raise
+            print(f"Skill taxonomy reload failed, keeping {_taxonomy.version}: {e}")
+    return _taxonomy
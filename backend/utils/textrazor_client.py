@@ -0,0 +1,74 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import textrazor
+
+from utils.cache import TieredCache
+from utils.http_client import http_post
+
+# TextRazor's REST API called over the shared keep-alive HTTP pool (the
+# textrazor package opens a fresh connection per request). Analyses are
+# cached by content hash, so a job description shared by many candidates
+# is only sent once.
+
+TEXTRAZOR_URL = os.getenv("TEXTRAZOR_URL", "https://api.textrazor.com/")
+TEXTRAZOR_TIMEOUT = float(os.getenv("TEXTRAZOR_TIMEOUT", "20"))
+TEXTRAZOR_POOL_SIZE = int(os.getenv("TEXTRAZOR_POOL_SIZE", "8"))
+TEXTRAZOR_EXTRACTORS = ("entities", "topics")
+
+textrazor_cache = TieredCache(
+    maxsize=int(os.getenv("TEXTRAZOR_CACHE_SIZE", "1024")),
+    disk_dir=os.getenv("TEXTRAZOR_CACHE_DIR") or None,
+    name="textrazor_cache",
+    default_ttl=int(os.getenv("TEXTRAZOR_CACHE_TTL", str(30 * 24 * 3600)))
+)
+
+textrazor_executor = ThreadPoolExecutor(max_workers=TEXTRAZOR_POOL_SIZE, thread_name_prefix="textrazor")
+
+
+def analyze_text(text):
+    """Entities and topics for `text`: {"entities": [[matched_text, relevance]],
+    "topics": [[label, score]]}. Raises textrazor.TextRazorAnalysisException."""
+    if not text.strip():
+        return {"entities": [], "topics": []}
+    key = "textrazor:" + ",".join(TEXTRAZOR_EXTRACTORS) + ":" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+    cached = textrazor_cache.get(key)
+    if cached is not None:
+        return cached
+
+    api_key = textrazor.api_key or os.getenv("TEXTRAZOR_API_KEY")
+    try:
+        resp = http_post(
+            TEXTRAZOR_URL,
+            upstream="textrazor",
+            headers={"X-TextRazor-Key": api_key or ""},
+            data={"text": text, "extractors": ",".join(TEXTRAZOR_EXTRACTORS)},
+            timeout=TEXTRAZOR_TIMEOUT
+        )
+        body = resp.json()
+    except (requests.RequestException, ValueError) as e:
+        raise textrazor.TextRazorAnalysisException(f"TextRazor request failed: {e}")
+    if resp.status_code != 200 or not body.get("ok", False):
+        raise textrazor.TextRazorAnalysisException(body.get("error") or f"HTTP {resp.status_code}")
+
+    response = body.get("response", {})
+    result = {
+        "entities": [
+            [e.get("matchedText", ""), e.get("relevanceScore", 0)]
+            for e in response.get("entities", [])
+        ],
+        "topics": [
+            [t.get("label", ""), t.get("score", 0)]
+            for t in response.get("topics", [])
+        ]
+    }
+    textrazor_cache.set(key, result)
+    return result
+
+
+def analyze_texts(*texts):
+    """analyze_text for several texts concurrently; results in argument order."""
+    futures = [textrazor_executor.submit(analyze_text, text) for text in texts]
+    return [future.result() for future in futures]
@@ -95,7 +95,7 @@ export const uploadResume = (formData) =>
 export const analyzeATSScore = (resumeText, jobDescription) =>
   api.post('/ats/analyze', { resume_text: resumeText, job_description: jobDescription }).then(res => res.data);
 
-// Jobs (Internal & External)
+// Jobs (Internal & External); send a response's next_cursor back as `cursor` for more internal jobs
 export const searchJobs = (searchParams) => api.post('/jobs/search', searchParams).then(res => res.data);
 
 // Apply to internal job
@@ -110,7 +110,7 @@ export const getAppliedJobs = () => api.get('/jobs/my-applications').then(res =>
 
 // Employer-specific actions
 export const postEmployerJob = (jobData) => api.post('/employer/post_job', jobData).then(res => res.data);
-export const getMyJobs = () => api.get('/employer/my-jobs').then(res => res.data);
+export const getMyJobs = (cursor) => api.get('/employer/my-jobs', { params: cursor ? { cursor } : {} }).then(res => res.data);
 export const getJobApplicants = (jobId) => api.get(`/employer/job-applicants/${jobId}`).then(res => res.data);
 export const deleteJob = (jobId) => api.delete(`/employer/delete-job/${jobId}`).then(res => res.data);
 export const analyzeCandidateATS = (jobId, candidateId) =>
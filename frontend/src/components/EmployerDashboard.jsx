@@ -33,8 +33,14 @@ const EmployerDashboard = ({ isDark, user }) => {
   const loadJobs = async () => {
     try {
       setLoading(true);
-      const response = await getMyJobs();
-      setJobs(response.jobs || []);
+      const allJobs = [];
+      let cursor = null;
+      do {
+        const response = await getMyJobs(cursor);
+        allJobs.push(...(response.jobs || []));
+        cursor = response.next_cursor;
+      } while (cursor);
+      setJobs(allJobs);
     } catch (err) {
       console.error("Error fetching jobs:", err);
       toast.error("Failed to load your jobs.");
@@ -298,7 +304,7 @@ const EmployerDashboard = ({ isDark, user }) => {
                   <div>
                     <p className={`text-sm ${isDark ? 'text-slate-400' : 'text-slate-600'}`}>Total Applicants</p>
                     <p className={`text-3xl font-bold ${isDark ? 'text-cyan-400' : 'text-blue-600'}`}>
-                      {jobs.reduce((acc, job) => acc + (job.applicants?.length || 0), 0)}
+                      {jobs.reduce((acc, job) => acc + (job.applicant_count || 0), 0)}
                     </p>
                   </div>
                   <Users className={`w-12 h-12 ${isDark ? 'text-cyan-400/30' : 'text-blue-200'}`} />
@@ -309,7 +315,7 @@ const EmployerDashboard = ({ isDark, user }) => {
                   <div>
                     <p className={`text-sm ${isDark ? 'text-slate-400' : 'text-slate-600'}`}>Pending Reviews</p>
                     <p className={`text-3xl font-bold ${isDark ? 'text-cyan-400' : 'text-blue-600'}`}>
-                      {jobs.reduce((acc, job) => acc + (job.applicants?.filter(a => a.status?.toLowerCase() === 'pending')?.length || 0), 0)}
+                      {jobs.reduce((acc, job) => acc + (job.pending_count || 0), 0)}
                     </p>
                   </div>
                   <Clock className={`w-12 h-12 ${isDark ? 'text-cyan-400/30' : 'text-blue-200'}`} />
@@ -449,7 +455,7 @@ const EmployerDashboard = ({ isDark, user }) => {
                                 className={buttonSecondary}
                               >
                                 <Users className="w-4 h-4 mr-1" /> 
-                                {job.applicants?.length || 0}
+                                {job.applicant_count || 0}
                               </Button>
                               <Button
                                 variant="destructive"
@@ -512,9 +518,9 @@ const EmployerDashboard = ({ isDark, user }) => {
                           <div className="flex items-center gap-4 mt-2">
                             <span className={`text-sm flex items-center gap-1 ${isDark ? 'text-slate-400' : 'text-gray-600'}`}>
                               <Users className="w-4 h-4" />
-                              {job.applicants?.length || 0} applicants
+                              {job.applicant_count || 0} applicants
                             </span>
-                            {job.applicants?.length >= 2 && (
+                            {job.applicant_count >= 2 && (
                               <Badge className="bg-green-500/20 text-green-400">Ready to compare</Badge>
                             )}
                           </div>
@@ -526,7 +532,7 @@ const EmployerDashboard = ({ isDark, user }) => {
 
                 {/* Candidate Comparison Component */}
                 {selectedJob && (
-                  selectedJob.applicants && selectedJob.applicants.length >= 2 ? (
+                  selectedJob.applicant_count >= 2 ? (
                     <CandidateComparison jobId={selectedJob.id} isDark={isDark} />
                   ) : (
                     <div className={`rounded-xl border p-12 text-center ${isDark ? 'border-cyan-400/30 bg-slate-800/50' : 'border-slate-300 bg-white'}`}>
@@ -538,7 +544,7 @@ const EmployerDashboard = ({ isDark, user }) => {
                         You need at least 2 candidates to compare for "{selectedJob.title}"
                       </p>
                       <p className={`text-xs mt-1 ${isDark ? 'text-slate-500' : 'text-slate-500'}`}>
-                        Current applicants: {selectedJob.applicants?.length || 0}
+                        Current applicants: {selectedJob.applicant_count || 0}
                       </p>
                     </div>
                   )
@@ -12,10 +12,13 @@ const JobSearch = ({ isDark, skills = [] }) => {
   const [suggestedRoles, setSuggestedRoles] = useState([]);
   const [applyingJobId, setApplyingJobId] = useState(null);
   const [appliedJobs, setAppliedJobs] = useState(new Set());
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const lastSearchTime = useRef(0);
   const searchCount = useRef(0);
   const isSearching = useRef(false);
+  const lastPayload = useRef(null);
 
   // Auto-search when skills are provided
   useEffect(() => {
@@ -60,6 +63,7 @@ const JobSearch = ({ isDark, skills = [] }) => {
     isSearching.current = true;
     setLoading(true);
     setSuggestedRoles([]);
+    setNextCursor(null);
 
     try {
       const payload = {
@@ -76,6 +80,9 @@ const JobSearch = ({ isDark, skills = [] }) => {
       setJobs(jobsArray);
       setSuggestedRoles(receivedSuggestedRoles);
       setHasSearched(true);
+      // More internal postings are fetched page by page with next_cursor
+      lastPayload.current = payload;
+      setNextCursor(response.next_cursor || null);
 
       if (jobsArray.length > 0) {
         const internalCount = response.internal_count || 0;
@@ -109,6 +116,26 @@ const JobSearch = ({ isDark, skills = [] }) => {
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor || loadingMore || !lastPayload.current) return;
+
+    setLoadingMore(true);
+    try {
+      const response = await searchJobs({ ...lastPayload.current, cursor: nextCursor });
+      const moreJobs = Array.isArray(response.jobs) ? response.jobs : [];
+      setJobs(prev => {
+        const seen = new Set(prev.map(job => `${job.source}:${job.id}`));
+        return [...prev, ...moreJobs.filter(job => !seen.has(`${job.source}:${job.id}`))];
+      });
+      setNextCursor(response.next_cursor || null);
+    } catch (error) {
+      console.error('Load more error:', error);
+      toast.error('Failed to load more jobs. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleApplyToInternalJob = async (jobId) => {
     setApplyingJobId(jobId);
     try {
@@ -417,6 +444,23 @@ const JobSearch = ({ isDark, skills = [] }) => {
             </div>
           ))
         )}
+
+        {/* Load more internal postings */}
+        {!loading && nextCursor && (
+          <button
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            className={`w-full py-2 rounded-lg border font-semibold transition-colors ${
+              loadingMore
+                ? 'bg-gray-500/20 text-gray-400 cursor-not-allowed'
+                : isDark
+                ? 'border-cyan-400/30 text-cyan-400 hover:bg-cyan-400/10'
+                : 'border-blue-300 text-blue-600 hover:bg-blue-50'
+            }`}
+          >
+            {loadingMore ? 'Loading...' : 'Load more jobs'}
+          </button>
+        )}
       </div>
     </div>
   );